@@ -1 +1,2 @@
-python3.8 -m lark.tools.standalone rial/concept/grammar.lark > rial/concept/parser.py
\ No newline at end of file
+python3.8 -m lark.tools.standalone rial/concept/grammar.lark > rial/concept/parser.py
+python3.8 -m rial.parsing.parse_tables
@@ -0,0 +1,250 @@
+import hashlib
+import sqlite3
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from rial.profiling import increment_counter
+
+# Default size cap of the store in MiB, the least recently used entries are evicted above it
+DEFAULT_MAX_SIZE = 512
+
+# Bump whenever the schema below changes, older databases are then dropped and recreated
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, kind)
+);
+CREATE INDEX IF NOT EXISTS artifacts_last_used ON artifacts (last_used);
+"""
+
+
+@lru_cache(maxsize=None)
+def get_compiler_version() -> str:
+    # Any change to the compiler can change the generated code, so all of its sources make up the version
+    package_path = Path(__file__).parent
+    hasher = hashlib.md5()
+
+    for source in sorted(package_path.rglob("*.py")):
+        hasher.update(str(source.relative_to(package_path)).encode())
+        hasher.update(source.read_bytes())
+
+    return hasher.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Persistent store of build outputs (objects, bitcode, IR, assembly) and build metadata in a single SQLite database.
+    Entries are keyed by the build key of what they were produced from, which changes whenever anything that
+    went into them changes, so an entry never has to be invalidated.
+
+    Every write is a transaction of its own and the database is in WAL mode,
+    so concurrent builds never see partial entries and readers don't block each other.
+    Entries that were read are only marked as used when the store is closed, which then evicts the least recently
+    used entries until the store fits into its size cap.
+    """
+    store_path: Path
+    disabled: bool
+    max_size: int
+    connection: Optional[sqlite3.Connection] = None
+    used: Set[Tuple[str, str]] = set()
+
+    def __init__(self):
+        raise PermissionError()
+
+    @staticmethod
+    def init(cache_path: Path, disabled: bool, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Opens the store in :cache_path:.
+        :param cache_path:
+        :param disabled:
+        :param max_size: Size cap in MiB
+        :return:
+        """
+        ArtifactStore.close()
+        ArtifactStore.store_path = cache_path.joinpath("artifacts.db")
+        ArtifactStore.disabled = disabled
+        ArtifactStore.max_size = max_size * 1024 * 1024
+        ArtifactStore.used = set()
+
+        if disabled:
+            return
+
+        cache_path.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(ArtifactStore.store_path), timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+        with connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS artifacts")
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        connection.executescript(_SCHEMA)
+        ArtifactStore.connection = connection
+
+    @staticmethod
+    def close():
+        """
+        Marks the entries that were read as used, evicts entries above the size cap and closes the store.
+        :return:
+        """
+        connection = ArtifactStore.connection
+
+        if connection is None:
+            return
+
+        if len(ArtifactStore.used) > 0:
+            now = time.time()
+            with connection:
+                connection.executemany("UPDATE artifacts SET last_used = ? WHERE key = ? AND kind = ?",
+                                       [(now, key, kind) for key, kind in ArtifactStore.used])
+            ArtifactStore.used.clear()
+
+        ArtifactStore.gc()
+        connection.close()
+        ArtifactStore.connection = None
+
+    @staticmethod
+    def get(key: Optional[str], kind: str) -> Optional[bytes]:
+        if ArtifactStore.connection is None or key is None:
+            return None
+
+        row = ArtifactStore.connection.execute("SELECT data FROM artifacts WHERE key = ? AND kind = ?",
+                                               (key, kind)).fetchone()
+
+        if row is None:
+            return None
+
+        ArtifactStore.used.add((key, kind))
+
+        return row[0]
+
+    @staticmethod
+    def load(key: Optional[str], kind: str) -> Optional[bytes]:
+        """
+        Same as get, but counted as a hit or miss of the artifact cache.
+        :param key:
+        :param kind:
+        :return:
+        """
+        if ArtifactStore.connection is None or key is None:
+            return None
+
+        data = ArtifactStore.get(key, kind)
+        increment_counter("ARTIFACT_CACHE_MISSES" if data is None else "ARTIFACT_CACHE_HITS")
+
+        return data
+
+    @staticmethod
+    def put(key: Optional[str], kind: str, data: bytes):
+        if ArtifactStore.connection is None or key is None:
+            return
+
+        with ArtifactStore.connection:
+            ArtifactStore.connection.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?)",
+                                             (key, kind, len(data), time.time(), sqlite3.Binary(data)))
+
+    @staticmethod
+    def restore(key: Optional[str], kind: str, dest: str) -> bool:
+        """
+        Writes the artifact of :kind: (e.g. ".o") built for :key: to :dest:.
+        Returns False if there is no such artifact.
+        :param key:
+        :param kind:
+        :param dest:
+        :return:
+        """
+        data = ArtifactStore.load(key, kind)
+
+        if data is None:
+            return False
+
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+
+        with open(dest, "wb") as file:
+            file.write(data)
+
+        return True
+
+    @staticmethod
+    def store(key: Optional[str], kind: str, src: str):
+        if ArtifactStore.connection is None or key is None:
+            return
+
+        with open(src, "rb") as file:
+            ArtifactStore.put(key, kind, file.read())
+
+    @staticmethod
+    def stats() -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the number of entries and their size in bytes for every kind of artifact.
+        :return:
+        """
+        if ArtifactStore.connection is None:
+            return dict()
+
+        return {kind: (count, size) for kind, count, size in ArtifactStore.connection.execute(
+            "SELECT kind, COUNT(*), SUM(size) FROM artifacts GROUP BY kind ORDER BY kind")}
+
+    @staticmethod
+    def gc(max_size: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Evicts the least recently used entries until the store is at most :max_size: bytes (default: its size cap).
+        Returns the number of evicted entries and their size in bytes.
+        :param max_size:
+        :return:
+        """
+        connection = ArtifactStore.connection
+
+        if connection is None:
+            return 0, 0
+
+        if max_size is None:
+            max_size = ArtifactStore.max_size
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+        if total <= max_size:
+            return 0, 0
+
+        evicted = list()
+        freed = 0
+
+        for key, kind, size in connection.execute("SELECT key, kind, size FROM artifacts ORDER BY last_used"):
+            if total - freed <= max_size:
+                break
+            evicted.append((key, kind))
+            freed += size
+
+        with connection:
+            connection.executemany("DELETE FROM artifacts WHERE key = ? AND kind = ?", evicted)
+
+        return len(evicted), freed
+
+    @staticmethod
+    def clear() -> Tuple[int, int]:
+        """
+        Removes all entries, returns their number and size in bytes.
+        :return:
+        """
+        connection = ArtifactStore.connection
+
+        if connection is None:
+            return 0, 0
+
+        count, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+
+        with connection:
+            connection.execute("DELETE FROM artifacts")
+
+        connection.execute("VACUUM")
+
+        return count, size
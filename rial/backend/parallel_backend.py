@@ -0,0 +1,149 @@
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+from typing import Dict, List, Optional, Tuple
+
+from llvmlite.binding import ModuleRef
+
+# Every worker initializes LLVM and creates its own target machine, which costs more than optimizing
+# and emitting a few small modules, so builds below these limits are compiled in-process.
+MIN_PARALLEL_MODULES = 4
+MIN_PARALLEL_BYTES = 256 * 1024
+
+_worker_codegen = None
+
+
+class BackendJob:
+    """
+    Everything that is needed to optimize a module and write its outputs, without the module itself.
+    The IR and assembly files are only written if they are set.
+    The key is the build key of the module, under which the outputs are stored in the artifact store.
+    """
+    name: str
+    path: str
+    llvm_ir: str
+    output_file: str
+    write_output: bool
+    use_object_files: bool
+    ir_file: Optional[str]
+    asm_file: Optional[str]
+    key: Optional[str]
+
+    def __init__(self, name: str, path: str, llvm_ir: str, output_file: str, write_output: bool,
+                 use_object_files: bool, ir_file: Optional[str] = None, asm_file: Optional[str] = None,
+                 key: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.llvm_ir = llvm_ir
+        self.output_file = output_file
+        self.write_output = write_output
+        self.use_object_files = use_object_files
+        self.ir_file = ir_file
+        self.asm_file = asm_file
+        self.key = key
+
+    @property
+    def has_outputs(self) -> bool:
+        return self.write_output or self.ir_file is not None or self.asm_file is not None
+
+
+class BackendResult:
+    path: str
+    bitcode: Optional[bytes]
+    error: Optional[str]
+    compile_time: float
+    emit_time: float
+
+    def __init__(self, path: str, bitcode: Optional[bytes], error: Optional[str], compile_time: float,
+                 emit_time: float):
+        self.path = path
+        self.bitcode = bitcode
+        self.error = error
+        self.compile_time = compile_time
+        self.emit_time = emit_time
+
+
+def run_job(codegen, job: BackendJob) -> Tuple[ModuleRef, float, float]:
+    """
+    Parses, verifies and optimizes the IR of :job: and writes its outputs.
+    Returns the optimized module and the time taken for compiling and for emitting.
+    :param codegen:
+    :param job:
+    :return:
+    """
+    start = timer()
+    mod = codegen.compile_llvm_ir(job.llvm_ir)
+    compiled = timer()
+    emit_outputs(codegen, job, mod)
+
+    return mod, compiled - start, timer() - compiled
+
+
+def emit_outputs(codegen, job: BackendJob, mod: ModuleRef):
+    """
+    Writes the outputs of :job: for the already optimized :mod:.
+    :param codegen:
+    :param job:
+    :param mod:
+    :return:
+    """
+    if job.ir_file is not None:
+        codegen.save_ir(job.ir_file, mod)
+
+    if job.asm_file is not None:
+        codegen.save_assembly(job.asm_file, mod)
+
+    if job.write_output:
+        if job.use_object_files:
+            codegen.save_object(job.output_file, mod)
+        else:
+            codegen.save_llvm_bitcode(job.output_file, mod)
+
+
+def _init_worker(opt_level: str, disable_opt: bool):
+    global _worker_codegen
+    from rial.codegen import CodeGen
+    _worker_codegen = CodeGen(opt_level, disable_opt)
+
+
+def _compile_in_worker(job: BackendJob, return_bitcode: bool) -> BackendResult:
+    start = timer()
+    try:
+        mod, compile_time, emit_time = run_job(_worker_codegen, job)
+        bitcode = mod.as_bitcode() if return_bitcode else None
+        return BackendResult(job.path, bitcode, None, compile_time, emit_time)
+    except Exception:
+        return BackendResult(job.path, None, traceback.format_exc(), timer() - start, 0.0)
+
+
+def should_compile_in_parallel(jobs: List[BackendJob], workers: int) -> bool:
+    return workers > 1 and len(jobs) >= MIN_PARALLEL_MODULES and sum(
+        len(job.llvm_ir) for job in jobs) >= MIN_PARALLEL_BYTES
+
+
+def compile_modules(jobs: List[BackendJob], workers: int, opt_level: str, disable_opt: bool,
+                    return_bitcode: bool = False) -> Dict[str, BackendResult]:
+    """
+    Optimizes and emits all modules in a process pool.
+    The results are keyed by path, so that the caller can keep its own (deterministic) order of the outputs.
+    The optimized bitcode is only sent back if :return_bitcode: is set, e.g. for adding the modules to the JIT.
+    :param jobs:
+    :param workers:
+    :param opt_level:
+    :param disable_opt:
+    :param return_bitcode:
+    :return:
+    """
+    results: Dict[str, BackendResult] = dict()
+
+    # Largest modules first so that one big module does not end up as the last job
+    jobs = sorted(jobs, key=lambda job: len(job.llvm_ir), reverse=True)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                             initargs=(opt_level, disable_opt)) as executor:
+        futures = [executor.submit(_compile_in_worker, job, return_bitcode) for job in jobs]
+        for future in futures:
+            result = future.result()
+            results[result.path] = result
+
+    return results
@@ -1,15 +1,16 @@
-import pickle
-from functools import lru_cache
+import ctypes
+from itertools import chain
 from pathlib import Path
 from threading import Lock
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from llvmlite import ir, binding
-from llvmlite.binding import ExecutionEngine, ModuleRef, TargetMachine, PassManagerBuilder, ModulePassManager
-from llvmlite.ir import BaseStructType
+from llvmlite.binding import ExecutionEngine, ModuleRef, TargetMachine, PassManagerBuilder, ModulePassManager, Linkage
+from llvmlite.ir import IdentifiedStructType
 
+from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALModule import RIALModule
-from rial.profiling import run_with_profiling, ExecutionStep
+from rial.platform_support.Platform import Platform
 from rial.util.log import log_fail
 
 
@@ -17,7 +18,7 @@ class CodeGen:
     disable_opt: bool
     size_level: int
     opt_level: int
-    engine: ExecutionEngine
+    engine: Optional[ExecutionEngine]
     binding: binding
     target_machine: TargetMachine
     pm_manager: PassManagerBuilder
@@ -42,7 +43,14 @@ class CodeGen:
         self.binding.initialize_native_target()
         self.binding.initialize_native_asmprinter()
 
-        self._create_execution_engine()
+        # The JIT is only created once something has to run in-process
+        self.engine = None
+        self._create_target_machine()
+
+    def _create_target_machine(self):
+        target = self.binding.Target.from_default_triple()
+        self.target_machine = target.create_target_machine(opt=self.opt_level, reloc="pic")
+        self.target_machine.set_asm_verbosity(True)
 
     def _create_execution_engine(self):
         """
@@ -50,12 +58,17 @@ class CodeGen:
         the host CPU.  The engine is reusable for an arbitrary number of
         modules.
         """
+        # Resolve external functions (printf, malloc, ...) from the host process like the linker would
+        for library in Platform.get_runtime_libraries():
+            self.binding.load_library_permanently(library)
+
+        # Not position independent: with the large code model of the JIT, PIC code addresses constants through
+        # GOTOFF64 relocations which the runtime linker doesn't always resolve correctly
         target = self.binding.Target.from_default_triple()
-        self.target_machine = target.create_target_machine(opt=self.opt_level, reloc="pic")
-        self.target_machine.set_asm_verbosity(True)
+        jit_target_machine = target.create_target_machine(opt=self.opt_level)
 
         backing_mod = binding.parse_assembly("")
-        engine = binding.create_mcjit_compiler(backing_mod, self.target_machine)
+        engine = binding.create_mcjit_compiler(backing_mod, jit_target_machine)
         self.engine = engine
         self.binding.check_jit_execution()
 
@@ -85,7 +98,8 @@ class CodeGen:
             pm_manager.close()
 
     def get_module(self, name: str, filename: str, directory: str) -> RIALModule:
-        module = RIALModule(name=name)
+        # The default context of RIALModule is shared by every build in the process
+        module = RIALModule(name=name, context=ir.context.global_context)
         module.filename = filename
         module.triple = self.binding.get_default_triple()
         module.data_layout = str(self.target_machine.target_data)
@@ -106,42 +120,87 @@ class CodeGen:
 
         return module
 
-    def load_module(self, path: str) -> Optional[RIALModule]:
-        from rial.compilation_manager import CompilationManager
-        with run_with_profiling(CompilationManager.filename_from_path(path), ExecutionStep.READ_CACHE):
-            try:
-                with open(path, "rb") as file:
-                    return pickle.load(file)
-            except Exception:
-                return None
-
-    def save_module(self, module: RIALModule, path: str):
-        from rial.compilation_manager import CompilationManager
-        with run_with_profiling(CompilationManager.filename_from_path(path), ExecutionStep.WRITE_CACHE):
-            self._check_dirs_exist(path)
-            with open(path, "wb") as file:
-                pickle.dump(module, file)
-
     def compile_ir(self, module: RIALModule) -> ModuleRef:
-        with self.lock:
-            llvm_ir = str(module)
-            try:
-                mod = self.binding.parse_assembly(llvm_ir)
-                mod.verify()
-            except Exception as e:
-                log_fail(llvm_ir)
-                raise e
+        return self.compile_llvm_ir(str(module))
 
+    def compile_llvm_ir(self, llvm_ir: str) -> ModuleRef:
+        """
+        Parses, verifies and optimizes the textual IR of a module.
+        :param llvm_ir:
+        :return:
+        """
+        with self.lock:
+            mod = self._parse_llvm_ir(llvm_ir)
             self._optimize_module(mod)
 
         return mod
 
+    def compile_whole_program(self, llvm_irs: List[str], exported: List[str]) -> ModuleRef:
+        """
+        Links the textual IR of all modules into a single module, internalizes everything but :exported:
+        and optimizes it once, so that functions are inlined and removed across modules.
+        :param llvm_irs:
+        :param exported:
+        :return:
+        """
+        with self.lock:
+            program = self._parse_llvm_ir(llvm_irs[0])
+
+            for llvm_ir in llvm_irs[1:]:
+                program.link_in(self._parse_llvm_ir(llvm_ir))
+
+            for value in chain(program.functions, program.global_variables):
+                if value.is_declaration or value.name in exported or value.name.startswith("llvm."):
+                    continue
+                value.linkage = Linkage.internal
+
+            self._optimize_module(program)
+
+        return program
+
+    def _parse_llvm_ir(self, llvm_ir: str) -> ModuleRef:
+        try:
+            mod = self.binding.parse_assembly(llvm_ir)
+            mod.verify()
+        except Exception as e:
+            log_fail(llvm_ir)
+            raise e
+
+        return mod
+
     def generate_final_modules(self, modules: List[ModuleRef]):
+        """
+        Adds the modules to the JIT, compiles them to machine code in memory and runs their static constructors.
+        Only needed for executing code in-process, object files are emitted without it.
+        :param modules:
+        :return:
+        """
+        if self.engine is None:
+            self._create_execution_engine()
+
         for mod in modules:
             self.engine.add_module(mod)
         self.engine.finalize_object()
         self.engine.run_static_constructors()
 
+    def run_function(self, name: str) -> bool:
+        """
+        Calls the finalized function :name: (taking no arguments) in-process.
+        The C stdout is flushed afterwards, so that the output isn't mixed with ours.
+        Returns False if there is no such function.
+        :param name:
+        :return:
+        """
+        address = self.engine.get_function_address(name)
+
+        if address == 0:
+            return False
+
+        ctypes.CFUNCTYPE(None)(address)()
+        ctypes.CDLL(None).fflush(None)
+
+        return True
+
     def _check_dirs_exist(self, dest: str):
         directory = '/'.join(dest.split("/")[0:-1])
         Path(directory).mkdir(parents=True, exist_ok=True)
@@ -166,7 +225,6 @@ class CodeGen:
         with open(dest, "wb") as file:
             file.write(module.as_bitcode())
 
-    @lru_cache(128)
     def get_size(self, ty: ir.Type) -> Optional[int]:
         if isinstance(ty, ir.IntType):
             return int(ty.width / 8)
@@ -174,9 +232,55 @@ class CodeGen:
             return int(32 / 8)
         if isinstance(ty, ir.DoubleType):
             return int(64 / 8)
-        if isinstance(ty, BaseStructType):
-            from rial.compilation_manager import CompilationManager
-            for mod in CompilationManager.modules.values():
-                if ty in mod.get_identified_types().values():
-                    return ty.get_abi_size(self.target_machine.target_data, mod.context)
+        if isinstance(ty, RIALIdentifiedStructType) and ty.definition is not None and ty.definition.size is not None:
+            return ty.definition.size
+        if isinstance(ty, IdentifiedStructType):
+            return self.get_struct_layout(ty)[0]
         return None
+
+    def get_struct_layout(self, ty: IdentifiedStructType) -> Tuple[int, int, List[int]]:
+        """
+        Asks LLVM for the ABI size, alignment and element offsets of the struct.
+        :param ty:
+        :return:
+        """
+        target_data = self.target_machine.target_data
+
+        # Only the structs that ty refers to, the context has every struct of the build
+        assembly = [struct.get_declaration() for struct in self._get_referenced_structs(ty)]
+        assembly.append(f"@layout = external global {ty}")
+
+        with self.binding.parse_assembly("\n".join(assembly)) as llvm_module:
+            pointer = llvm_module.get_global_variable("layout").type
+            return (target_data.get_pointee_abi_size(pointer), target_data.get_pointee_abi_alignment(pointer),
+                    [target_data.get_element_offset(pointer.element_type, i) for i in range(len(ty.elements))])
+
+    @staticmethod
+    def _get_referenced_structs(ty: ir.Type) -> List[IdentifiedStructType]:
+        structs = dict()
+        types = [ty]
+
+        while len(types) > 0:
+            current = types.pop()
+
+            if isinstance(current, IdentifiedStructType):
+                if current.name in structs:
+                    continue
+                structs[current.name] = current
+                types.extend(current.elements or ())
+            elif isinstance(current, ir.PointerType):
+                types.append(current.pointee)
+            elif isinstance(current, ir.ArrayType):
+                types.append(current.element)
+            elif isinstance(current, ir.LiteralStructType):
+                types.extend(current.elements)
+            elif isinstance(current, ir.FunctionType):
+                types.append(current.return_type)
+                types.extend(current.args)
+
+        return list(structs.values())
+
+    def record_struct_layout(self, struct: RIALIdentifiedStructType):
+        definition = struct.definition
+        definition.size, definition.alignment, offsets = self.get_struct_layout(struct)
+        definition.offsets = {name: offsets[index] for name, (index, _) in definition.properties.items()}
@@ -1,132 +1,442 @@
+import hashlib
 import os
 from os import listdir
 from os.path import join, isfile
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 
 from llvmlite import ir
 from llvmlite.binding import ModuleRef
 
-from rial.Cache import Cache
+from rial.ArtifactStore import ArtifactStore, get_compiler_version
+from rial.backend.parallel_backend import BackendJob, compile_modules, emit_outputs, run_job, \
+    should_compile_in_parallel
 from rial.codegen import CodeGen
 from rial.concept.combined_transformer import CombinedTransformer
-from rial.concept.parser import Lark_StandAlone
+from rial.concept.parser import Lark, Tree
 from rial.configuration import Configuration
-from rial.ir.RIALModule import RIALModule
+from rial.ir.OverloadResolver import OverloadResolver
+from rial.ir.PreludeTable import PreludeTable
+from rial.ir.RIALModule import RIALModule, DEFINITION_STRUCT
+from rial.ir.StringPool import StringPool
+from rial.ir.module_interface import dump_interface, load_interface
 from rial.linking.linker import Linker
+from rial.parsing.module_discovery import DiscoveredModule, scan_imports, qualify_mod_name
+from rial.parsing.parallel_parser import should_parse_in_parallel, parse_modules
+from rial.parsing.parse_cache import ParseCache
+from rial.parsing.parse_tables import load_parser
+from rial.parsing.tree_serializer import load_tree, dump_tree
 from rial.platform_support.Platform import Platform
-from rial.profiling import run_with_profiling, ExecutionStep
+from rial.profiling import run_with_profiling, ExecutionStep, record_profiling_event, increment_counter
+from rial.transformer.DeclarationIndex import DeclarationIndex
 from rial.util.log import log_fail
+from rial.util.util import good_hash
 
 
 class CompilationManager:
     modules: Dict[str, RIALModule]
-    cached_modules: List[str]
+    modules_in_progress: Set[str] = set()
     config: Configuration
     codegen: CodeGen
     always_imported: List[str]
-    parser: Lark_StandAlone
+    parser: Lark
     current_module = RIALModule
+    discovered_modules: Dict[str, DiscoveredModule]
+    module_keys: Dict[str, Optional[str]]
+    cacheable: Dict[str, bool]
+    interface_hashes: Dict[str, Optional[str]]
+    interface_ir: Dict[str, str]
+    parsed_trees: Dict[str, bytes]
+    combined_transformer: Optional[CombinedTransformer]
+    prelude: Optional[PreludeTable] = None
 
     def __init__(self):
         raise PermissionError()
 
     @staticmethod
     def init(config: Configuration):
-        Cache.init(config.cache_path, config.raw_opts.disable_cache)
-        CompilationManager.cached_modules = list()
+        ArtifactStore.init(config.cache_path, config.raw_opts.disable_cache, config.raw_opts.cache_max_size)
         CompilationManager.config = config
         CompilationManager.modules = dict()
+        CompilationManager.modules_in_progress = set()
         CompilationManager.codegen = CodeGen(config.raw_opts.opt_level, config.raw_opts.disable_opt)
         CompilationManager.always_imported = list()
-
-        if not CompilationManager.config.raw_opts.disable_cache:
-            Cache.load_cache()
+        CompilationManager.discovered_modules = dict()
+        CompilationManager.module_keys = dict()
+        CompilationManager.cacheable = dict()
+        CompilationManager.interface_hashes = dict()
+        CompilationManager.interface_ir = dict()
+        CompilationManager.parsed_trees = dict()
+        CompilationManager.combined_transformer = None
+        CompilationManager.prelude = None
+        OverloadResolver.invalidate()
+        StringPool.invalidate()
 
         # Reset global context
         ir.context.global_context = ir.Context()
 
         # Setup parser
         from rial.transformer.Postlexer import Postlexer
-        CompilationManager.parser = Lark_StandAlone(postlex=Postlexer())
+        CompilationManager.parser = load_parser(
+            Postlexer(config.project_name, CompilationManager.codegen.target_machine.triple), config.raw_opts.lexer)
+        ParseCache.init(config.cache_path, config.raw_opts.disable_cache, config.project_name,
+                        CompilationManager.codegen.target_machine.triple)
 
     @staticmethod
     def fini():
-        if not CompilationManager.config.raw_opts.disable_cache:
-            Cache.save_cache()
+        ArtifactStore.close()
 
     @staticmethod
     def compiler():
-        # Collect all always imported paths
-        CompilationManager._collect_always_imported_paths()
-
-        # Request main file
+        # Get main file
         if CompilationManager.config.raw_opts.file is not None:
             path = Path(CompilationManager.config.raw_opts.file)
         else:
             path = CompilationManager.config.rial_path.joinpath("startup").joinpath("start.rial")
         if not path.exists():
             raise FileNotFoundError(str(path))
+
+        # Parse everything reachable up front so that parsing isn't serialized behind code generation
+        CompilationManager._parse_reachable_modules(CompilationManager._get_always_imported_paths() + [str(path)])
+
+        # Collect all always imported paths
+        CompilationManager._collect_always_imported_paths()
+
+        with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.BUILD_PRELUDE):
+            CompilationManager.prelude = PreludeTable(
+                [CompilationManager.modules[mod_name] for mod_name in CompilationManager.always_imported])
+
+        # Request main file
         CompilationManager._compile_file(str(path))
 
+        if CompilationManager.config.raw_opts.print_struct_layouts:
+            CompilationManager._print_struct_layouts()
+
+        jobs: List[BackendJob] = list()
+
+        for mod_name, mod in CompilationManager.modules.items():
+            path = CompilationManager.path_from_mod_name(mod_name)
+            key = CompilationManager._get_module_key(path)
+            llvm_ir = CompilationManager.interface_ir.get(mod_name)
+
+            # Modules that were loaded from their interface summary reuse the IR of the build that summarized them
+            if llvm_ir is None:
+                llvm_ir = str(mod)
+                ArtifactStore.put(key, "ir", llvm_ir.encode())
+
+            jobs.append(CompilationManager._create_backend_job(path, mod, key, llvm_ir))
+
+        needs_jit = CompilationManager._needs_jit()
+
+        if CompilationManager.config.raw_opts.whole_program:
+            object_files = [CompilationManager._get_whole_program_output_path()]
+            modules = CompilationManager._compile_whole_program(jobs, needs_jit)
+        else:
+            # Kept in the order of the modules so that the linker always gets the same command line
+            object_files = [job.output_file for job in jobs]
+
+            # Modules whose outputs were all restored from the artifact store are only needed by the JIT
+            modules = CompilationManager._compile_modules(
+                [job for job in jobs if needs_jit or job.has_outputs], needs_jit)
+
+        if modules is None:
+            return
+
+        if needs_jit:
+            with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.JIT):
+                CompilationManager.codegen.generate_final_modules(modules)
+
+        if CompilationManager.config.raw_opts.run:
+            # main is declared (unmangled) in std/startup/start.rial
+            if not CompilationManager.codegen.run_function("main"):
+                log_fail("No main function to run")
+            return
+
+        with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.LINK_EXE):
+            exe_path = str(CompilationManager.config.bin_path.joinpath(
+                f"{CompilationManager.config.project_name}{Platform.get_exe_file_extension()}"))
+            link_key = CompilationManager._get_link_key(jobs)
+
+            # The link key of the last build is kept as metadata of the executable
+            exe_key = good_hash(exe_path)
+            last_link_key = ArtifactStore.get(exe_key, "link")
+
+            # Nothing changed since the executable was linked
+            if link_key is not None and Path(exe_path).exists() and last_link_key == link_key.encode():
+                return
+
+            Linker.link_files(object_files, exe_path, CompilationManager.config.raw_opts.print_link_command,
+                              CompilationManager.config.raw_opts.strip)
+            ArtifactStore.put(exe_key, "link", link_key.encode() if link_key is not None else b"")
+
+    @staticmethod
+    def _create_backend_job(path: str, mod: RIALModule, key: Optional[str], llvm_ir: str) -> BackendJob:
+        """
+        Creates the job for optimizing and emitting :mod: from its :llvm_ir:.
+        Outputs that were already built with the same :key: are restored from the artifact store
+        and left out of the job.
+        :param path:
+        :param mod:
+        :param key:
+        :param llvm_ir:
+        :return:
+        """
+        raw_opts = CompilationManager.config.raw_opts
+        ir_file = None
+        asm_file = None
+
+        # Whole program builds only write the outputs of the linked program
+        per_module_outputs = not raw_opts.whole_program
+
+        if raw_opts.print_ir and not raw_opts.run and per_module_outputs:
+            ir_file = str(CompilationManager.get_output_path_str(path)).replace(".rial", ".ll")
+
+        if raw_opts.print_asm and per_module_outputs:
+            asm_file = str(CompilationManager.get_cache_path_str(path)).replace(".rial", ".asm")
+
+        # Running in-process doesn't link and leaves the output directory alone
+        job = BackendJob(mod.name, path, llvm_ir, str(CompilationManager.get_output_path_str(path)).replace(
+            ".rial", ".o"), not raw_opts.run and per_module_outputs, raw_opts.use_object_files, ir_file, asm_file,
+                         key)
+        CompilationManager._restore_artifacts(job)
+
+        return job
+
+    @staticmethod
+    def _get_output_kind() -> str:
+        return CompilationManager.config.raw_opts.use_object_files and ".o" or ".bc"
+
+    @staticmethod
+    def _restore_artifacts(job: BackendJob):
+        """
+        Restores the outputs of :job: that were already built with its key and removes them from the job.
+        :param job:
+        :return:
+        """
+        if job.write_output and ArtifactStore.restore(job.key, CompilationManager._get_output_kind(), job.output_file):
+            job.write_output = False
+
+        if job.ir_file is not None and ArtifactStore.restore(job.key, ".ll", job.ir_file):
+            job.ir_file = None
+
+        if job.asm_file is not None and ArtifactStore.restore(job.key, ".asm", job.asm_file):
+            job.asm_file = None
+
+    @staticmethod
+    def _store_artifacts(job: BackendJob):
+        if job.write_output:
+            ArtifactStore.store(job.key, CompilationManager._get_output_kind(), job.output_file)
+
+        if job.ir_file is not None:
+            ArtifactStore.store(job.key, ".ll", job.ir_file)
+
+        if job.asm_file is not None:
+            ArtifactStore.store(job.key, ".asm", job.asm_file)
+
+    @staticmethod
+    def _get_link_key(jobs: List[BackendJob]) -> Optional[str]:
+        raw_opts = CompilationManager.config.raw_opts
+
+        if any(job.key is None for job in jobs):
+            return None
+
+        return good_hash(":".join([str(raw_opts.whole_program), str(raw_opts.strip)] + [job.key for job in jobs]))
+
+    @staticmethod
+    def _get_whole_program_output_path(extension: str = ".o") -> str:
+        config = CompilationManager.config
+        return str(config.output_path.joinpath(f"{config.project_name}{extension}"))
+
+    @staticmethod
+    def _compile_whole_program(jobs: List[BackendJob], keep_module: bool) -> Optional[List[ModuleRef]]:
+        """
+        Links all modules into one, optimizes it once with everything but main internalized
+        and writes it as a single object (or bitcode), IR and assembly file.
+        Returns the program (only if :keep_module: is set, otherwise an empty list)
+        or None if it failed to compile.
+        :param jobs:
+        :param keep_module:
+        :return:
+        """
+        raw_opts = CompilationManager.config.raw_opts
+        project_name = CompilationManager.config.project_name
+        codegen = CompilationManager.codegen
+        ir_file = None
+        asm_file = None
+
+        if raw_opts.print_ir and not raw_opts.run:
+            ir_file = CompilationManager._get_whole_program_output_path(".ll")
+
+        if raw_opts.print_asm:
+            asm_file = str(CompilationManager.config.cache_path.joinpath(f"{project_name}.asm"))
+
+        # The IR is linked from the modules' jobs, it changes whenever any of their keys does
+        link_key = CompilationManager._get_link_key(jobs)
+        program_job = BackendJob(project_name, project_name, "", CompilationManager._get_whole_program_output_path(),
+                                 not raw_opts.run, raw_opts.use_object_files, ir_file, asm_file, link_key)
+        CompilationManager._restore_artifacts(program_job)
+
+        if not program_job.has_outputs:
+            if not keep_module:
+                return []
+
+            program = CompilationManager._load_optimized_module(program_job)
+
+            if program is not None:
+                return [program]
+
+        try:
+            with run_with_profiling(project_name, ExecutionStep.COMPILE_MOD):
+                # main is declared (unmangled) in std/startup/start.rial
+                program = codegen.compile_whole_program([job.llvm_ir for job in jobs], ["main"])
+        except Exception as e:
+            import traceback
+            log_fail(f"Exception when compiling the whole program {project_name}")
+            log_fail(e)
+            log_fail(traceback.format_exc())
+            return None
+
+        with run_with_profiling(project_name, ExecutionStep.WRITE_OBJ):
+            emit_outputs(codegen, program_job, program)
+
+        CompilationManager._store_artifacts(program_job)
+
+        if keep_module:
+            if link_key is not None:
+                CompilationManager._store_optimized_module(program_job, program.as_bitcode())
+            return [program]
+
+        program.close()
+
+        return []
+
+    @staticmethod
+    def _needs_jit() -> bool:
+        """
+        Whether the build executes code in-process, which needs the optimized modules in the JIT.
+        Building an executable only needs the object files.
+        :return:
+        """
+        return CompilationManager.config.raw_opts.run
+
+    @staticmethod
+    def _compile_modules(jobs: List[BackendJob], keep_modules: bool) -> Optional[List[ModuleRef]]:
+        """
+        Optimizes every module and writes its object (or bitcode), IR and assembly files,
+        in worker processes if the build is big enough.
+        Returns the optimized modules in the order of :jobs: (only if :keep_modules: is set, otherwise an empty list)
+        or None if a module failed to compile.
+        Modules that were optimized with the same key before and have no outputs left to write
+        are loaded from the artifact store instead.
+        :param jobs:
+        :param keep_modules:
+        :return:
+        """
+        raw_opts = CompilationManager.config.raw_opts
         modules: Dict[str, ModuleRef] = dict()
 
-        for key, mod in CompilationManager.modules.items():
-            path = CompilationManager.path_from_mod_name(key)
+        if keep_modules:
+            for job in jobs:
+                mod = CompilationManager._load_optimized_module(job)
+                if mod is not None:
+                    modules[job.path] = mod
 
-            if not CompilationManager.config.raw_opts.disable_cache:
-                cache_path = str(CompilationManager.get_cache_path_str(path)).replace(".rial", ".cache")
-                if not Path(cache_path).exists():
-                    CompilationManager.codegen.save_module(mod, cache_path)
+        pending = [job for job in jobs if job.path not in modules]
 
-            with run_with_profiling(CompilationManager.filename_from_path(path), ExecutionStep.COMPILE_MOD):
+        if should_compile_in_parallel(pending, raw_opts.compile_units):
+            with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.COMPILE_MODULES):
+                results = compile_modules(pending, raw_opts.compile_units, raw_opts.opt_level, raw_opts.disable_opt,
+                                          keep_modules)
+
+            for job in pending:
+                result = results[job.path]
+                filename = CompilationManager.filename_from_path(job.path)
+                record_profiling_event(filename, ExecutionStep.COMPILE_MOD, result.compile_time)
+                record_profiling_event(filename, ExecutionStep.WRITE_OBJ, result.emit_time)
+
+                if result.error is not None:
+                    log_fail(f"Exception when compiling module {job.name}")
+                    log_fail(result.error)
+                    return None
+
+                CompilationManager._store_artifacts(job)
+
+                if keep_modules:
+                    CompilationManager._store_optimized_module(job, result.bitcode)
+                    modules[job.path] = CompilationManager.codegen.binding.parse_bitcode(result.bitcode)
+        else:
+            for job in pending:
                 try:
-                    modules[path] = CompilationManager.codegen.compile_ir(mod)
+                    mod, compile_time, emit_time = run_job(CompilationManager.codegen, job)
                 except Exception as e:
                     import traceback
-                    log_fail(f"Exception when compiling module {mod.name}")
+                    log_fail(f"Exception when compiling module {job.name}")
                     log_fail(e)
                     log_fail(traceback.format_exc())
-                    return
+                    return None
 
-        object_files: List[str] = list()
-        CompilationManager.codegen.generate_final_modules(list(modules.values()))
+                filename = CompilationManager.filename_from_path(job.path)
+                record_profiling_event(filename, ExecutionStep.COMPILE_MOD, compile_time)
+                record_profiling_event(filename, ExecutionStep.WRITE_OBJ, emit_time)
+                CompilationManager._store_artifacts(job)
 
-        for path in list(modules.keys()):
-            mod = modules[path]
+                if keep_modules:
+                    if job.key is not None:
+                        CompilationManager._store_optimized_module(job, mod.as_bitcode())
+                    modules[job.path] = mod
+                else:
+                    mod.close()
 
-            if CompilationManager.config.raw_opts.print_ir:
-                ir_file = str(CompilationManager.get_output_path_str(path)).replace(".rial", ".ll")
-                if CompilationManager._check_needs_output(mod.name, ir_file):
-                    CompilationManager.codegen.save_ir(ir_file, mod)
+        if not keep_modules:
+            return []
 
-            if CompilationManager.config.raw_opts.print_asm:
-                asm_file = str(CompilationManager.get_cache_path_str(path)).replace(".rial", ".asm")
-                if CompilationManager._check_needs_output(mod.name, asm_file):
-                    CompilationManager.codegen.save_assembly(asm_file, mod)
+        return [modules[job.path] for job in jobs]
 
-            if not CompilationManager.config.raw_opts.use_object_files:
-                llvm_bitcode_file = str(CompilationManager.get_output_path_str(path)).replace(".rial", ".o")
-                if CompilationManager._check_needs_output(mod.name, llvm_bitcode_file):
-                    CompilationManager.codegen.save_llvm_bitcode(llvm_bitcode_file, mod)
-                object_files.append(llvm_bitcode_file)
-            else:
-                object_file = str(CompilationManager.get_output_path_str(path)).replace(".rial", ".o")
-                if CompilationManager._check_needs_output(mod.name, object_file):
-                    CompilationManager.codegen.save_object(object_file, mod)
-                object_files.append(object_file)
+    @staticmethod
+    def _load_optimized_module(job: BackendJob) -> Optional[ModuleRef]:
+        """
+        Loads the optimized module of :job: from the artifact store, if it has no outputs left to write.
+        :param job:
+        :return:
+        """
+        if job.has_outputs:
+            return None
 
-        with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.LINK_EXE):
-            exe_path = str(CompilationManager.config.bin_path.joinpath(
-                f"{CompilationManager.config.project_name}{Platform.get_exe_file_extension()}"))
+        bitcode = ArtifactStore.load(job.key, ".bc")
 
-            Linker.link_files(object_files, exe_path, CompilationManager.config.raw_opts.print_link_command,
-                              CompilationManager.config.raw_opts.strip)
+        if bitcode is None:
+            return None
+
+        return CompilationManager.codegen.binding.parse_bitcode(bitcode)
+
+    @staticmethod
+    def _store_optimized_module(job: BackendJob, bitcode: bytes):
+        # Bitcode outputs already went into the store
+        if job.write_output and CompilationManager._get_output_kind() == ".bc":
+            return
+
+        ArtifactStore.put(job.key, ".bc", bitcode)
 
     @staticmethod
     def _compile_file(path: str):
         mod_name = CompilationManager.mod_name_from_path(path)
+        CompilationManager.modules_in_progress.add(mod_name)
+
+        try:
+            return CompilationManager._compile_module(path, mod_name)
+        finally:
+            CompilationManager.modules_in_progress.discard(mod_name)
+
+    @staticmethod
+    def _compile_module(path: str, mod_name: str):
         filename = CompilationManager.filename_from_path(path)
+
+        # The build key of the module needs the interface hashes of its dependencies
+        CompilationManager._compile_dependencies(path)
+
+        if CompilationManager._load_from_interface(path, mod_name, filename):
+            return
+
         module = CompilationManager.codegen.get_module(mod_name, filename, path.replace(filename, ""))
         old_current_module = CompilationManager.current_module
         CompilationManager.current_module = module
@@ -134,119 +444,362 @@ class CompilationManager:
         # Extend the dependencies with the always_imported things, unless the module itself is part of that group
         if not mod_name.startswith("rial:builtin:"):
             for dependency in CompilationManager.always_imported:
-                module.dependencies[dependency] = dependency
+                module.add_dependency(dependency, dependency)
 
         with run_with_profiling(filename, ExecutionStep.READ_FILE):
-            with open(path, "r") as file:
-                contents = file.read()
+            if path in CompilationManager.discovered_modules:
+                contents = CompilationManager.discovered_modules[path].contents
+            else:
+                with open(path, "r") as file:
+                    contents = file.read()
 
         # Parsing
         with run_with_profiling(filename, ExecutionStep.PARSE_FILE):
-            try:
-                ast = CompilationManager.parser.parse(contents)
-            except Exception as e:
-                log_fail(f"Exception when parsing {filename}")
-                log_fail(e)
-                return e
+            serialized_tree = CompilationManager.parsed_trees.pop(path, None)
+
+            # Discovered modules already went through the cache
+            if serialized_tree is None and path not in CompilationManager.discovered_modules:
+                serialized_tree = ParseCache.lookup(contents)
+
+            ast = None
+
+            if serialized_tree is not None:
+                try:
+                    ast = load_tree(serialized_tree)
+                except Exception:
+                    # A truncated or corrupt cache entry, parsing again overwrites it
+                    increment_counter("PARSE_CACHE_ERRORS")
+
+            if ast is None:
+                try:
+                    ast = CompilationManager.parser.parse(contents)
+                    ParseCache.store(contents, dump_tree(ast))
+                except Exception as e:
+                    log_fail(f"Exception when parsing {filename}")
+                    log_fail(e)
+                    return e
 
         if CompilationManager.config.raw_opts.print_tokens:
             print(ast.pretty())
 
-        # Generate IR
-        with run_with_profiling(filename, ExecutionStep.GEN_IR):
+        with run_with_profiling(filename, ExecutionStep.DESUGAR):
             from rial.transformer.DesugarTransformer import DesugarTransformer
             ast = DesugarTransformer(module).transform(ast)
 
-            if ast is not None:
+        if ast is not None:
+            # A module with a single declaration doesn't get a start node
+            if ast.data != "start":
+                ast = Tree('start', [ast])
+
+            with run_with_profiling(filename, ExecutionStep.COLLECT_DECLARATIONS):
+                declarations = DeclarationIndex(ast)
+
+            with run_with_profiling(filename, ExecutionStep.DECLARE_STRUCTS):
                 from rial.transformer.StructDeclarationTransformer import StructDeclarationTransformer
-                ast = StructDeclarationTransformer(module).visit(ast)
+                struct_declaration_transformer = StructDeclarationTransformer(module)
+                for entry in declarations.structs:
+                    DeclarationIndex.replace(entry, struct_declaration_transformer.visit(entry[2]))
 
-            if ast is not None:
+            with run_with_profiling(filename, ExecutionStep.DECLARE_FUNCTIONS):
                 from rial.transformer.FunctionDeclarationTransformer import FunctionDeclarationTransformer
-                ast = FunctionDeclarationTransformer(module).visit(ast)
-
-            if ast is not None:
-                from rial.transformer.MainTransformer import MainTransformer
-                from rial.transformer.BuiltinTransformer import BuiltinTransformer
-                from rial.transformer.LoopTransformer import LoopTransformer
-                from rial.transformer.StandardOperationsTransformer import StandardOperationsTransformer
-                from rial.transformer.FunctionCallTransformer import FunctionCallTransformer
-                combined_transformer = CombinedTransformer()
-                combined_transformer += FunctionCallTransformer()
-                combined_transformer += BuiltinTransformer()
-                combined_transformer += LoopTransformer()
-                combined_transformer += StandardOperationsTransformer()
-                combined_transformer += MainTransformer()
-                for transformer in combined_transformer.transformers:
-                    from rial.transformer.BaseTransformer import BaseTransformer
-                    transformer: BaseTransformer
-                    transformer.combined_transformer = combined_transformer
+                function_declaration_transformer = FunctionDeclarationTransformer(module)
+                for entry in declarations.functions:
+                    DeclarationIndex.replace(entry, function_declaration_transformer.visit(entry[2]))
 
+            combined_transformer = CompilationManager._get_combined_transformer()
+
+            with run_with_profiling(filename, ExecutionStep.DECLARE_GLOBALS):
                 from rial.transformer.GlobalDeclarationTransformer import GlobalDeclarationTransformer
                 global_declaration_transformer = GlobalDeclarationTransformer()
                 global_declaration_transformer.main_transformer = combined_transformer
-                ast = global_declaration_transformer.transform(ast)
-
-                if ast is not None:
-                    ast = combined_transformer.visit(ast)
+                for entry in declarations.globals:
+                    DeclarationIndex.replace(entry, global_declaration_transformer.transform(entry[2]))
 
-                del combined_transformer
+            # Generate IR
+            with run_with_profiling(filename, ExecutionStep.GEN_IR):
+                combined_transformer.visit(ast)
 
         CompilationManager.modules[mod_name] = module
         CompilationManager.current_module = old_current_module
+        CompilationManager._store_interface(path, module)
 
     @staticmethod
-    def _collect_always_imported_paths():
+    def _compile_dependencies(path: str):
+        """
+        Compiles (or loads from their interface summaries) the modules that the module at :path: imports,
+        unless it can't be cached anyway.
+        :param path:
+        :return:
+        """
+        if CompilationManager.config.raw_opts.disable_cache or not CompilationManager._is_cacheable(path):
+            return
+
+        for dependency in CompilationManager._get_dependency_paths(path):
+            CompilationManager.request_file(dependency)
+
+    @staticmethod
+    def _load_from_interface(path: str, mod_name: str, filename: str) -> bool:
+        """
+        Declares the module at :path: from the interface summary of the last build with the same key,
+        which is all its dependents need, and keeps the IR of that build for its backend job.
+        Returns False if there is no such summary, the module then has to be compiled.
+        :param path:
+        :param mod_name:
+        :param filename:
+        :return:
+        """
+        key = CompilationManager._get_module_key(path)
+
+        if key is None:
+            return False
+
+        summary = ArtifactStore.get(key, "interface")
+        llvm_ir = summary is not None and ArtifactStore.get(key, "ir") or None
+        increment_counter(llvm_ir is None and "INTERFACE_CACHE_MISSES" or "INTERFACE_CACHE_HITS")
+
+        if llvm_ir is None:
+            return False
+
+        with run_with_profiling(filename, ExecutionStep.LOAD_INTERFACE):
+            module = CompilationManager.codegen.get_module(mod_name, filename, path.replace(filename, ""))
+            structs = load_interface(module, summary)
+
+            # E.g. a struct of the same name was declared in the meantime, compiling reports that
+            if structs is None:
+                return False
+
+            for struct in structs:
+                CompilationManager.codegen.record_struct_layout(struct)
+
+        CompilationManager.modules[mod_name] = module
+        CompilationManager.interface_ir[mod_name] = llvm_ir.decode()
+        CompilationManager.interface_hashes[path] = CompilationManager._get_interface_hash(path, summary)
+        CompilationManager.parsed_trees.pop(path, None)
+
+        return True
+
+    @staticmethod
+    def _store_interface(path: str, module: RIALModule):
+        key = CompilationManager._get_module_key(path)
+
+        if key is None:
+            return
+
+        summary = dump_interface(module)
+
+        if summary is not None:
+            ArtifactStore.put(key, "interface", summary)
+
+        CompilationManager.interface_hashes[path] = CompilationManager._get_interface_hash(path, summary)
+
+    @staticmethod
+    def _get_interface_hash(path: str, summary: Optional[bytes]) -> str:
+        """
+        The hash of everything that dependents of the module at :path: can see, its :summary: and
+        the interfaces of its dependencies, which e.g. declare the structs it uses in its signatures.
+        Dependents are only rebuilt when this changes.
+        :param path:
+        :param summary:
+        :return:
+        """
+        # Without a summary every change of the module has to rebuild its dependents
+        if summary is None:
+            return CompilationManager._get_module_key(path)
+
+        parts = [hashlib.md5(summary).hexdigest()]
+
+        for dependency in CompilationManager._get_dependency_paths(path):
+            parts.append(CompilationManager.interface_hashes[dependency])
+
+        return good_hash(":".join(parts))
+
+    @staticmethod
+    def _print_struct_layouts():
+        for mod_name, module in CompilationManager.modules.items():
+            for kind, struct in module.definitions.values():
+                if kind != DEFINITION_STRUCT:
+                    continue
+
+                definition = struct.definition
+                print(f"{struct.name} ({mod_name}): size {definition.size}, alignment {definition.alignment}")
+                for name, (index, prop) in definition.properties.items():
+                    print(f"    {definition.offsets.get(name)}: {name} {prop.rial_type}")
+
+    @staticmethod
+    def _get_combined_transformer() -> CombinedTransformer:
+        """
+        Creates the transformers for the main IR generation once per build, they are reused for every module.
+        :return:
+        """
+        if CompilationManager.combined_transformer is None:
+            from rial.transformer.MainTransformer import MainTransformer
+            from rial.transformer.BuiltinTransformer import BuiltinTransformer
+            from rial.transformer.LoopTransformer import LoopTransformer
+            from rial.transformer.StandardOperationsTransformer import StandardOperationsTransformer
+            from rial.transformer.FunctionCallTransformer import FunctionCallTransformer
+            combined_transformer = CombinedTransformer(FunctionCallTransformer(), BuiltinTransformer(),
+                                                       LoopTransformer(), StandardOperationsTransformer(),
+                                                       MainTransformer())
+            for transformer in combined_transformer.transformers:
+                from rial.transformer.BaseTransformer import BaseTransformer
+                transformer: BaseTransformer
+                transformer.combined_transformer = combined_transformer
+            CompilationManager.combined_transformer = combined_transformer
+
+        return CompilationManager.combined_transformer
+
+    @staticmethod
+    def _get_always_imported_paths() -> List[str]:
         builtin_path = str(CompilationManager.config.rial_path.joinpath("builtin"))
-        for file in [join(builtin_path, f) for f in listdir(builtin_path) if isfile(join(builtin_path, f))]:
+        return [join(builtin_path, f) for f in listdir(builtin_path) if isfile(join(builtin_path, f))]
+
+    @staticmethod
+    def _collect_always_imported_paths():
+        for file in CompilationManager._get_always_imported_paths():
             module_name = CompilationManager.mod_name_from_path(CompilationManager.filename_from_path(str(file)))
             CompilationManager.always_imported.append(module_name)
             CompilationManager._compile_file(file)
 
     @staticmethod
-    def _check_cache(path: str) -> int:
+    def _discover_modules(entry_paths: List[str]):
+        """
+        Walks the imports starting from :entry_paths: and records every reachable module together with its contents.
+        Modules whose files don't exist are skipped, the error is reported once the import is actually compiled.
+        :param entry_paths:
+        :return:
+        """
+        project_name = CompilationManager.config.project_name
+        pending = list(reversed(entry_paths))
+
+        while len(pending) > 0:
+            path = pending.pop()
+            if path in CompilationManager.discovered_modules or not os.path.isfile(path):
+                continue
+
+            with open(path, "r") as file:
+                contents = file.read()
+
+            imports = scan_imports(contents, project_name)
+            CompilationManager.discovered_modules[path] = DiscoveredModule(
+                CompilationManager.mod_name_from_path(path), path, contents, imports)
+            pending.extend(reversed([CompilationManager.path_from_mod_name(mod_name) for mod_name in imports]))
+
+    @staticmethod
+    def _parse_reachable_modules(entry_paths: List[str]):
+        with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.DISCOVER_MODULES):
+            CompilationManager._discover_modules(entry_paths)
+
+        modules = list()
+        with run_with_profiling("/cache/parse", ExecutionStep.READ_CACHE):
+            for module in CompilationManager.discovered_modules.values():
+                serialized_tree = ParseCache.lookup(module.contents)
+                if serialized_tree is not None:
+                    CompilationManager.parsed_trees[module.path] = serialized_tree
+                else:
+                    modules.append(module)
+
+        workers = CompilationManager.config.raw_opts.compile_units
+
+        # Small builds are parsed lazily in _compile_file
+        if not should_parse_in_parallel(modules, workers):
+            return
+
+        with run_with_profiling(CompilationManager.config.project_name, ExecutionStep.PARSE_MODULES):
+            results = parse_modules(modules, workers, CompilationManager.config.project_name,
+                                    CompilationManager.codegen.target_machine.triple,
+                                    CompilationManager.config.raw_opts.lexer)
+
+        for path, (serialized_tree, time_taken) in results.items():
+            record_profiling_event(CompilationManager.filename_from_path(path), ExecutionStep.PARSE_FILE, time_taken)
+
+            # Failed parses are repeated in-process when the module is compiled, which reports the error
+            if serialized_tree is not None:
+                CompilationManager.parsed_trees[path] = serialized_tree
+                ParseCache.store(CompilationManager.discovered_modules[path].contents, serialized_tree)
+
+    @staticmethod
+    def _get_dependency_paths(path: str) -> Optional[List[str]]:
         """
-        Checks the Cache subsystem. Can be disabled as well, in which case it just returns 0.
-        If the cache is invalid then it setups the cache again with the currently last modified time.
-        If a dependency is invalid it returns 0.
-        If dependencies haven't been compiled, yet, it returns -1 to signal a requeue. The requeue has already been done.
+        The paths of the modules that the discovered module at :path: imports, including the always imported ones.
+        Returns None if the module wasn't discovered.
+        :param path:
+        :return:
+        """
+        discovered = CompilationManager.discovered_modules.get(path)
+
+        if discovered is None:
+            return None
+
+        dependencies = [CompilationManager.path_from_mod_name(mod_name) for mod_name in discovered.imports]
+        if not discovered.mod_name.startswith("rial:builtin:"):
+            dependencies.extend(CompilationManager._get_always_imported_paths())
+
+        return sorted(set(dependencies))
+
+    @staticmethod
+    def _is_cacheable(path: str) -> bool:
+        """
+        Whether the module at :path: and all modules it (transitively) imports were discovered
+        and none of them is part of an import cycle.
+        :param path:
+        :return:
+        """
+        cacheable = CompilationManager.cacheable
+
+        if path in cacheable:
+            return cacheable[path]
+
+        # Modules in an import cycle find this placeholder and aren't cached
+        cacheable[path] = False
+        dependencies = CompilationManager._get_dependency_paths(path)
+
+        cacheable[path] = dependencies is not None and all(
+            CompilationManager._is_cacheable(dependency) for dependency in dependencies)
+
+        return cacheable[path]
+
+    @staticmethod
+    def _get_module_key(path: str) -> Optional[str]:
+        """
+        The build key of the module at :path:, a hash of its source, the interface hashes of its dependencies,
+        the compiler and the options that change the generated code.
+        Changing only the body of a module doesn't change its interface hash and thus the keys of its dependents.
+        Returns None if the module can't be cached: caching is disabled, it wasn't discovered,
+        it is part of an import cycle or one of its dependencies has no interface hash (yet),
+        e.g. because it failed to compile.
         :param path:
         :return:
         """
         if CompilationManager.config.raw_opts.disable_cache:
-            return 0
-
-        last_modified = os.path.getmtime(path)
-        module = Cache.get_cached_module(path)
-
-        if module is None:
-            # Setup module for last_modified to be saved
-            Cache.cache_module(None, path, str(CompilationManager.get_cache_path_str(path)), last_modified)
-            return 0
-
-        dependency_invalid = False
-        request_recompilation = list()
-        for dependency in module.dependencies:
-            if CompilationManager.check_module_already_compiled(dependency):
-                if dependency not in CompilationManager.cached_modules:
-                    dependency_invalid = True
-            else:
-                request_recompilation.append(dependency)
+            return None
+
+        keys = CompilationManager.module_keys
 
-        # Request compilation of dependencies
-        for dependency in request_recompilation:
-            CompilationManager.request_module(dependency)
+        if path in keys:
+            return keys[path]
 
-        # If a dependency was already invalid we don't need to check again
-        if dependency_invalid:
-            return 0
+        if not CompilationManager._is_cacheable(path):
+            keys[path] = None
+            return None
 
-        # If no dependency was invalid, yet, check again.
-        if len(request_recompilation) > 0:
-            return CompilationManager._check_cache(path)
+        discovered = CompilationManager.discovered_modules[path]
+        raw_opts = CompilationManager.config.raw_opts
+        parts = [get_compiler_version(), raw_opts.opt_level, str(raw_opts.disable_opt), str(raw_opts.fold_constants),
+                 CompilationManager.config.project_name, CompilationManager.codegen.target_machine.triple,
+                 discovered.mod_name, good_hash(discovered.contents)]
 
-        CompilationManager.cached_modules.append(module.name)
-        return 1
+        for dependency in CompilationManager._get_dependency_paths(path):
+            interface_hash = CompilationManager.interface_hashes.get(dependency)
+
+            if interface_hash is None:
+                keys[path] = None
+                return None
+
+            parts.append(interface_hash)
+
+        keys[path] = good_hash(":".join(parts))
+
+        return keys[path]
 
     @staticmethod
     def check_module_already_compiled(mod_name: str) -> bool:
@@ -271,9 +824,7 @@ class CompilationManager:
         :param mod_name:
         :return:
         """
-        if mod_name.startswith("builtin") or mod_name.startswith("core") or mod_name.startswith(
-                "std") or mod_name.startswith("startup"):
-            mod_name = f"rial:{mod_name}"
+        mod_name = qualify_mod_name(mod_name)
         if mod_name not in CompilationManager.modules:
             CompilationManager._compile_file(CompilationManager.path_from_mod_name(mod_name))
 
@@ -346,7 +897,3 @@ class CompilationManager:
         """
         return path.replace(str(CompilationManager.config.source_path), "").replace(
             str(CompilationManager.config.rial_path), "").replace(str(CompilationManager.config.cache_path), "")
-
-    @staticmethod
-    def _check_needs_output(module_name: str, path: str):
-        return not (module_name in CompilationManager.cached_modules and Path(path).exists())
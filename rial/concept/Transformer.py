@@ -1,18 +1,54 @@
 from rial.concept import parser
-from rial.concept.parser import Discard
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Discard, Tree, Token
 
 
 class Transformer(parser.Transformer):
+    """
+    Bottom-up transformer that walks the tree with an explicit stack instead of recursing.
+    Methods can return DISCARD instead of raising Discard to drop their node from the parent.
+    """
+
     def transform(self, tree):
         try:
             return super().transform(tree)
         except Discard:
             pass
         except Exception as e:
-            from rial.util.log import log_fail
-            log_fail(e)
-            from rial.compilation_manager import CompilationManager
-            log_fail(
-                f"Current Module: {CompilationManager.current_module is not None and CompilationManager.current_module.name or ''}")
-            import traceback
-            log_fail(traceback.format_exc())
+            from rial.concept.TransformerInterpreter import log_visit_error
+            log_visit_error(e)
+
+    def _transform_tree(self, tree):
+        # Each frame is the tree, an iterator over its remaining children and its already transformed children
+        stack = [(tree, iter(tree.children), list())]
+
+        while True:
+            tree, children, transformed = stack[-1]
+
+            for child in children:
+                if isinstance(child, Tree):
+                    stack.append((child, iter(child.children), list()))
+                    break
+
+                if self.__visit_tokens__ and isinstance(child, Token):
+                    try:
+                        child = self._call_userfunc_token(child)
+                    except Discard:
+                        continue
+                    if child is DISCARD:
+                        continue
+
+                transformed.append(child)
+            else:
+                stack.pop()
+
+                try:
+                    result = self._call_userfunc(tree, transformed)
+                except Discard:
+                    result = DISCARD
+
+                if len(stack) == 0:
+                    return None if result is DISCARD else result
+
+                if result is not DISCARD:
+                    stack[-1][2].append(result)
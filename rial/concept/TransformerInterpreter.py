@@ -1,34 +1,106 @@
+from types import GeneratorType
+from typing import Callable, Dict, Optional, Tuple
+
+from rial.concept.discard import DISCARD
 from rial.concept.parser import Tree, Interpreter, Discard
 
 
+def log_visit_error(e: Exception):
+    from rial.util.log import log_fail
+    log_fail(e)
+    from rial.compilation_manager import CompilationManager
+    log_fail(
+        f"Current Module: {CompilationManager.current_module is not None and CompilationManager.current_module.name or ''}")
+    import traceback
+    log_fail(traceback.format_exc())
+
+
 class TransformerInterpreter(Interpreter):
-    """Top-down visitor, recursive
+    """Top-down visitor
 
     Visits the tree, starting with the root and finally the leaves (top-down)
     Calls its methods (provided by user via inheritance) according to tree.data
 
     Unlike Transformer and Visitor, the Interpreter doesn't automatically visit its sub-branches.
     The user has to explicitly call visit_children, or use the @visit_children_decor
+
+    Methods can either call visit themselves (recursive) or be written as generators that yield the nodes
+    they want visited and receive the result back, e.g. ``left = yield nodes[0]``.
+    Generators are driven from an explicit stack, so nesting depth is not limited by the recursion limit.
+    Yielding anything that is not a Tree returns it unchanged.
+    Returning DISCARD (or raising Discard) makes the visit return None.
     """
+    # Rule name to method and visit wrapper, rules that are not in here are looked up with getattr
+    dispatch: Dict[str, Tuple[Callable, Optional[Callable]]] = dict()
 
     def visit(self, tree):
-        f = getattr(self, tree.data)
-        wrapper = getattr(f, 'visit_wrapper', None)
+        stack = list()
+        result = self._call_visit(tree, stack)
+        error = None
+
+        while len(stack) > 0:
+            generator = stack[-1]
+            try:
+                if error is not None:
+                    pending, error = error, None
+                    request = generator.throw(pending)
+                else:
+                    request = generator.send(result)
+            except StopIteration as e:
+                stack.pop()
+                result = None if e.value is DISCARD else e.value
+                continue
+            except Discard:
+                stack.pop()
+                result = None
+                continue
+            except Exception as e:
+                stack.pop()
+                log_visit_error(e)
+                result = None
+                continue
+
+            if isinstance(request, Tree):
+                try:
+                    result = self._call_visit(request, stack)
+                except Exception as e:
+                    # Same as a failing visit call inside of the method
+                    error = e
+            else:
+                result = request
+
+        return result
+
+    def _call_visit(self, tree: Tree, stack: list):
+        """
+        Calls the method for the tree. Generators are pushed onto the stack and None is returned in their place.
+        """
+        entry = self.dispatch.get(tree.data)
+        if entry is not None:
+            f, wrapper = entry
+        else:
+            f = getattr(self, tree.data)
+            wrapper = getattr(f, 'visit_wrapper', None)
+
         try:
             if wrapper is not None:
-                return f.visit_wrapper(f, tree.data, tree.children, tree.meta)
+                result = wrapper(f, tree.data, tree.children, tree.meta)
             else:
-                return f(tree)
+                result = f(tree)
         except Discard:
-            pass
+            return None
         except Exception as e:
-            from rial.util.log import log_fail
-            log_fail(e)
-            from rial.compilation_manager import CompilationManager
-            log_fail(
-                f"Current Module: {CompilationManager.current_module is not None and CompilationManager.current_module.name or ''}")
-            import traceback
-            log_fail(traceback.format_exc())
+            log_visit_error(e)
+            return None
+
+        if isinstance(result, GeneratorType):
+            stack.append(result)
+            return None
+
+        if result is DISCARD:
+            return None
+
+        return result
 
     def visit_children(self, tree) -> Tree:
         children = list()
@@ -46,3 +118,14 @@ class TransformerInterpreter(Interpreter):
         tree.children = children
 
         return tree
+
+    def __default__(self, tree):
+        # Same as visit_children but without recursing for nested rules that have no method
+        children = list()
+
+        for child in tree.children:
+            children.append((yield child))
+
+        tree.children = children
+
+        return tree
@@ -1,21 +1,35 @@
-from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
 
 from rial.concept.TransformerInterpreter import TransformerInterpreter
 
 
 class CombinedTransformer(TransformerInterpreter):
+    """
+    Dispatches every rule to the last transformer that implements it.
+    The rule table is built once when the transformer set is created, so a CombinedTransformer should be created
+    once and reused for every module instead of per module.
+    """
+    dispatch: Dict[str, Tuple[Callable, Optional[Callable]]]
+
     def __init__(self, *transformers):
         super().__init__()
         self.transformers = transformers
+        self.dispatch = dict()
+
+        for transformer in transformers:
+            for name in dir(type(transformer)):
+                if name.startswith("_"):
+                    continue
+                if not callable(getattr(type(transformer), name)):
+                    continue
+                method = getattr(transformer, name)
+                self.dispatch[name] = (method, getattr(method, 'visit_wrapper', None))
 
-    @lru_cache(128)
     def __getattr__(self, key):
-        for transformer in reversed(self.transformers):
-            try:
-                return getattr(transformer, key)
-            except AttributeError:
-                pass
-        raise AttributeError(key)
+        entry = self.dispatch.get(key)
+        if entry is None:
+            raise AttributeError(key)
+        return entry[0]
 
     def __add__(self, other):
         return CombinedTransformer(*self.transformers, other)
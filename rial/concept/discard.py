@@ -0,0 +1,14 @@
+class _Discard:
+    """
+    Returned by transformer methods to drop their node.
+    Has the same effect as raising Discard but doesn't unwind the stack.
+    """
+
+    def __repr__(self):
+        return "DISCARD"
+
+    def __reduce__(self):
+        return "DISCARD"
+
+
+DISCARD = _Discard()
@@ -1,17 +1,25 @@
-import re
 from typing import Optional, List
 
 from llvmlite import ir
 
 from rial.ir.LLVMBlock import LLVMBlock
 from rial.ir.LLVMIRInstruction import LLVMIRInstruction
+from rial.ir.OverloadResolver import OverloadResolver
 from rial.ir.RIALFunction import RIALFunction
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALVariable import RIALVariable
-from rial.transformer.builtin_type_to_llvm_mapper import map_llvm_to_type, is_builtin_type, Int32
+from rial.transformer.builtin_type_to_llvm_mapper import is_builtin_type, Int32
 
 
 class IRBuilder(ir.IRBuilder):
+    def _insert(self, instr):
+        # Changes the body, so its textual IR has to be formatted again
+        func = self._block.parent
+        if isinstance(func, RIALFunction):
+            func.frozen_body = None
+
+        super()._insert(instr)
+
     def create_block(self, block_name: str, parent: Optional[LLVMBlock] = None,
                      sibling: Optional[LLVMBlock] = None) -> \
             Optional[LLVMBlock]:
@@ -21,6 +29,45 @@ class IRBuilder(ir.IRBuilder):
 
         return block
 
+    def create_block_name(self, kind: str) -> str:
+        """
+        Reserves a name that is unique in the current function for the blocks of a :kind: statement.
+        The names don't include the name of the enclosing block, as LLVM truncates long names
+        and the labels of deeply nested blocks would collide.
+        :param kind:
+        :return:
+        """
+        return self.function.scope.register(kind, deduplicate=True)
+
+    def alloca_in_entry(self, typ: ir.Type, size: Optional[ir.Value] = None, name: str = '') -> ir.AllocaInstr:
+        """
+        Allocates at the start of the entry block, so the stack slot is reserved once per call
+        instead of every time the surrounding block runs.
+        Allocations with a dynamic size stay where they are.
+        :param typ:
+        :param size:
+        :param name:
+        :return:
+        """
+        func: RIALFunction = self.function
+
+        if (size is not None and not isinstance(size, ir.Constant)) or not isinstance(func, RIALFunction):
+            return self.alloca(typ, size, name)
+
+        entry = func.entry_basic_block
+        block, anchor = self._block, self._anchor
+        self._block, self._anchor = entry, func.entry_allocas
+
+        try:
+            allocated = self.alloca(typ, size, name)
+        finally:
+            self._block = block
+            self._anchor = block is entry and anchor + 1 or anchor
+
+        func.entry_allocas += 1
+
+        return allocated
+
     def create_conditional_jump(self, condition: ir.Value, true_block: LLVMBlock, false_block: LLVMBlock, weights=None):
         if weights is None:
             weights = [50, 50]
@@ -45,66 +92,7 @@ class IRBuilder(ir.IRBuilder):
         self.gen_function_call([glob], [])
 
     def gen_function_call(self, candidates: List, arguments: List[RIALVariable], implicit_parameter=None):
-        if len(candidates) > 1:
-            from rial.ir.RIALModule import RIALModule
-            for duplicate in candidates:
-                if isinstance(duplicate, RIALVariable):
-                    # Check if wrong module
-                    if implicit_parameter is not None and isinstance(implicit_parameter, RIALModule):
-                        if duplicate.is_global and duplicate.value.parent.name != implicit_parameter.name:
-                            candidates.remove(duplicate)
-                            continue
-                    # Check if function
-                    if not isinstance(duplicate.llvm_type, ir.FunctionType):
-                        candidates.remove(duplicate)
-                        continue
-                elif isinstance(duplicate, RIALIdentifiedStructType):
-                    # Check if wrong module
-                    if implicit_parameter is not None and isinstance(implicit_parameter, RIALModule):
-                        if duplicate.module_name != implicit_parameter.name:
-                            candidates.remove(duplicate)
-                            continue
-                elif isinstance(duplicate, RIALFunction):
-                    # Check if wrong module
-                    if implicit_parameter is not None and isinstance(implicit_parameter, RIALModule):
-                        if duplicate.module.name != implicit_parameter.name:
-                            candidates.remove(duplicate)
-                            continue
-                else:
-                    candidates.remove(duplicate)
-                    continue
-
-            if len(candidates) > 1:
-                candids = list()
-                for duplicate in candidates:
-                    if isinstance(duplicate, RIALFunction):
-                        # Check arguments
-                        if len(arguments) != len(duplicate.definition.rial_args):
-                            continue
-
-                        for i, rial_arg in enumerate(duplicate.definition.rial_args):
-                            if rial_arg.rial_type != arguments[i].rial_type:
-                                candidates.remove(duplicate)
-                                break
-
-                        candids.append(duplicate)
-                    elif isinstance(duplicate, RIALVariable):
-                        # Check arguments against function_type parsed to rial_type
-                        for i, arg in duplicate.llvm_type.args:
-                            if arguments[i].rial_type != map_llvm_to_type(arg.type):
-                                candidates.remove(duplicate)
-                                break
-                        candids.append(duplicate)
-                candidates = candids
-
-            if len(candidates) == 1:
-                func = candidates[0]
-            else:
-                raise KeyError(candidates)
-        elif len(candidates) == 0:
-            raise KeyError(candidates)
-        else:
-            func = candidates[0]
+        func = OverloadResolver.resolve(candidates, arguments, implicit_parameter)
 
         if isinstance(func, RIALFunction):
             if func.definition.unsafe:
@@ -120,7 +108,7 @@ class IRBuilder(ir.IRBuilder):
                     args.append(arg.get_loaded_if_variable(self.module))
 
                 # Pointer to first element for still normal arrays
-                elif re.match(r".+\[[0-9]+\]$", arg.rial_type) is not None:
+                elif arg.rial_type.is_sized_array:
                     args.append(self.gep(arg.value, [Int32(0), Int32(0)]))
 
                 else:
@@ -140,7 +128,7 @@ class IRBuilder(ir.IRBuilder):
             from rial.ir.RIALModule import RIALModule
             mod: RIALModule = self.module
             funcs = mod.get_functions_by_canonical_name(f"{func.name}_constructor")
-            allocad = self.alloca(func)
+            allocad = self.alloca_in_entry(func)
             variable = RIALVariable(f"{func.name}_allocad", func.name, func, allocad)
             arguments.insert(0, variable)
 
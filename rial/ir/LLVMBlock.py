@@ -9,12 +9,14 @@ class LLVMBlock(Block):
     named_values: Dict[str, RIALVariable]
     llvmblock_parent: Any
     llvmblock_sibling: Any
+    scope_table: Any
 
     def __init__(self, parent, name):
         super().__init__(parent, name)
         self.named_values = dict()
         self.llvmblock_parent = None
         self.llvmblock_sibling = None
+        self.scope_table = None
 
     def get_named_value(self, name: str) -> Optional[RIALVariable]:
         current = self
@@ -42,3 +44,7 @@ class LLVMBlock(Block):
 
     def add_named_value(self, name: str, value: RIALVariable):
         self.named_values[name] = value
+
+        # Keep the module's scope table up to date while this block is visible from the current block
+        if self.scope_table is not None:
+            self.scope_table.declare(self, name, value)
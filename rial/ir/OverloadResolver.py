@@ -0,0 +1,172 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from llvmlite import ir
+
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
+from rial.ir.RIALType import get_type
+from rial.ir.RIALVariable import RIALVariable
+from rial.profiling import increment_counter
+from rial.transformer.builtin_type_to_llvm_mapper import map_llvm_to_type
+
+# Ranks of the candidates that take as many arguments as are passed, lower ranks win
+RANK_EXACT = 0
+RANK_ARITY = 1
+
+
+class OverloadResolver:
+    """
+    Picks the function that a call refers to out of everything its name could mean.
+
+    The candidates that remain after dropping the ones that can't be called (or are in the wrong module)
+    are ranked by how well they match the passed arguments.
+    The result for a call site is cached by its module, identifiers, argument types and implicit parameter,
+    a cached result is dropped whenever a function or struct is declared under one of its identifiers
+    (unless the declared function has the same name as the result).
+    """
+    resolved_calls: Dict[Tuple, Any] = dict()
+    keys_by_name: Dict[str, Set[Tuple]] = dict()
+
+    def __init__(self):
+        raise PermissionError()
+
+    @staticmethod
+    def invalidate(name: Optional[str] = None, declared: Optional[str] = None):
+        """
+        Drops the cached results of the calls that have :name: as one of their identifiers, or all of them.
+        Results that are a function named :declared: are kept, declaring a function under the same name again
+        (as calling a function of another module does) doesn't change what the calls resolve to.
+        :param name:
+        :param declared:
+        :return:
+        """
+        if name is None:
+            OverloadResolver.resolved_calls.clear()
+            OverloadResolver.keys_by_name.clear()
+            return
+
+        kept = set()
+
+        for key in OverloadResolver.keys_by_name.pop(name, ()):
+            resolved = OverloadResolver.resolved_calls.get(key)
+
+            if declared is not None and isinstance(resolved, RIALFunction) and resolved.name == declared:
+                kept.add(key)
+            else:
+                OverloadResolver.resolved_calls.pop(key, None)
+
+        if len(kept) > 0:
+            OverloadResolver.keys_by_name[name] = kept
+
+    @staticmethod
+    def get_call_key(module, identifiers: List[str], arguments: List[RIALVariable], implicit_parameter) -> Tuple:
+        from rial.ir.RIALModule import RIALModule
+        if isinstance(implicit_parameter, RIALModule):
+            implicit_key = implicit_parameter.name
+        elif isinstance(implicit_parameter, RIALVariable):
+            implicit_key = (implicit_parameter.rial_type,)
+        else:
+            implicit_key = None
+
+        return module.name, tuple(identifiers), tuple(arg.rial_type for arg in arguments), implicit_key
+
+    @staticmethod
+    def lookup(key: Tuple) -> Optional[Any]:
+        resolved = OverloadResolver.resolved_calls.get(key)
+        increment_counter(resolved is not None and "OVERLOAD_HITS" or "OVERLOAD_MISSES")
+
+        return resolved
+
+    @staticmethod
+    def store(key: Tuple, resolved: Any):
+        OverloadResolver.resolved_calls[key] = resolved
+
+        for identifier in key[1]:
+            OverloadResolver.keys_by_name.setdefault(identifier, set()).add(key)
+
+    @staticmethod
+    def resolve(candidates: List, arguments: List[RIALVariable], implicit_parameter=None):
+        """
+        Resolves the candidates to the one that is called.
+        A single candidate is returned as is, even if it doesn't match the arguments.
+        :param candidates:
+        :param arguments:
+        :param implicit_parameter:
+        :return:
+        """
+        if len(candidates) == 0:
+            raise KeyError(candidates)
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        candidates = OverloadResolver._filter_callable(candidates, implicit_parameter)
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        ranked = OverloadResolver._rank(candidates, arguments)
+
+        for rank in (RANK_EXACT, RANK_ARITY):
+            if len(ranked[rank]) == 1:
+                return ranked[rank][0]
+            if len(ranked[rank]) > 1:
+                break
+
+        raise KeyError(candidates)
+
+    @staticmethod
+    def _filter_callable(candidates: List, implicit_parameter) -> List:
+        from rial.ir.RIALModule import RIALModule
+        module_name = isinstance(implicit_parameter, RIALModule) and implicit_parameter.name or None
+        callable_candidates = list()
+        function_names = set()
+
+        for candidate in candidates:
+            if isinstance(candidate, RIALVariable):
+                # Check if wrong module
+                if module_name is not None and candidate.is_global and candidate.value.parent.name != module_name:
+                    continue
+                # Check if function
+                if not isinstance(candidate.llvm_type, ir.FunctionType):
+                    continue
+            elif isinstance(candidate, RIALIdentifiedStructType):
+                if module_name is not None and candidate.module_name != module_name:
+                    continue
+            elif isinstance(candidate, RIALFunction):
+                if module_name is not None and candidate.module.name != module_name:
+                    continue
+                # Functions that are called from other modules are redeclared there under the same name
+                if candidate.name in function_names:
+                    continue
+                function_names.add(candidate.name)
+            else:
+                continue
+
+            callable_candidates.append(candidate)
+
+        return callable_candidates
+
+    @staticmethod
+    def _rank(candidates: List, arguments: List[RIALVariable]) -> Tuple[List, List]:
+        ranked = (list(), list())
+
+        for candidate in candidates:
+            if isinstance(candidate, RIALFunction):
+                arg_types = [arg.rial_type for arg in candidate.definition.rial_args]
+            elif isinstance(candidate, RIALVariable):
+                arg_types = [get_type(map_llvm_to_type(arg)) for arg in candidate.llvm_type.args]
+            else:
+                # Structs are only called if nothing else has the name
+                continue
+
+            if len(arg_types) != len(arguments):
+                continue
+
+            # Types are interned
+            if all(arg_type is argument.rial_type for arg_type, argument in zip(arg_types, arguments)):
+                ranked[RANK_EXACT].append(candidate)
+            else:
+                ranked[RANK_ARITY].append(candidate)
+
+        return ranked
@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional, Set
+
+from rial.profiling import increment_counter
+
+
+class PreludeTable:
+    """
+    Everything the always imported (builtin) modules export, merged into one table.
+
+    The table is built once after all builtin modules are compiled, so that a name that is not defined in a module
+    costs one lookup instead of a search through every builtin module.
+    Earlier modules shadow later ones, the same as searching them in order.
+    Names that none of the modules define are remembered as missing.
+    """
+    modules: List
+    exports: Dict[str, Any]
+    missing: Set[str]
+
+    def __init__(self, modules: List):
+        self.modules = modules
+        self.exports = dict()
+        self.missing = set()
+
+        for module in modules:
+            # Resolved through the module itself so that its own precedence between declarations and imports holds
+            for name in list(module.dependencies) + list(module.definitions):
+                if name not in self.exports:
+                    value = module.get_definition([name])
+                    if value is not None:
+                        self.exports[name] = value
+
+    def lookup(self, name: str) -> Optional[Any]:
+        value = self.exports.get(name)
+
+        if value is not None or name in self.missing:
+            increment_counter("PRELUDE_HITS")
+            return value
+
+        # Names that are not plain declarations, e.g. array or function types that are resolved by a builtin module
+        increment_counter("PRELUDE_MISSES")
+        for module in self.modules:
+            value = module.get_definition([name])
+
+            if value is not None:
+                self.exports[name] = value
+                return value
+
+        self.missing.add(name)
+
+        return None
+
+    def invalidate(self, name: str):
+        """
+        Called when a builtin module declares something after the table was built.
+        """
+        self.exports.pop(name, None)
+        self.missing.discard(name)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from llvmlite.ir import Function, FunctionType
 
@@ -10,13 +10,32 @@ class RIALFunction(Function):
     canonical_name: str
     definition: FunctionDefinition
     blocks: List[LLVMBlock]
+    entry_allocas: int
+    frozen_body: Optional[str]
 
     def __init__(self, module, ftype: FunctionType, name: str, canonical_name: str):
+        # Set before the function is added to the module, which indexes it by its canonical name
+        self.canonical_name = canonical_name
         super().__init__(module, ftype, name)
         self.definition = None
-        self.canonical_name = canonical_name
+        # Number of allocas at the start of the entry block
+        self.entry_allocas = 0
+        # Textual IR of the blocks, set once the body is done so that the module doesn't format it again
+        self.frozen_body = None
+
+    def freeze(self):
+        buf = list()
+        super().descr_body(buf)
+        self.frozen_body = "".join(buf)
+
+    def descr_body(self, buf):
+        if self.frozen_body is not None:
+            buf.append(self.frozen_body)
+        else:
+            super().descr_body(buf)
 
     def append_basic_block(self, name=''):
+        self.frozen_body = None
         blk = LLVMBlock(parent=self, name=name)
         self.blocks.append(blk)
         return blk
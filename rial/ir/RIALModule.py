@@ -1,30 +1,40 @@
-import re
 from contextlib import contextmanager
-from typing import Dict, Optional, Union, List, Tuple
+from typing import Dict, Optional, Union, List, Tuple, Any
 
 from llvmlite import ir
-from llvmlite.ir import Module, Context, Block, AllocaInstr
+from llvmlite.ir import Module, Context
 
 from rial.ir.IRBuilder import IRBuilder
 from rial.ir.LLVMBlock import LLVMBlock
+from rial.ir.OverloadResolver import OverloadResolver
 from rial.ir.RIALFunction import RIALFunction
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALVariable import RIALVariable
+from rial.ir.ScopeTable import ScopeTable
+from rial.ir.type_expressions import parse_type_expression, ARRAY_TYPE, FUNCTION_TYPE
 from rial.ir.metadata.FunctionDefinition import FunctionDefinition
 from rial.ir.modifier.AccessModifier import AccessModifier
-from rial.transformer.builtin_type_to_llvm_mapper import Int32, map_type_to_llvm, map_shortcut_to_type, NULL, \
-    map_llvm_to_type
+from rial.profiling import increment_counter
+from rial.transformer.builtin_type_to_llvm_mapper import Int32, map_type_to_llvm, NULL, map_llvm_to_type
+from rial.util.log import log_fail
+
+# Kinds of entries in the definition index, lower kinds shadow higher ones
+DEFINITION_GLOBAL_VARIABLE = 0
+DEFINITION_STRUCT = 1
+DEFINITION_GLOBAL = 2
 
 
 class RIALModule(Module):
     dependencies: Dict[str, str]
     filename: str
-    current_block: Optional[LLVMBlock]
+    scope_table: ScopeTable
     conditional_block: Optional[LLVMBlock]
     end_block: Optional[LLVMBlock]
     current_struct: Optional[RIALIdentifiedStructType]
     current_func: Optional[RIALFunction]
     global_variables: Dict[str, RIALVariable]
+    definitions: Dict[str, Tuple[int, Any]]
+    functions_by_canonical_name: Dict[str, List[RIALFunction]]
     builder: Optional[IRBuilder]
     currently_unsafe: bool
 
@@ -32,20 +42,90 @@ class RIALModule(Module):
         super().__init__(name, context)
         self.dependencies = dict()
         self.filename = ""
-        self.current_block = None
+        self.scope_table = ScopeTable()
+        self._current_block = None
         self.conditional_block = None
         self.end_block = None
         self.current_struct = None
         self.current_func = None
         self.global_variables = dict()
+        self.definitions = dict()
+        self.functions_by_canonical_name = dict()
+        self._reachable_modules = None
         self.builder = None
         self.currently_unsafe = False
 
+    def __repr__(self):
+        # The same text as Module.__repr__, but written into a single buffer,
+        # the functions with their frozen bodies instead of being formatted into a string each
+        buf = ['; ModuleID = "%s"' % (self.name,), "\n", 'target triple = "%s"' % (self.triple,), "\n",
+               'target datalayout = "%s"' % (self.data_layout,), "\n", "", "\n"]
+
+        for ty in self.get_identified_types().values():
+            buf.append(ty.get_declaration())
+            buf.append("\n")
+
+        for value in self.globals.values():
+            if isinstance(value, ir.Function):
+                value.descr(buf)
+            else:
+                buf.append(str(value))
+            buf.append("\n")
+
+        for line in self._get_metadata_lines():
+            buf.append(line)
+            buf.append("\n")
+
+        # Lines are separated, not terminated
+        buf.pop()
+
+        return "".join(buf)
+
+    @property
+    def current_block(self) -> Optional[LLVMBlock]:
+        return self._current_block
+
+    @current_block.setter
+    def current_block(self, block: Optional[LLVMBlock]):
+        self._current_block = block
+        self.scope_table.enter(block)
+
     def get_global_safe(self: Module, name: str) -> Optional[Union[ir.GlobalValue, RIALFunction]]:
-        try:
-            return self.get_global(name)
-        except KeyError:
-            return None
+        return self.globals.get(name)
+
+    def add_global(self, globalvalue: ir.GlobalValue):
+        super().add_global(globalvalue)
+        self.index_definition(globalvalue.name, DEFINITION_GLOBAL, globalvalue)
+
+        if isinstance(globalvalue, RIALFunction):
+            self.functions_by_canonical_name.setdefault(globalvalue.canonical_name, list()).append(globalvalue)
+            OverloadResolver.invalidate(globalvalue.canonical_name, globalvalue.name)
+            OverloadResolver.invalidate(globalvalue.name, globalvalue.name)
+
+    def add_dependency(self, name: str, mod_name: str):
+        self.dependencies[name] = mod_name
+        self._reachable_modules = None
+
+    def index_definition(self, name: str, kind: int, value: Any):
+        """
+        Adds a declaration of this module to the index that get_definition checks after local variables.
+        :param name:
+        :param kind:
+        :param value:
+        :return:
+        """
+        entry = self.definitions.get(name)
+
+        if entry is None or kind <= entry[0]:
+            self.definitions[name] = (kind, value)
+
+            if kind == DEFINITION_STRUCT:
+                OverloadResolver.invalidate(name)
+
+            if self.name.startswith("rial:builtin:"):
+                from rial.compilation_manager import CompilationManager
+                if CompilationManager.prelude is not None:
+                    CompilationManager.prelude.invalidate(name)
 
     def _get_recursive_definition(self, identifier: str, variable: Optional[
         Union[RIALVariable, RIALFunction, ir.Module, RIALIdentifiedStructType, ir.Type]]) -> Optional[
@@ -89,39 +169,22 @@ class RIALModule(Module):
             return None
 
         # Check builtin's first
-        identifier = map_shortcut_to_type(identifier)
-        variable = map_type_to_llvm(identifier)
+        identifier, variable, kind, expression = parse_type_expression(identifier)
 
         if variable is None:
             # Arrays
-            match = re.match(r"^([^\[]+)\[([0-9]+)?\]$", identifier)
-
-            if match is not None:
-                ty = match.group(1)
-                count = match.group(2)
+            if kind == ARRAY_TYPE:
+                ty, count = expression
                 definition = self.get_definition([ty])
                 if definition is not None:
                     if count is not None:
-                        return ir.ArrayType(definition, int(count))
+                        return ir.ArrayType(definition, count)
                     else:
                         return definition.as_pointer()
 
             # Function type
-            match = re.match(r"^([^(]+)\(([^,)]+\s*,?\s*)*\)$", identifier)
-
-            if match is not None:
-                return_type = ""
-                arg_types = list()
-                var_args = False
-                for i, group in enumerate(match.groups()):
-                    if i == 0:
-                        return_type = group.strip()
-                    elif group == "...":
-                        var_args = True
-                    elif group is None:
-                        break
-                    else:
-                        arg_types.append(group.strip())
+            elif kind == FUNCTION_TYPE:
+                return_type, arg_types, var_args = expression
 
                 return ir.FunctionType(self.get_definition([return_type]),
                                        [self.get_definition([arg]) for arg in arg_types],
@@ -129,20 +192,22 @@ class RIALModule(Module):
 
         # Check local variables first
         if variable is None and self.current_block is not None:
-            variable = self.current_block.get_named_value(identifier)
+            variable = self.scope_table.lookup(identifier)
 
-        # Check module-local global variables next
+        # Check module-local global variables, structs and functions next
         if variable is None:
-            variable = identifier in self.global_variables and self.global_variables[identifier] or None
+            entry = self.definitions.get(identifier)
 
-        # Check structs next
-        if variable is None:
-            variable = identifier in self.get_identified_types() and \
-                       self.get_identified_types()[identifier] or None
+            if entry is not None and entry[0] <= DEFINITION_STRUCT:
+                variable = entry[1]
+            else:
+                # Structs are shared between all modules
+                variable = self.get_identified_types().get(identifier)
 
-        # Check functions next
-        if variable is None:
-            variable = self.get_global_safe(identifier)
+                if variable is None and entry is not None:
+                    variable = entry[1]
+
+            increment_counter(entry is not None and "DEFINITION_INDEX_HITS" or "DEFINITION_INDEX_MISSES")
 
         # Check module imports
         if variable is None:
@@ -155,12 +220,16 @@ class RIALModule(Module):
         # Check always imported last
         if variable is None and not self.name.startswith("rial:builtin:"):
             from rial.compilation_manager import CompilationManager
-            for always_imported in CompilationManager.always_imported:
-                mod = CompilationManager.modules[always_imported]
-                variable = mod.get_definition([identifier])
-
-                if variable is not None:
-                    break
+            if CompilationManager.prelude is not None:
+                variable = CompilationManager.prelude.lookup(identifier)
+            else:
+                # Still compiling the builtin modules (or something they import)
+                for always_imported in CompilationManager.always_imported:
+                    mod = CompilationManager.modules[always_imported]
+                    variable = mod.get_definition([identifier])
+
+                    if variable is not None:
+                        break
 
         return variable
 
@@ -180,18 +249,56 @@ class RIALModule(Module):
         return variable
 
     def get_functions_by_canonical_name(self, canonical_name: str) -> List[RIALFunction]:
-        from rial.compilation_manager import CompilationManager
-        funcs = [func for func in self.functions if func.canonical_name == canonical_name]
+        funcs = list()
 
-        for module in self.dependencies.values():
-            try:
-                mod = CompilationManager.modules[module]
-                funcs.extend(mod.get_functions_by_canonical_name(canonical_name))
-            except KeyError:
-                print(module, CompilationManager.modules.keys())
+        for module in self._get_reachable_modules():
+            funcs.extend(module.functions_by_canonical_name.get(canonical_name, ()))
 
         return funcs
 
+    def _get_reachable_modules(self) -> List['RIALModule']:
+        """
+        This module and every module that is reachable through the dependencies, each only once.
+        The list is only kept once all of them are compiled, modules that are still being compiled
+        (e.g. the builtin modules while their own imports compile) are skipped until then.
+        Raises a KeyError for dependencies that were never compiled or failed to compile.
+        :return:
+        """
+        if self._reachable_modules is not None:
+            increment_counter("REACHABLE_MODULES_HITS")
+            return self._reachable_modules
+
+        increment_counter("REACHABLE_MODULES_MISSES")
+        from rial.compilation_manager import CompilationManager
+        modules = [self]
+        visited = {self.name}
+        complete = True
+        pending = list(reversed(list(self.dependencies.values())))
+
+        while len(pending) > 0:
+            mod_name = pending.pop()
+            if mod_name in visited:
+                continue
+            visited.add(mod_name)
+
+            module = CompilationManager.modules.get(mod_name)
+
+            if module is None:
+                if mod_name not in CompilationManager.modules_in_progress:
+                    log_fail(f"Module {mod_name} is a dependency of {self.name} but has not been compiled")
+                    raise KeyError(mod_name)
+
+                complete = False
+                continue
+
+            modules.append(module)
+            pending.extend(reversed(list(module.dependencies.values())))
+
+        if complete:
+            self._reachable_modules = modules
+
+        return modules
+
     def get_llvm_type_from_rial_type(self, rial_type: str):
         assert isinstance(rial_type, str)
 
@@ -229,6 +336,7 @@ class RIALModule(Module):
 
         variable = RIALVariable(name, rial_type, llvm_type, glob, access_modifier)
         self.global_variables[name] = variable
+        self.index_definition(name, DEFINITION_GLOBAL_VARIABLE, variable)
 
         return variable
 
@@ -249,7 +357,7 @@ class RIALModule(Module):
                 if func.definition.rial_args[i].is_variable:
                     variable = func.definition.rial_args[i]
                 else:
-                    variable = self.builder.alloca(func.definition.rial_args[i].llvm_type)
+                    variable = self.builder.alloca_in_entry(func.definition.rial_args[i].llvm_type)
                     self.builder.store(arg, variable)
                     variable = RIALVariable(arg.name, func.definition.rial_args[i].rial_type, arg.type, variable)
 
@@ -298,7 +406,10 @@ class RIALModule(Module):
         if not self.current_block.is_terminated:
             self.builder.ret_void()
 
-        self.finish_current_func()
+        # Unless the function is entered again further up
+        if old_func is not func:
+            func.freeze()
+
         self.current_func = old_func
         self.conditional_block = old_conditional_block
         self.end_block = old_end_block
@@ -333,32 +444,3 @@ class RIALModule(Module):
 
         with self.create_or_enter_function_body(func):
             yield
-
-    def finish_current_func(self):
-        # If we're in release mode
-        # Reorder all possible allocas to the start of the function
-        from rial.compilation_manager import CompilationManager
-        if CompilationManager.config.raw_opts.release:
-            entry: Block = self.current_func.entry_basic_block
-            pos = entry.instructions.index(
-                next((instr for instr in reversed(entry.instructions) if isinstance(instr, AllocaInstr)),
-                     entry.terminator))
-            allocas: List[Tuple[AllocaInstr, Block]] = list()
-
-            for block in self.current_func.blocks:
-                block: Block
-                # Skip first block
-                if block == entry:
-                    continue
-                for instr in block.instructions:
-                    if isinstance(instr, AllocaInstr):
-                        allocas.append((instr, block))
-            for instr_block in allocas:
-                if instr_block is not None:
-                    instr_block[1].instructions.remove(instr_block[0])
-                    entry.instructions.insert(pos, instr_block[0])
-                    pos += 1
-                    # Insert nop if block is empty
-                    if len(instr_block[1].instructions) == 0:
-                        self.builder.position_before(instr_block[1].terminator)
-                        self.builder.gen_no_op()
@@ -0,0 +1,106 @@
+import re
+from typing import Dict, Optional
+
+from llvmlite import ir
+
+_ARRAY_REGEX = re.compile(r"^(.+)\[([0-9]*)\]$")
+_INT_REGEX = re.compile(r"^Int([0-9]+)$")
+_UINT_REGEX = re.compile(r"^UInt([0-9]+)$")
+
+
+class RIALType(str):
+    """
+    A type name like Int32, Char[12] or Foo.
+
+    Every distinct name is interned by get_type, so two types are equal exactly if they are the same object.
+    It's still a str so that it can be used everywhere a type name was used before, e.g. in mangled names.
+    The shortcut mapping, the array element and length and the builtin llvm type are only worked out once per type.
+    """
+    element_type: Optional['RIALType']
+    array_length: Optional[int]
+    is_array: bool
+    llvm_type: Optional[ir.Type]
+
+    @property
+    def is_sized_array(self) -> bool:
+        return self.array_length is not None
+
+    @property
+    def is_builtin(self) -> bool:
+        return self.llvm_type is not None
+
+    def __reduce__(self):
+        # Unpickled types are interned again
+        return get_type, (str(self),)
+
+
+_types: Dict[str, RIALType] = dict()
+
+
+def get_type(name: str) -> RIALType:
+    """
+    Returns the interned type for :name:, shortcuts (int, CString, ...) are mapped to the type they stand for.
+    :param name:
+    :return:
+    """
+    if isinstance(name, RIALType):
+        return name
+
+    ty = _types.get(name)
+
+    if ty is None:
+        ty = _create_type(name)
+        _types[name] = ty
+
+    return ty
+
+
+def _create_type(name: str) -> RIALType:
+    from rial.transformer.builtin_type_to_llvm_mapper import SHORTCUT_TO_TYPE
+
+    if name.endswith("[]"):
+        canonical_name = get_type(name.split('[')[0]) + "[]"
+    else:
+        canonical_name = SHORTCUT_TO_TYPE.get(name, name)
+
+    if canonical_name != name:
+        return get_type(canonical_name)
+
+    ty = RIALType(name)
+    match = _ARRAY_REGEX.match(name)
+
+    if match is not None:
+        length = match.group(2)
+        ty.element_type = get_type(match.group(1))
+        ty.array_length = int(length) if len(length) > 0 else None
+        ty.is_array = True
+    else:
+        ty.element_type = None
+        ty.array_length = None
+        ty.is_array = False
+
+    ty.llvm_type = _map_builtin_type(name)
+
+    return ty
+
+
+def _map_builtin_type(name: str) -> Optional[ir.Type]:
+    from rial.transformer.builtin_type_to_llvm_mapper import TYPE_TO_LLVM
+    from rial.ir.LLVMUIntType import LLVMUIntType
+
+    if name in TYPE_TO_LLVM:
+        return TYPE_TO_LLVM[name]
+
+    # Variable integer
+    match = _INT_REGEX.match(name)
+
+    if match is not None:
+        return ir.IntType(int(match.group(1)))
+
+    # Variable uinteger
+    match = _UINT_REGEX.match(name)
+
+    if match is not None:
+        return LLVMUIntType(int(match.group(1)))
+
+    return None
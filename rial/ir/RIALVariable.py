@@ -3,12 +3,12 @@ from typing import Optional
 from llvmlite import ir
 
 from rial.ir.modifier.AccessModifier import AccessModifier
-from rial.transformer.builtin_type_to_llvm_mapper import map_shortcut_to_type
+from rial.ir.RIALType import RIALType, get_type
 
 
 class RIALVariable:
     identified_variable: bool
-    rial_type: str
+    rial_type: RIALType
     llvm_type: ir.Type
     value: ir.Value
     name: str
@@ -23,7 +23,7 @@ class RIALVariable:
         assert isinstance(access_modifier, AccessModifier)
 
         self.name = name
-        self.rial_type = map_shortcut_to_type(rial_type)
+        self.rial_type = get_type(rial_type)
         self.llvm_type = llvm_type
         self.value = value
         self.access_modifier = access_modifier
@@ -54,8 +54,8 @@ class RIALVariable:
         return self.is_variable and module.builder.load(self.value) or self.value
 
     @property
-    def array_element_type(self):
-        return self.rial_type.split('[')[0]
+    def array_element_type(self) -> RIALType:
+        return self.rial_type.is_array and self.rial_type.element_type or self.rial_type
 
     def __str__(self):
         return f"{self.name}: {self.rial_type}/{self.llvm_type}: {self.value} [{self.access_modifier}]"
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Tuple
+
+from rial.ir.RIALVariable import RIALVariable
+
+
+class ScopeTable:
+    """
+    Local variables that are visible in the current block.
+
+    A block sees its own named values and the ones of every block reachable through its sibling and parent links,
+    the closest declaration shadows the others.
+    The table holds one frame for each block of that chain and a stack of bindings for each name, ordered by frame,
+    so that looking up a variable does not have to walk the blocks.
+    Entering a block only pops the frames that are not part of its chain and pushes the ones that are new.
+    """
+    frames: List
+    frame_indices: Dict[int, int]
+    bindings: Dict[str, List[Tuple[int, RIALVariable]]]
+
+    def __init__(self):
+        self.frames = list()
+        self.frame_indices = dict()
+        self.bindings = dict()
+
+    def enter(self, block):
+        path = list()
+        current = block
+        while current is not None and id(current) not in self.frame_indices:
+            path.append(current)
+            current = current.llvmblock_sibling if current.llvmblock_sibling is not None else current.llvmblock_parent
+
+        keep = 0 if current is None else self.frame_indices[id(current)] + 1
+
+        while len(self.frames) > keep:
+            self._pop_frame()
+
+        for frame in reversed(path):
+            self._push_frame(frame)
+
+    def lookup(self, name: str) -> Optional[RIALVariable]:
+        stack = self.bindings.get(name)
+
+        if stack is None:
+            return None
+
+        return stack[-1][1]
+
+    def declare(self, block, name: str, value: RIALVariable):
+        """
+        Called when a named value is added to a block that is part of the current chain.
+        """
+        depth = self.frame_indices[id(block)]
+        stack = self.bindings.setdefault(name, list())
+        index = self._find(stack, depth)
+
+        if index < len(stack) and stack[index][0] == depth:
+            stack[index] = (depth, value)
+        else:
+            stack.insert(index, (depth, value))
+
+    @staticmethod
+    def _find(stack: List[Tuple[int, RIALVariable]], depth: int) -> int:
+        # Declarations nearly always go into the innermost block
+        index = len(stack)
+        while index > 0 and stack[index - 1][0] >= depth:
+            index -= 1
+        return index
+
+    def _push_frame(self, block):
+        depth = len(self.frames)
+        self.frames.append(block)
+        self.frame_indices[id(block)] = depth
+        block.scope_table = self
+
+        for name, value in block.named_values.items():
+            self.bindings.setdefault(name, list()).append((depth, value))
+
+    def _pop_frame(self):
+        block = self.frames.pop()
+        del self.frame_indices[id(block)]
+        block.scope_table = None
+
+        for name in block.named_values:
+            stack = self.bindings[name]
+            stack.pop()
+            if len(stack) == 0:
+                del self.bindings[name]
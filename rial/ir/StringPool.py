@@ -0,0 +1,80 @@
+from typing import Dict, Tuple
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.RIALVariable import RIALVariable
+from rial.ir.modifier.AccessModifier import AccessModifier
+from rial.profiling import increment_counter
+from rial.util.util import decode_escapes, good_hash
+
+
+class StringPool:
+    """
+    The string literals of the whole build.
+
+    Every distinct literal is decoded and named once per build.
+    Modules that use it get a linkonce_odr unnamed_addr constant with the same name,
+    so the linker (and the JIT) keeps a single copy instead of one private copy per module.
+    The pool size and the bytes of the copies that are folded together are reported as counters.
+    """
+    # Literal as written in the source -> (global name, initializer)
+    literals: Dict[str, Tuple[str, ir.Constant]] = dict()
+
+    # Global name -> module that emitted it first
+    emitted_by: Dict[str, str] = dict()
+
+    def __init__(self):
+        raise PermissionError()
+
+    @staticmethod
+    def invalidate():
+        StringPool.literals.clear()
+        StringPool.emitted_by.clear()
+
+    @staticmethod
+    def get_literal(value: str) -> Tuple[str, ir.Constant]:
+        """
+        Returns the global name and initializer (null terminated UTF-8) for the literal :value: (without quotes).
+        :param value:
+        :return:
+        """
+        literal = StringPool.literals.get(value)
+
+        if literal is not None:
+            increment_counter("STRING_POOL_HITS")
+            return literal
+
+        increment_counter("STRING_POOL_MISSES")
+        increment_counter("STRING_POOL_SIZE")
+        arr = bytearray(f"{decode_escapes(value)}\00".encode("utf-8"))
+        literal = (".const.string.%s" % good_hash(value), ir.Constant(ir.ArrayType(LLVMUIntType(8), len(arr)), arr))
+        StringPool.literals[value] = literal
+
+        return literal
+
+    @staticmethod
+    def declare_in(module, value: str) -> RIALVariable:
+        """
+        Returns the constant for the literal :value: in :module:, declaring it there if it's the first use.
+        :param module:
+        :param value:
+        :return:
+        """
+        name, initializer = StringPool.get_literal(value)
+        existing = module.global_variables.get(name)
+
+        if existing is not None:
+            return existing
+
+        length = initializer.type.count
+        glob = module.declare_global(name, f"Char[{length}]", initializer.type, "linkonce_odr", initializer,
+                                     AccessModifier.PRIVATE, True)
+        glob.value.unnamed_addr = True
+
+        first = StringPool.emitted_by.setdefault(name, module.name)
+
+        if first != module.name:
+            increment_counter("STRING_POOL_BYTES_SAVED", length)
+
+        return glob
@@ -0,0 +1,249 @@
+import math
+import operator
+import struct
+from typing import Callable, Dict, Optional
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+
+# Python comparisons for the comparison operators of the language (the same ones the IRBuilder accepts)
+_COMPARISONS: Dict[str, Callable] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def _unsigned(ty: ir.IntType, value: int) -> int:
+    return value & ((1 << ty.width) - 1)
+
+
+def _signed(ty: ir.IntType, value: int) -> int:
+    value = _unsigned(ty, value)
+
+    if ty.width > 0 and value >= 1 << (ty.width - 1):
+        value -= 1 << ty.width
+
+    return value
+
+
+def _wrap(ty: ir.IntType, value: int) -> int:
+    """
+    Wraps :value: around to the width of :ty: the same as LLVM does for instructions without nsw/nuw.
+    Unsigned types and Int1 are kept in [0, 2^width), signed types in [-2^(width-1), 2^(width-1)).
+    """
+    if isinstance(ty, LLVMUIntType) or ty.width == 1:
+        return _unsigned(ty, value)
+
+    return _signed(ty, value)
+
+
+def _round_float(ty: ir.Type, value: float) -> Optional[float]:
+    """
+    Rounds :value: to the precision of :ty:, returns None if it doesn't fit (LLVM would produce inf there,
+    which is left to LLVM).
+    """
+    try:
+        if isinstance(ty, ir.FloatType):
+            return struct.unpack('<f', struct.pack('<f', value))[0]
+        if isinstance(ty, ir.HalfType):
+            return struct.unpack('<e', struct.pack('<e', value))[0]
+    except OverflowError:
+        return None
+
+    return value
+
+
+def _is_int_constant(value: ir.Value) -> bool:
+    return isinstance(value, ir.Constant) and isinstance(value.type, ir.IntType) and isinstance(value.constant, int)
+
+
+def _is_float_constant(value: ir.Value) -> bool:
+    return isinstance(value, ir.Constant) and isinstance(value.type, ir.types._BaseFloatType) and isinstance(
+        value.constant, (int, float))
+
+
+def fold_math(op: str, ty: ir.Type, left: ir.Value, right: ir.Value) -> Optional[ir.Constant]:
+    """
+    Folds the arithmetic operation :op: (PLUS, MINUS, ...) on two constants of type :ty:.
+    Integers wrap around like -fwrapv, unsigned types use udiv/urem semantics.
+    Returns None for anything that isn't folded, e.g. non constant operands or a division by zero,
+    so that the instruction is emitted as usual.
+    :param op:
+    :param ty:
+    :param left:
+    :param right:
+    :return:
+    """
+    if isinstance(ty, ir.IntType):
+        if not _is_int_constant(left) or not _is_int_constant(right):
+            return None
+
+        if isinstance(ty, LLVMUIntType):
+            lhs = _unsigned(ty, left.constant)
+            rhs = _unsigned(ty, right.constant)
+        else:
+            lhs = _signed(ty, left.constant)
+            rhs = _signed(ty, right.constant)
+
+        if op == "PLUS":
+            result = lhs + rhs
+        elif op == "MINUS":
+            result = lhs - rhs
+        elif op == "MUL":
+            result = lhs * rhs
+        elif op == "DIV" or op == "REM":
+            # Division by zero and the overflowing INT_MIN / -1 are undefined, they are left to LLVM
+            if rhs == 0 or (not isinstance(ty, LLVMUIntType) and rhs == -1 and lhs == _signed(ty, 1 << (ty.width - 1))):
+                return None
+
+            # sdiv truncates towards zero and srem takes the sign of the dividend, unlike // and %
+            quotient = abs(lhs) // abs(rhs)
+            if (lhs < 0) != (rhs < 0):
+                quotient = -quotient
+
+            result = quotient if op == "DIV" else lhs - quotient * rhs
+        else:
+            return None
+
+        return ir.Constant(ty, _wrap(ty, result))
+    elif isinstance(ty, ir.types._BaseFloatType):
+        if not _is_float_constant(left) or not _is_float_constant(right):
+            return None
+
+        # Float and half literals are stored as doubles
+        lhs = _round_float(ty, float(left.constant))
+        rhs = _round_float(ty, float(right.constant))
+
+        if lhs is None or rhs is None:
+            return None
+
+        if op == "PLUS":
+            result = lhs + rhs
+        elif op == "MINUS":
+            result = lhs - rhs
+        elif op == "MUL":
+            result = lhs * rhs
+        elif op == "DIV" or op == "REM":
+            # Produces inf or NaN, which Python raises for instead
+            if rhs == 0.0 or math.isinf(lhs) or math.isnan(lhs) or math.isnan(rhs):
+                return None
+
+            result = lhs / rhs if op == "DIV" else math.fmod(lhs, rhs)
+        else:
+            return None
+
+        result = _round_float(ty, result)
+
+        if result is None:
+            return None
+
+        return ir.Constant(ty, result)
+
+    return None
+
+
+def fold_comparison(comparison: str, ty: ir.Type, left: ir.Value, right: ir.Value) -> Optional[ir.Constant]:
+    """
+    Folds the comparison of two constants of type :ty: into an Int1 constant.
+    Unsigned types are compared like icmp_unsigned, signed ones like icmp_signed and floats like fcmp_ordered.
+    :param comparison:
+    :param ty:
+    :param left:
+    :param right:
+    :return:
+    """
+    compare = _COMPARISONS.get(comparison)
+
+    if compare is None:
+        return None
+
+    if isinstance(ty, ir.IntType):
+        if not _is_int_constant(left) or not _is_int_constant(right):
+            return None
+
+        if isinstance(ty, LLVMUIntType):
+            result = compare(_unsigned(ty, left.constant), _unsigned(ty, right.constant))
+        else:
+            result = compare(_signed(ty, left.constant), _signed(ty, right.constant))
+    elif isinstance(ty, ir.types._BaseFloatType):
+        if not _is_float_constant(left) or not _is_float_constant(right):
+            return None
+
+        lhs = _round_float(ty, float(left.constant))
+        rhs = _round_float(ty, float(right.constant))
+
+        if lhs is None or rhs is None:
+            return None
+
+        # Ordered comparisons are false if either side is NaN, including !=
+        result = not math.isnan(lhs) and not math.isnan(rhs) and compare(lhs, rhs)
+    else:
+        return None
+
+    return ir.Constant(ir.IntType(1), bool(result))
+
+
+def fold_cast(cast_function: str, value: ir.Value, ty: ir.Type) -> Optional[ir.Constant]:
+    """
+    Folds the cast of a constant to :ty:, :cast_function: is the IRBuilder function that would be used
+    (as returned by get_casting_function).
+    Casts of floats that don't fit into the target type are undefined and left to LLVM.
+    :param cast_function:
+    :param value:
+    :param ty:
+    :return:
+    """
+    if cast_function in ('trunc', 'zext', 'sext', 'sitofp', 'uitofp'):
+        if not _is_int_constant(value):
+            return None
+
+        # zext and uitofp read the source as unsigned, sext and sitofp as signed, trunc keeps the low bits either way
+        if cast_function in ('zext', 'uitofp'):
+            source = _unsigned(value.type, value.constant)
+        else:
+            source = _signed(value.type, value.constant)
+
+        if cast_function in ('trunc', 'zext', 'sext'):
+            return ir.Constant(ty, _wrap(ty, source)) if isinstance(ty, ir.IntType) else None
+
+        if not isinstance(ty, ir.types._BaseFloatType):
+            return None
+
+        try:
+            result = _round_float(ty, float(source))
+        except OverflowError:
+            return None
+
+        return ir.Constant(ty, result) if result is not None else None
+    elif cast_function in ('fptosi', 'fptoui'):
+        if not _is_float_constant(value) or not isinstance(ty, ir.IntType):
+            return None
+
+        source = _round_float(value.type, float(value.constant))
+
+        if source is None or math.isnan(source) or math.isinf(source):
+            return None
+
+        result = int(source)
+
+        if cast_function == 'fptoui':
+            in_range = 0 <= result < 1 << ty.width
+        else:
+            in_range = -(1 << (ty.width - 1)) <= result < 1 << (ty.width - 1)
+
+        return ir.Constant(ty, _wrap(ty, result)) if in_range else None
+    elif cast_function in ('fpext', 'fptrunc'):
+        if not _is_float_constant(value) or not isinstance(ty, ir.types._BaseFloatType):
+            return None
+
+        source = _round_float(value.type, float(value.constant))
+        result = _round_float(ty, source) if source is not None else None
+
+        return ir.Constant(ty, result) if result is not None else None
+
+    return None
@@ -1,7 +1,7 @@
 from typing import List
 
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
-from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALModule import RIALModule, DEFINITION_STRUCT
 from rial.ir.RIALVariable import RIALVariable
 from rial.ir.metadata.StructDefinition import StructDefinition
 from rial.ir.modifier.AccessModifier import AccessModifier
@@ -19,6 +19,7 @@ def create_identified_struct_type(module: RIALModule, name: str, access_modifier
     struct = module.context.get_identified_type(name)
     rial_struct = RIALIdentifiedStructType(struct.context, name, struct.packed)
     module.context.identified_types[name] = rial_struct
+    module.index_definition(name, DEFINITION_STRUCT, rial_struct)
     struct = rial_struct
     struct_def = StructDefinition(access_modifier)
 
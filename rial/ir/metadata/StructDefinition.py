@@ -1,4 +1,4 @@
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 
 from rial.ir.RIALVariable import RIALVariable
 from rial.ir.modifier.AccessModifier import AccessModifier
@@ -9,12 +9,20 @@ class StructDefinition:
     properties: Dict[str, Tuple[int, RIALVariable]]
     base_structs: List[str]
 
+    # ABI layout, recorded once the struct has been declared
+    size: Optional[int]
+    alignment: Optional[int]
+    offsets: Dict[str, int]
+
     def __init__(self, access_modifier: AccessModifier = None,
                  properties: Dict[str, Tuple[int, RIALVariable]] = None,
                  base_structs: List[str] = None):
         self.access_modifier = access_modifier
         self.properties = properties
         self.base_structs = base_structs
+        self.size = None
+        self.alignment = None
+        self.offsets = dict()
 
         if self.properties is None:
             self.properties = dict()
@@ -0,0 +1,304 @@
+import marshal
+from typing import Any, List, Optional, Set
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
+from rial.ir.RIALModule import RIALModule, DEFINITION_STRUCT
+from rial.ir.RIALType import get_type
+from rial.ir.RIALVariable import RIALVariable
+from rial.ir.metadata.FunctionDefinition import FunctionDefinition
+from rial.ir.metadata.StructDefinition import StructDefinition
+from rial.ir.modifier.AccessModifier import AccessModifier
+
+# Bump whenever the layout below changes, old summaries are then rejected on load.
+INTERFACE_VERSION = 1
+
+# Version 2 doesn't share references, so the same interface always gives the same bytes (and hash)
+_MARSHAL_VERSION = 2
+
+_INT = 0
+_UINT = 1
+_HALF = 2
+_FLOAT = 3
+_DOUBLE = 4
+_VOID = 5
+_POINTER = 6
+_ARRAY = 7
+_FUNCTION = 8
+_LITERAL_STRUCT = 9
+_STRUCT = 10
+
+_FUNCTION_DECL = 0
+_GLOBAL_VARIABLE = 1
+
+# The struct of a function definition
+_NO_STRUCT = 0
+_STRUCT_TYPE = 1
+_STRUCT_NAME = 2
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _encode_type(ty: ir.Type) -> Any:
+    # Checked before IntType, which it derives from
+    if isinstance(ty, LLVMUIntType):
+        return _UINT, ty.width
+    if isinstance(ty, ir.IntType):
+        return _INT, ty.width
+    if isinstance(ty, ir.HalfType):
+        return _HALF,
+    if isinstance(ty, ir.FloatType):
+        return _FLOAT,
+    if isinstance(ty, ir.DoubleType):
+        return _DOUBLE,
+    if isinstance(ty, ir.VoidType):
+        return _VOID,
+    if isinstance(ty, ir.PointerType):
+        return _POINTER, _encode_type(ty.pointee), ty.addrspace
+    if isinstance(ty, ir.ArrayType):
+        return _ARRAY, _encode_type(ty.element), ty.count
+    if isinstance(ty, ir.FunctionType):
+        return _FUNCTION, _encode_type(ty.return_type), [_encode_type(arg) for arg in ty.args], ty.var_arg
+    if isinstance(ty, RIALIdentifiedStructType):
+        return _STRUCT, ty.name
+    if isinstance(ty, ir.LiteralStructType):
+        return _LITERAL_STRUCT, [_encode_type(element) for element in ty.elements], ty.packed
+
+    raise _Unsupported(ty)
+
+
+def _decode_type(context: ir.Context, encoded: Any) -> ir.Type:
+    kind = encoded[0]
+
+    if kind == _INT:
+        return ir.IntType(encoded[1])
+    if kind == _UINT:
+        return LLVMUIntType(encoded[1])
+    if kind == _HALF:
+        return ir.HalfType()
+    if kind == _FLOAT:
+        return ir.FloatType()
+    if kind == _DOUBLE:
+        return ir.DoubleType()
+    if kind == _VOID:
+        return ir.VoidType()
+    if kind == _POINTER:
+        return ir.PointerType(_decode_type(context, encoded[1]), encoded[2])
+    if kind == _ARRAY:
+        return ir.ArrayType(_decode_type(context, encoded[1]), encoded[2])
+    if kind == _FUNCTION:
+        return ir.FunctionType(_decode_type(context, encoded[1]), [_decode_type(context, arg) for arg in encoded[2]],
+                               encoded[3])
+    if kind == _STRUCT:
+        return context.identified_types[encoded[1]]
+
+    return ir.LiteralStructType([_decode_type(context, element) for element in encoded[1]], encoded[2])
+
+
+def _collect_struct_names(encoded: Any, names: Set[str]):
+    if encoded[0] == _STRUCT:
+        names.add(encoded[1])
+    elif encoded[0] == _POINTER or encoded[0] == _ARRAY:
+        _collect_struct_names(encoded[1], names)
+    elif encoded[0] == _FUNCTION:
+        _collect_struct_names(encoded[1], names)
+        for arg in encoded[2]:
+            _collect_struct_names(arg, names)
+    elif encoded[0] == _LITERAL_STRUCT:
+        for element in encoded[1]:
+            _collect_struct_names(element, names)
+
+
+def _encode_constant(constant: ir.Constant) -> Any:
+    value = constant.constant
+
+    if isinstance(value, list):
+        value = [_encode_constant(element) for element in value]
+    elif isinstance(value, bytearray):
+        value = bytes(value)
+    elif value is not None and not isinstance(value, (bool, int, float)):
+        raise _Unsupported(constant)
+
+    return _encode_type(constant.type), value
+
+
+def _decode_constant(context: ir.Context, encoded: Any) -> ir.Constant:
+    ty = _decode_type(context, encoded[0])
+    value = encoded[1]
+
+    if isinstance(value, list):
+        value = [_decode_constant(context, element) for element in value]
+    elif isinstance(value, bytes):
+        value = bytearray(value)
+
+    return ir.Constant(ty, value)
+
+
+def _encode_variable(variable: RIALVariable) -> Any:
+    return variable.name, str(variable.rial_type), _encode_type(variable.llvm_type), variable.access_modifier.value
+
+
+def _decode_variable(context: ir.Context, encoded: Any) -> RIALVariable:
+    name, rial_type, llvm_type, access_modifier = encoded
+    return RIALVariable(name, rial_type, _decode_type(context, llvm_type), None, AccessModifier(access_modifier))
+
+
+def dump_interface(module: RIALModule) -> Optional[bytes]:
+    """
+    Summarizes everything that dependents of :module: can refer to: its dependencies, the structs it declares
+    and the signatures of its functions and global variables, but none of the function bodies.
+    Returns None if the module declares something the summary can't represent, it then can't be loaded from one.
+    :param module:
+    :return:
+    """
+    try:
+        structs = list()
+
+        for struct in module.context.identified_types.values():
+            if not isinstance(struct, RIALIdentifiedStructType) or struct.module_name != module.name:
+                continue
+
+            definition = struct.definition
+            properties = list()
+
+            # Default values of properties are parse trees, which are only used while declaring the struct
+            for name, (index, prop) in definition.properties.items():
+                properties.append((name, index, _encode_variable(prop)))
+
+            structs.append((struct.name, struct.packed, [_encode_type(element) for element in struct.elements],
+                            definition.access_modifier.value, list(definition.base_structs), properties))
+
+        values = list()
+
+        for value in module.globals.values():
+            if isinstance(value, RIALFunction):
+                definition = value.definition
+
+                if isinstance(definition.struct, RIALIdentifiedStructType):
+                    struct = _STRUCT_TYPE, definition.struct.name
+                elif definition.struct == "":
+                    struct = _NO_STRUCT, ""
+                else:
+                    struct = _STRUCT_NAME, str(definition.struct)
+
+                values.append((_FUNCTION_DECL, value.name, value.canonical_name, _encode_type(value.function_type),
+                               value.linkage, value.calling_convention, sorted(value.attributes),
+                               str(definition.rial_return_type), definition.access_modifier.value,
+                               [_encode_variable(arg) for arg in definition.rial_args], struct, definition.unsafe))
+            elif value.name.startswith(".") or value.name.startswith("llvm."):
+                # String literals and intrinsics can't be named in the source
+                continue
+            elif isinstance(value, ir.GlobalVariable) and value.name in module.global_variables:
+                variable = module.global_variables[value.name]
+                initializer = None
+
+                # Dependents copy the value of constants
+                if value.global_constant and value.initializer is not None:
+                    initializer = _encode_constant(value.initializer)
+
+                values.append((_GLOBAL_VARIABLE, value.name, str(variable.rial_type),
+                               _encode_type(variable.llvm_type), value.linkage, variable.access_modifier.value,
+                               value.global_constant, initializer))
+            else:
+                raise _Unsupported(value)
+    except _Unsupported:
+        return None
+
+    return marshal.dumps((INTERFACE_VERSION, sorted(module.dependencies.items()), structs, values), _MARSHAL_VERSION)
+
+
+def load_interface(module: RIALModule, data: bytes) -> Optional[List[RIALIdentifiedStructType]]:
+    """
+    Declares everything in the summary :data: (see dump_interface) in the empty :module:,
+    so that dependents can use it as if it had been compiled.
+    Returns the declared structs or None if the summary can't be loaded into this build,
+    e.g. because it refers to a struct that isn't declared.
+    :param module:
+    :param data:
+    :return:
+    """
+    version, dependencies, structs, values = marshal.loads(data)
+
+    if version != INTERFACE_VERSION:
+        return None
+
+    context = module.context
+    own_structs = {struct[0] for struct in structs}
+    referenced: Set[str] = set()
+
+    for name, packed, elements, access_modifier, base_structs, properties in structs:
+        for element in elements:
+            _collect_struct_names(element, referenced)
+        referenced.update(base_structs)
+
+    for value in values:
+        _collect_struct_names(value[3], referenced)
+        if value[0] == _FUNCTION_DECL and value[10][0] == _STRUCT_TYPE:
+            referenced.add(value[10][1])
+
+    if any(name in context.identified_types for name in own_structs):
+        return None
+
+    if any(name not in own_structs and not isinstance(context.identified_types.get(name), RIALIdentifiedStructType)
+           for name in referenced):
+        return None
+
+    for name, mod_name in dependencies:
+        module.add_dependency(name, mod_name)
+
+    declared = list()
+
+    # Structs can refer to each other, so all of them exist before any body is set
+    for name, packed, elements, access_modifier, base_structs, properties in structs:
+        struct = RIALIdentifiedStructType(context, name, packed)
+        context.identified_types[name] = struct
+        struct.module_name = module.name
+        module.index_definition(name, DEFINITION_STRUCT, struct)
+        declared.append(struct)
+
+    for struct, (name, packed, elements, access_modifier, base_structs, properties) in zip(declared, structs):
+        struct.set_body(*[_decode_type(context, element) for element in elements])
+        struct.definition = StructDefinition(AccessModifier(access_modifier), {
+            prop_name: (index, _decode_variable(context, prop)) for prop_name, index, prop in properties
+        }, list(base_structs))
+
+    for value in values:
+        if value[0] == _FUNCTION_DECL:
+            _, name, canonical_name, function_type, linkage, calling_convention, attributes, rial_return_type, \
+                access_modifier, rial_args, struct, unsafe = value
+            args = [_decode_variable(context, arg) for arg in rial_args]
+
+            if struct[0] == _STRUCT_TYPE:
+                struct = context.identified_types[struct[1]]
+            elif struct[0] == _STRUCT_NAME:
+                struct = get_type(struct[1])
+            else:
+                struct = ""
+
+            func = module.declare_function(name, canonical_name, _decode_type(context, function_type), linkage,
+                                           calling_convention,
+                                           FunctionDefinition(rial_return_type, AccessModifier(access_modifier),
+                                                              args, struct, unsafe))
+
+            for attribute in attributes:
+                func.attributes.add(attribute)
+
+            # Variadic arguments have no LLVM argument
+            for arg, rial_arg in zip(func.args, args):
+                arg.name = rial_arg.name
+                rial_arg.value = arg
+        else:
+            _, name, rial_type, llvm_type, linkage, access_modifier, constant, initializer = value
+
+            if initializer is not None:
+                initializer = _decode_constant(context, initializer)
+
+            module.declare_global(name, rial_type, _decode_type(context, llvm_type), linkage, initializer,
+                                  AccessModifier(access_modifier), constant)
+
+    return declared
@@ -0,0 +1,70 @@
+import re
+from typing import Dict, Optional, Tuple, Any
+
+from llvmlite.ir import Type
+
+from rial.ir.RIALType import get_type
+from rial.profiling import increment_counter
+
+ARRAY_TYPE = 0
+FUNCTION_TYPE = 1
+
+_FUNCTION_REGEX = re.compile(r"^([^(]+)\(([^,)]+\s*,?\s*)*\)$")
+
+# Identifier -> (mapped identifier, builtin type, kind of type expression, parsed type expression)
+TypeExpression = Tuple[str, Optional[Type], Optional[int], Any]
+
+_type_expressions: Dict[str, TypeExpression] = dict()
+
+
+def _parse_function_type(match) -> Tuple[str, Tuple[str, ...], bool]:
+    return_type = ""
+    arg_types = list()
+    var_args = False
+    for i, group in enumerate(match.groups()):
+        if i == 0:
+            return_type = group.strip()
+        elif group == "...":
+            var_args = True
+        elif group is None:
+            break
+        else:
+            arg_types.append(group.strip())
+
+    return return_type, tuple(arg_types), var_args
+
+
+def parse_type_expression(identifier: str) -> TypeExpression:
+    """
+    Maps shortcuts and builtin types and parses array (Foo[12], Foo[]) and function type (Int32(Int32)) syntax.
+    Every identifier that is looked up goes through here, so the result is memoized per distinct string.
+    :param identifier:
+    :return:
+    """
+    parsed = _type_expressions.get(identifier)
+
+    if parsed is not None:
+        increment_counter("TYPE_EXPRESSION_HITS")
+        return parsed
+
+    increment_counter("TYPE_EXPRESSION_MISSES")
+    mapped = get_type(identifier)
+    builtin = mapped.llvm_type
+    kind = None
+    expression = None
+
+    if builtin is None:
+        if mapped.is_array:
+            kind = ARRAY_TYPE
+            expression = (mapped.element_type, mapped.array_length)
+        else:
+            match = _FUNCTION_REGEX.match(mapped)
+
+            if match is not None:
+                kind = FUNCTION_TYPE
+                expression = _parse_function_type(match)
+
+    parsed = (mapped, builtin, kind, expression)
+    _type_expressions[identifier] = parsed
+
+    return parsed
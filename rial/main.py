@@ -3,6 +3,7 @@ import json
 import multiprocessing
 import os
 import shutil
+import sys
 from pathlib import Path
 from timeit import default_timer as timer
 
@@ -10,9 +11,10 @@ import anyconfig
 from colorama import init
 from munch import munchify
 
+from rial.ArtifactStore import ArtifactStore, DEFAULT_MAX_SIZE
 from rial.compilation_manager import CompilationManager
 from rial.configuration import Configuration
-from rial.profiling import set_profiling, execution_events, display_top
+from rial.profiling import set_profiling, execution_events, display_top, counters, get_hit_rates
 from rial.util.util import pythonify, monkey_patch, rreplace
 
 DEFAULT_OPTIONS = {
@@ -21,10 +23,15 @@ DEFAULT_OPTIONS = {
         'print_asm': False,
         'print_ir': False,
         'disable_cache': False,
+        'cache_max_size': DEFAULT_MAX_SIZE,
         'disable_opt': False,
+        'fold_constants': False,
+        'run': False,
+        'whole_program': False,
         'use_object_files': True,
         'opt_level': '1',
         'print_link_command': False,
+        'print_struct_layouts': False,
         'release': False,
         'profile': False,
         'profile_mem': False,
@@ -32,6 +39,7 @@ DEFAULT_OPTIONS = {
         'strip': False,
         'file': None,
         'compile_units': multiprocessing.cpu_count(),
+        'lexer': 'contextual',
     },
     'release': {
         'opt_level': '3',
@@ -67,15 +75,11 @@ def main(options):
 
     cache_path.mkdir(parents=False, exist_ok=True)
 
-    if output_path.exists():
-        shutil.rmtree(output_path)
-
-    output_path.mkdir(parents=False, exist_ok=False)
-
-    if bin_path.exists():
-        shutil.rmtree(bin_path)
-
-    bin_path.mkdir(parents=False, exist_ok=False)
+    # The outputs of the last build are kept, unchanged modules restore theirs from the cache.
+    # Running in-process neither writes objects nor links.
+    if not options.run:
+        output_path.mkdir(parents=False, exist_ok=True)
+        bin_path.mkdir(parents=False, exist_ok=True)
 
     if not source_path.exists():
         raise FileNotFoundError(str(source_path))
@@ -96,6 +100,14 @@ def main(options):
         print(f"TOTAL : {(end - start).__round__(3)}s")
         print("")
 
+        if len(counters) > 0:
+            print("----- COUNTERS -----")
+            for name, value in counters.items():
+                print(f"{name} : {value}")
+            for name, value in get_hit_rates().items():
+                print(f"{name} : {(value * 100).__round__(1)}%")
+            print("")
+
     if options.profile_mem:
         import tracemalloc
         end_snapshot = tracemalloc.take_snapshot()
@@ -113,13 +125,28 @@ def parse_prelim_arguments():
                         choices=("0", "1", "2", "3", "s", "z"), default=None)
     parser.add_argument('--print-link-command', action='store_true',
                         help="Prints the command used for linking the object files", default=None)
+    parser.add_argument('--print-struct-layouts', action='store_true',
+                        help="Prints the size, alignment and field offsets of every struct", default=None)
     parser.add_argument('--release', action='store_true', help="Release mode", default=None)
     parser.add_argument('--use-object-files', action='store_true',
                         help="Use object files rather than LLVM bitcode files for linking", default=None)
     parser.add_argument('--disable-cache', action='store_true',
                         help="Disable cache", default=None)
+    parser.add_argument('--cache-max-size', type=int, default=None,
+                        help="Size cap of the artifact cache in MiB, least recently used entries are evicted above it")
     parser.add_argument('--disable-opt', action='store_true',
                         help="Completely disables any kind of optimization", default=None)
+    parser.add_argument('--fold-constants', action='store_true',
+                        help="Folds operations and casts on constants while generating the IR", default=None)
+    parser.add_argument('--run', action='store_true', default=None,
+                        help="Runs main in-process with the JIT instead of building an executable")
+    parser.add_argument('--whole-program', action='store_true', default=None,
+                        help="Links all modules into one before optimizing, which is written as a single object")
+    parser.add_argument('--lexer', type=str, help="Lexer used by the parser",
+                        choices=("contextual", "fast"), default=None)
+    parser.add_argument('--compile-units', type=int,
+                        help="Number of worker processes used for compiling, 1 disables parallel compilation",
+                        default=None)
     parser.add_argument('--profile', help="Profiles the compiler", action="store_true", default=None)
     parser.add_argument('--profile-gil', help="Profiles the GIL", action="store_true", default=None)
     parser.add_argument('--print-options', help="Prints the passed options", action="store_true", default=False)
@@ -139,7 +166,76 @@ def parse_config_file_arguments(workdir: str):
     ], ac_ignore_missing=True)
 
 
+def format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return "%.1f MiB" % (size / 1024 / 1024)
+
+    return "%.1f KiB" % (size / 1024)
+
+
+def cache_command(args):
+    """
+    Manages the artifact cache of a project: rial cache stats|gc|clear
+    :param args:
+    :return:
+    """
+    parser = argparse.ArgumentParser(prog="rial cache")
+    parser.add_argument('command', choices=("stats", "gc", "clear"),
+                        help="stats: shows the entries, gc: evicts entries above the size cap, clear: removes everything")
+    parser.add_argument('-w', '--workdir', help="Overwrite working directory", type=str, default="")
+    parser.add_argument('--cache-max-size', type=int, default=None, help="Size cap in MiB used by gc")
+    options = parser.parse_args(args)
+
+    workdir = os.path.abspath(options.workdir) if options.workdir != "" else os.getcwd()
+    max_size = options.cache_max_size
+
+    if max_size is None:
+        max_size = parse_config_file_arguments(workdir).get('config', dict()).get('cache_max_size', DEFAULT_MAX_SIZE)
+
+    cache_path = Path(workdir).joinpath("cache")
+
+    if not cache_path.exists():
+        print(f"No cache in {workdir}")
+        return
+
+    ArtifactStore.init(cache_path, False, max_size)
+
+    try:
+        if options.command == "stats":
+            stats = ArtifactStore.stats()
+            count = sum(count for count, _ in stats.values())
+            size = sum(size for _, size in stats.values())
+            print(f"{count} entries, {format_size(size)} of {format_size(ArtifactStore.max_size)}")
+            for kind, (count, size) in stats.items():
+                print(f"    {kind}: {count} entries, {format_size(size)}")
+
+            trees = list(cache_path.joinpath("parse").glob("*.tree"))
+            print(f"{len(trees)} parse trees, {format_size(sum(tree.stat().st_size for tree in trees))}")
+        elif options.command == "gc":
+            count, size = ArtifactStore.gc()
+            print(f"Evicted {count} entries, {format_size(size)}")
+        else:
+            count, size = ArtifactStore.clear()
+
+            # Parse trees, assembly files and the module pickles of older compilers
+            for path in cache_path.iterdir():
+                if path.name.startswith(ArtifactStore.store_path.name):
+                    continue
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+
+            print(f"Removed {count} entries, {format_size(size)}")
+    finally:
+        ArtifactStore.close()
+
+
 def start():
+    if len(sys.argv) > 1 and sys.argv[1] == "cache":
+        cache_command(sys.argv[2:])
+        return
+
     opts = DEFAULT_OPTIONS
 
     # Remove default (None) values
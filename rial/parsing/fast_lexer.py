@@ -0,0 +1,241 @@
+"""
+Single pass lexer that produces the same token stream as the ContextualLexer followed by the Postlexer.
+
+The contextual lexer matches one alternation of all terminals a parser state accepts, ordered by
+(-priority, -max_width, -len(value), name), and takes the first alternative that matches.
+This lexer keeps that order but only tries the terminals that can start with the current character,
+compares string terminals with startswith instead of a regex and resolves identifier directives without
+building an intermediate token.
+"""
+import re
+import sre_constants
+import sre_parse
+from typing import Dict, List, Optional, Set, Tuple
+
+from rial.concept.parser import Token, TerminalDef, TraditionalLexer, UnexpectedCharacters, UnexpectedToken
+
+# Only ASCII characters get their own candidate list, everything else tries all terminals of the state
+DISPATCH_RANGE = 128
+
+
+def _first_chars_of_sequence(items) -> Tuple[Optional[Set[str]], bool]:
+    """
+    Computes a superset of the characters a parsed regex can start with.
+    :param items:
+    :return: The set of characters (None if it can start with anything) and whether the sequence can be empty
+    """
+    chars = set()
+    for op, av in items:
+        item_chars, nullable = _first_chars_of_item(op, av)
+        if item_chars is None:
+            return None, False
+        chars |= item_chars
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+def _first_chars_of_item(op, av) -> Tuple[Optional[Set[str]], bool]:
+    if op == sre_constants.LITERAL:
+        return {chr(av)}, False
+    if op == sre_constants.IN:
+        chars = set()
+        for in_op, in_av in av:
+            if in_op == sre_constants.LITERAL:
+                chars.add(chr(in_av))
+            elif in_op == sre_constants.RANGE:
+                chars.update(chr(c) for c in range(in_av[0], min(in_av[1], DISPATCH_RANGE - 1) + 1))
+            else:
+                return None, False
+        return chars, False
+    if op == sre_constants.SUBPATTERN:
+        return _first_chars_of_sequence(av[-1])
+    if op == sre_constants.BRANCH:
+        chars = set()
+        nullable = False
+        for branch in av[1]:
+            branch_chars, branch_nullable = _first_chars_of_sequence(branch)
+            if branch_chars is None:
+                return None, False
+            chars |= branch_chars
+            nullable = nullable or branch_nullable
+        return chars, nullable
+    if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+        chars, nullable = _first_chars_of_sequence(av[2])
+        return chars, nullable or av[0] == 0
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        # Zero width, doesn't consume the first character
+        return set(), True
+    return None, False
+
+
+def first_chars(terminal: TerminalDef) -> Optional[Set[str]]:
+    if terminal.pattern.type == "str":
+        return {terminal.pattern.value[0]}
+    if len(terminal.pattern.flags) > 0:
+        return None
+    chars, _ = _first_chars_of_sequence(sre_parse.parse(terminal.pattern.to_regexp()))
+    return chars
+
+
+class _Candidate:
+    __slots__ = ('name', 'literal', 'regex', 'unless', 'has_newline', 'ignored')
+
+    def __init__(self, name: str, literal: Optional[str], regex, unless: Optional[Dict[str, str]], has_newline: bool,
+                 ignored: bool):
+        self.name = name
+        self.literal = literal
+        self.regex = regex
+        self.unless = unless
+        self.has_newline = has_newline
+        self.ignored = ignored
+
+
+class _LexerGroup:
+    dispatch: Dict[str, Tuple[_Candidate, ...]]
+    fallback: Tuple[_Candidate, ...]
+    allowed: Set[str]
+
+    def __init__(self, dispatch: Dict[str, Tuple[_Candidate, ...]], fallback: Tuple[_Candidate, ...],
+                 allowed: Set[str]):
+        self.dispatch = dispatch
+        self.fallback = fallback
+        self.allowed = allowed
+
+
+class FastLexer:
+    """
+    Drop-in replacement for the ContextualLexer (plus Postlexer) of the parse tables in `parse_tables`.
+    Lexer groups are built the first time the parser enters a state that uses them.
+    """
+
+    def __init__(self, terminals: List[TerminalDef], state_lexer_groups: List[int], lexer_groups: List,
+                 newline_types: List[str], ignore: List[str], g_regex_flags: int, postlex=None):
+        self.terminals = terminals
+        self.terminals_by_name = {terminal.name: terminal for terminal in terminals}
+        self.state_lexer_groups = state_lexer_groups
+        self.lexer_groups = lexer_groups
+        self.newline_types = frozenset(newline_types)
+        self.ignore = ignore
+        self.ignore_types = frozenset(ignore)
+        self.g_regex_flags = g_regex_flags
+        self.postlex = postlex
+        self._groups: Dict[int, _LexerGroup] = dict()
+        self._state_groups: List[Optional[_LexerGroup]] = [None] * len(state_lexer_groups)
+        self._candidates: Dict[str, Tuple[_Candidate, Optional[Set[str]]]] = dict()
+        self._root_lexer: Optional[TraditionalLexer] = None
+
+    @property
+    def root_lexer(self) -> TraditionalLexer:
+        if self._root_lexer is None:
+            self._root_lexer = TraditionalLexer(self.terminals, ignore=self.ignore, g_regex_flags=self.g_regex_flags)
+        return self._root_lexer
+
+    def _get_candidate(self, name: str, unless: Optional[List[str]]) -> Tuple[_Candidate, Optional[Set[str]]]:
+        key = name if unless is None else f"{name}:{','.join(unless)}"
+        if key not in self._candidates:
+            terminal = self.terminals_by_name[name]
+            if terminal.pattern.type == "str" and len(terminal.pattern.flags) == 0:
+                literal, regex = terminal.pattern.value, None
+            else:
+                literal, regex = None, re.compile(terminal.pattern.to_regexp(), self.g_regex_flags)
+            unless_types = None
+            if unless is not None:
+                unless_types = {self.terminals_by_name[unless_name].pattern.value: unless_name for unless_name in unless}
+            self._candidates[key] = (
+                _Candidate(name, literal, regex, unless_types, name in self.newline_types, name in self.ignore_types),
+                first_chars(terminal))
+        return self._candidates[key]
+
+    def _get_group(self, state: int) -> _LexerGroup:
+        index = self.state_lexer_groups[state]
+        group = self._groups.get(index)
+
+        if group is None:
+            _, matched_names, callbacks = self.lexer_groups[index]
+            candidates = [self._get_candidate(name, callbacks.get(name)) for name in matched_names]
+            dispatch = dict()
+            for code in range(DISPATCH_RANGE):
+                char = chr(code)
+                dispatch[char] = tuple(
+                    candidate for candidate, chars in candidates if chars is None or char in chars)
+            group = _LexerGroup(dispatch, tuple(candidate for candidate, _ in candidates),
+                                set(matched_names) - self.ignore_types)
+            self._groups[index] = group
+
+        self._state_groups[state] = group
+        return group
+
+    def lex(self, stream: str, get_parser_state):
+        state_groups = self._state_groups
+        postlex = self.postlex
+        length = len(stream)
+        pos = 0
+        line = 1
+        line_start_pos = 0
+        last_token = None
+
+        parser_state = get_parser_state()
+        group = state_groups[parser_state] or self._get_group(parser_state)
+
+        while pos < length:
+            for candidate in group.dispatch.get(stream[pos], group.fallback):
+                if candidate.literal is not None:
+                    if stream.startswith(candidate.literal, pos):
+                        value = candidate.literal
+                        break
+                else:
+                    match = candidate.regex.match(stream, pos)
+                    if match is not None:
+                        value = match.group(0)
+                        break
+            else:
+                self._raise_unexpected(stream, pos, line, pos - line_start_pos + 1, group, parser_state, last_token)
+
+            start_pos = pos
+            start_line = line
+            start_column = pos - line_start_pos + 1
+            pos += len(value)
+            if candidate.has_newline:
+                newlines = value.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start_pos = start_pos + value.rindex('\n') + 1
+
+            if candidate.ignored:
+                continue
+
+            type_ = candidate.name
+            if candidate.unless is not None:
+                # The callback matched the whole value against `literal$`, which also allows one trailing newline
+                unless_type = candidate.unless.get(value)
+                if unless_type is None and value.endswith('\n'):
+                    unless_type = candidate.unless.get(value[:-1])
+                if unless_type is not None:
+                    type_ = unless_type
+
+            last_token = (type_, value, start_pos, start_line, start_column)
+            token_value = value
+            if type_ == "IDENTIFIER" and postlex is not None and (value[0] == '#' or value[0] == '@'):
+                type_, token_value = postlex.resolve_identifier(value)
+
+            yield Token(type_, token_value, start_pos, start_line, start_column, line, pos - line_start_pos + 1, pos)
+
+            parser_state = get_parser_state()
+            group = state_groups[parser_state] or self._get_group(parser_state)
+
+    def _raise_unexpected(self, stream: str, pos: int, line: int, column: int, group: _LexerGroup, parser_state: int,
+                          last_token):
+        allowed = set(group.allowed)
+        if not allowed:
+            allowed = {"<END-OF-FILE>"}
+        error = UnexpectedCharacters(stream, pos, line, column, allowed=allowed, state=parser_state,
+                                     token_history=last_token and [Token(*last_token)])
+
+        # Same as the ContextualLexer, the character might be valid in another context
+        root_match = self.root_lexer.match(stream, pos)
+        if not root_match:
+            raise error
+
+        value, type_ = root_match
+        raise UnexpectedToken(Token(type_, value, pos, line, column), allowed, state=parser_state)
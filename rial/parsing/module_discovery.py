@@ -0,0 +1,59 @@
+import re
+from typing import List
+
+# Comments are stripped first so that commented out imports don't pull in modules.
+COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+IMPORT_PATTERN = re.compile(r"=\s*use\s+([^;]+);")
+
+
+class DiscoveredModule:
+    mod_name: str
+    path: str
+    contents: str
+    imports: List[str]
+
+    def __init__(self, mod_name: str, path: str, contents: str, imports: List[str]):
+        self.mod_name = mod_name
+        self.path = path
+        self.contents = contents
+        self.imports = imports
+
+
+def qualify_mod_name(mod_name: str) -> str:
+    """
+    Prefixes the modules shipped with the compiler with "rial:", the same way an import statement does.
+    :param mod_name:
+    :return:
+    """
+    if mod_name.startswith("builtin") or mod_name.startswith("core") or mod_name.startswith(
+            "std") or mod_name.startswith("startup"):
+        return f"rial:{mod_name}"
+    return mod_name
+
+
+def scan_imports(contents: str, project_name: str) -> List[str]:
+    """
+    Cheap scan for `use a:b:c;` statements that does not need a full parse.
+    It may report a module that is not actually imported (e.g. from inside a string), which only costs a
+    superfluous parse, but it must never miss a real import.
+    :param contents:
+    :param project_name:
+    :return:
+    """
+    imports: List[str] = list()
+
+    for match in IMPORT_PATTERN.finditer(COMMENT_PATTERN.sub("", contents)):
+        parts = list()
+        for part in match.group(1).split(":"):
+            part = part.strip()
+            if part == "#programMainModule":
+                part = f"{project_name}:main"
+            elif part.startswith("@"):
+                part = part.replace("@", "").strip("\"")
+            parts.append(part)
+        mod_name = qualify_mod_name(':'.join(parts))
+
+        if mod_name not in imports:
+            imports.append(mod_name)
+
+    return imports
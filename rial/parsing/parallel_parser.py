@@ -0,0 +1,63 @@
+from concurrent.futures import ProcessPoolExecutor
+from timeit import default_timer as timer
+from typing import Dict, List, Optional, Tuple
+
+from rial.concept.parser import Lark
+from rial.parsing.module_discovery import DiscoveredModule
+from rial.parsing.parse_tables import load_parser
+from rial.parsing.tree_serializer import dump_tree
+
+# Starting the pool and building a parser in every worker costs more than parsing a few small files,
+# so builds below these limits are parsed in-process while compiling.
+MIN_PARALLEL_MODULES = 4
+MIN_PARALLEL_BYTES = 64 * 1024
+
+_worker_parser: Optional[Lark] = None
+
+
+def _init_worker(project_name: str, target_triple: str, lexer: str):
+    global _worker_parser
+    from rial.transformer.Postlexer import Postlexer
+    _worker_parser = load_parser(Postlexer(project_name, target_triple), lexer)
+
+
+def _parse_in_worker(path: str, contents: str) -> Tuple[str, Optional[bytes], float]:
+    start = timer()
+    try:
+        data = dump_tree(_worker_parser.parse(contents))
+    except Exception:
+        # Errors are reported by the in-process parse that runs when the module gets compiled
+        data = None
+    return path, data, timer() - start
+
+
+def should_parse_in_parallel(modules: List[DiscoveredModule], workers: int) -> bool:
+    return workers > 1 and len(modules) >= MIN_PARALLEL_MODULES and sum(
+        len(module.contents) for module in modules) >= MIN_PARALLEL_BYTES
+
+
+def parse_modules(modules: List[DiscoveredModule], workers: int, project_name: str, target_triple: str,
+                  lexer: str = "contextual") -> Dict[str, Tuple[Optional[bytes], float]]:
+    """
+    Parses all modules in a process pool.
+    Returns the serialized tree (None if parsing failed) and the time the worker took for each path.
+    :param modules:
+    :param workers:
+    :param project_name:
+    :param target_triple:
+    :param lexer:
+    :return:
+    """
+    results: Dict[str, Tuple[Optional[bytes], float]] = dict()
+
+    # Largest files first so that one big file does not end up as the last job
+    modules = sorted(modules, key=lambda module: len(module.contents), reverse=True)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(modules)), initializer=_init_worker,
+                             initargs=(project_name, target_triple, lexer)) as executor:
+        futures = [executor.submit(_parse_in_worker, module.path, module.contents) for module in modules]
+        for future in futures:
+            path, data, time_taken = future.result()
+            results[path] = (data, time_taken)
+
+    return results
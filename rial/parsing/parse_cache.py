@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+from rial.parsing.parse_tables import get_grammar_version
+from rial.parsing.tree_serializer import SERIALIZER_VERSION
+from rial.profiling import increment_counter
+from rial.util.util import good_hash
+
+
+class ParseCache:
+    """
+    Persistent cache of serialized parse trees.
+    Entries are keyed by the file contents, the grammar and everything the postlexer substitutes into the tokens,
+    so an entry never has to be invalidated, a changed input simply produces a different key.
+    """
+    cache_path: Path
+    disabled: bool
+    key_prefix: str
+
+    @staticmethod
+    def init(cache_path: Path, disabled: bool, project_name: str, target_triple: str):
+        ParseCache.cache_path = cache_path.joinpath("parse")
+        ParseCache.disabled = disabled
+        ParseCache.key_prefix = f"{get_grammar_version()}:{SERIALIZER_VERSION}:{project_name}:{target_triple}:"
+
+        if not disabled:
+            ParseCache.cache_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_key(contents: str) -> str:
+        return good_hash(ParseCache.key_prefix + contents)
+
+    @staticmethod
+    def lookup(contents: str) -> Optional[bytes]:
+        if ParseCache.disabled:
+            return None
+
+        entry = ParseCache.cache_path.joinpath(f"{ParseCache.get_key(contents)}.tree")
+
+        try:
+            with entry.open("rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            increment_counter("PARSE_CACHE_MISSES")
+            return None
+
+        increment_counter("PARSE_CACHE_HITS")
+        return data
+
+    @staticmethod
+    def store(contents: str, data: bytes):
+        if ParseCache.disabled:
+            return
+
+        entry = ParseCache.cache_path.joinpath(f"{ParseCache.get_key(contents)}.tree")
+        temp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+
+        # Write to a temporary file first so that a concurrent or aborted build never sees a partial entry
+        with temp_entry.open("wb") as file:
+            file.write(data)
+        os.replace(str(temp_entry), str(entry))
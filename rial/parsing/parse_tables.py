@@ -0,0 +1,388 @@
+"""
+Precompiled parse tables for the standalone parser.
+
+Building `Lark_StandAlone` deserializes the whole grammar into Python objects and compiles the regexes of every
+contextual lexer state up front. This module writes the same tables into a compact binary file and builds
+an equivalent parser on top of a memory mapping of it, decoding parser states and compiling lexers only once they're
+first needed.
+
+Regenerate the tables after regenerating the standalone parser:
+
+    python3.8 -m rial.parsing.parse_tables
+
+Layout of the file (little endian):
+    header          magic, length of the metadata, number of states
+    metadata        marshalled dict, padded to 4 bytes
+    row offsets     uint32 per state (+1), index of the first action of each state
+    actions         uint16 triples of (symbol, action, argument)
+"""
+import marshal
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rial.concept import parser
+from rial.concept.parser import Lark, Lark_StandAlone, LarkOptions, LexerConf, ContextualLexer, TraditionalLexer, \
+    TerminalDef, PatternStr, PatternRE, Rule, RuleOptions, Terminal, NonTerminal, ParseTable, ParseTreeBuilder, \
+    LALR_Parser, LALR_ContextualLexer, _Parser, UnlessCallback, Shift, Reduce, Tree, Token, UnexpectedCharacters, \
+    UnexpectedToken, _Lex, build_mres
+from rial.parsing.fast_lexer import FastLexer
+from rial.util.log import log_warn
+from rial.util.util import good_hash
+
+TABLES_PATH = Path(__file__).parent.parent.joinpath("concept").joinpath("parser_tables.bin")
+
+MAGIC = b"RIALPT01"
+HEADER = struct.Struct("<8sII")
+
+
+@lru_cache(maxsize=None)
+def get_grammar_version() -> str:
+    # The generated parser contains the whole grammar in its tables
+    with open(parser.__file__, "r") as file:
+        return good_hash(file.read())
+
+
+def _serialize_symbol(symbol):
+    return symbol.name, symbol.is_term, getattr(symbol, 'filter_out', False)
+
+
+def _deserialize_symbol(data):
+    name, is_term, filter_out = data
+    return Terminal(name, filter_out) if is_term else NonTerminal(name)
+
+
+def _mres_names(mres) -> List[str]:
+    names = list()
+    for _, type_from_index in mres:
+        names.extend(type_from_index[index] for index in sorted(type_from_index.keys()))
+    return names
+
+
+def write_parse_tables(path: Path = TABLES_PATH):
+    lark = Lark_StandAlone()
+    frontend = lark.parser
+    parse_table = frontend.parser._parse_table
+    contextual_lexer: ContextualLexer = frontend.lexer
+
+    rules = lark.rules
+    rule_indices = {rule: index for index, rule in enumerate(rules)}
+
+    terminals = list()
+    for terminal in frontend.lexer_conf.tokens:
+        pattern = terminal.pattern
+        width = getattr(pattern, '_width', None)
+        terminals.append((terminal.name, pattern.type, pattern.value, sorted(pattern.flags), terminal.priority,
+                          tuple(width) if width is not None else None))
+
+    # Contextual lexer states share lexers, keep them as groups and record how each was built
+    lexer_groups = list()
+    lexer_group_indices = dict()
+    state_lexer_groups = dict()
+    for state, lexer in contextual_lexer.lexers.items():
+        if id(lexer) not in lexer_group_indices:
+            lexer_group_indices[id(lexer)] = len(lexer_groups)
+            lexer_groups.append((
+                [terminal.name for terminal in lexer.terminals],
+                _mres_names(lexer.mres),
+                {name: _mres_names(callback.mres) for name, callback in lexer.callback.items()},
+            ))
+        state_lexer_groups[state] = lexer_group_indices[id(lexer)]
+
+    symbols = list()
+    symbol_indices = dict()
+    state_count = len(parse_table.states)
+    row_offsets = [0]
+    actions = list()
+
+    for state in range(state_count):
+        for symbol, (action, arg) in parse_table.states[state].items():
+            if symbol not in symbol_indices:
+                symbol_indices[symbol] = len(symbols)
+                symbols.append(symbol)
+            if action is Shift:
+                actions.extend((symbol_indices[symbol], 0, arg))
+            else:
+                actions.extend((symbol_indices[symbol], 1, rule_indices[arg]))
+        row_offsets.append(len(actions) // 3)
+
+    meta = marshal.dumps({
+        'grammar_version': get_grammar_version(),
+        'options': lark.options.options,
+        'terminals': terminals,
+        'ignore': list(frontend.lexer_conf.ignore),
+        'g_regex_flags': frontend.lexer_conf.g_regex_flags,
+        'newline_types': contextual_lexer.root_lexer.newline_types,
+        'rules': [(_serialize_symbol(rule.origin), [_serialize_symbol(symbol) for symbol in rule.expansion],
+                   rule.order, rule.alias, rule.options.keep_all_tokens, rule.options.expand1,
+                   rule.options.priority, rule.options.template_source, tuple(rule.options.empty_indices))
+                  for rule in rules],
+        'symbols': symbols,
+        'start': frontend.start,
+        'start_states': parse_table.start_states,
+        'end_states': parse_table.end_states,
+        'lexer_groups': lexer_groups,
+        'state_lexer_groups': [state_lexer_groups[state] for state in range(state_count)],
+    })
+    meta += b"\0" * (-len(meta) % 4)
+
+    with open(str(path), "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(meta), state_count))
+        file.write(meta)
+        file.write(struct.pack(f"<{len(row_offsets)}I", *row_offsets))
+        file.write(struct.pack(f"<{len(actions)}H", *actions))
+
+
+class _MappedStates(dict):
+    """
+    Parser states that are decoded from the mapped action table the first time the parser enters them.
+    """
+
+    def __init__(self, row_offsets: memoryview, actions: memoryview, symbols: List[str], rules: List[Rule]):
+        super().__init__()
+        self._row_offsets = row_offsets
+        self._actions = actions
+        self._symbols = symbols
+        self._rules = rules
+
+    def __missing__(self, state: int):
+        if not isinstance(state, int) or not 0 <= state < len(self._row_offsets) - 1:
+            raise KeyError(state)
+
+        row = dict()
+        encoded = self._actions[self._row_offsets[state] * 3:self._row_offsets[state + 1] * 3].tolist()
+
+        for i in range(0, len(encoded), 3):
+            if encoded[i + 1] == 0:
+                row[self._symbols[encoded[i]]] = (Shift, encoded[i + 2])
+            else:
+                row[self._symbols[encoded[i]]] = (Reduce, self._rules[encoded[i + 2]])
+
+        self[state] = row
+        return row
+
+
+class _MappedLexers(dict):
+    """
+    Lexers of the contextual lexer, compiled the first time the parser is in a state that uses them.
+    The terminals were already validated when the tables were generated, so sanitization is skipped.
+    """
+
+    def __init__(self, state_lexer_groups: List[int], lexer_groups: List, terminals_by_name: Dict[str, TerminalDef],
+                 newline_types: List[str], ignore: List[str], g_regex_flags: int):
+        super().__init__()
+        self._state_lexer_groups = state_lexer_groups
+        self._lexer_groups = lexer_groups
+        self._group_lexers: Dict[int, TraditionalLexer] = dict()
+        self._terminals_by_name = terminals_by_name
+        self._newline_types = newline_types
+        self._ignore = ignore
+        self._g_regex_flags = g_regex_flags
+
+    def __missing__(self, state: int):
+        if not isinstance(state, int) or not 0 <= state < len(self._state_lexer_groups):
+            raise KeyError(state)
+
+        group = self._state_lexer_groups[state]
+        lexer = self._group_lexers.get(group)
+
+        if lexer is None:
+            terminal_names, matched_names, callbacks = self._lexer_groups[group]
+            lexer = TraditionalLexer.__new__(TraditionalLexer)
+            lexer.newline_types = self._newline_types
+            lexer.ignore_types = list(self._ignore)
+            lexer.terminals = [self._terminals_by_name[name] for name in terminal_names]
+            lexer.user_callbacks = {}
+            lexer.callback = {name: UnlessCallback(build_mres([self._terminals_by_name[unless] for unless in names],
+                                                              self._g_regex_flags, match_whole=True))
+                              for name, names in callbacks.items()}
+            lexer.mres = build_mres([self._terminals_by_name[name] for name in matched_names], self._g_regex_flags)
+            self._group_lexers[group] = lexer
+
+        self[state] = lexer
+        return lexer
+
+
+class MappedContextualLexer(ContextualLexer):
+    """
+    Same as ContextualLexer but the per-state lexers come from the mapped tables.
+    The lexer over all terminals is only needed to improve error messages and is built on the first error.
+    """
+
+    def __init__(self, terminals: List[TerminalDef], lexers: _MappedLexers, newline_types: List[str],
+                 ignore: List[str], g_regex_flags: int):
+        self.lexers = lexers
+        self.terminals = terminals
+        self.newline_types = newline_types
+        self.ignore = ignore
+        self.g_regex_flags = g_regex_flags
+        self._root_lexer: Optional[TraditionalLexer] = None
+
+    @property
+    def root_lexer(self) -> TraditionalLexer:
+        if self._root_lexer is None:
+            self._root_lexer = TraditionalLexer(self.terminals, ignore=self.ignore, g_regex_flags=self.g_regex_flags)
+        return self._root_lexer
+
+    def lex(self, stream, get_parser_state):
+        parser_state = get_parser_state()
+        l = _Lex(self.lexers[parser_state], parser_state)
+        try:
+            for x in l.lex(stream, self.newline_types, self.ignore):
+                yield x
+                parser_state = get_parser_state()
+                l.lexer = self.lexers[parser_state]
+                l.state = parser_state
+        except UnexpectedCharacters as e:
+            root_match = self.root_lexer.match(stream, e.pos_in_stream)
+            if not root_match:
+                raise
+
+            value, type_ = root_match
+            t = Token(type_, value, e.pos_in_stream, e.line, e.column)
+            raise UnexpectedToken(t, e.allowed, state=e.state)
+
+
+class MappedParseTables:
+    meta: Dict
+    row_offsets: memoryview
+    actions: memoryview
+
+    def __init__(self, path: Path):
+        with open(str(path), "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{path} is truncated")
+
+        magic, meta_length, state_count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a parse table file")
+
+        offset = HEADER.size
+        actions_offset = offset + meta_length + (state_count + 1) * 4
+        if len(self._mmap) < actions_offset:
+            raise ValueError(f"{path} is truncated")
+
+        try:
+            self.meta = marshal.loads(self._mmap[offset:offset + meta_length])
+        except EOFError as e:
+            raise ValueError(f"{path} is truncated") from e
+        offset += meta_length
+
+        view = memoryview(self._mmap)
+        self.row_offsets = view[offset:offset + (state_count + 1) * 4].cast("I")
+        offset += (state_count + 1) * 4
+
+        # The last row offset is the number of actions
+        if len(view) - offset != self.row_offsets[-1] * 6:
+            raise ValueError(f"{path} is truncated")
+        self.actions = view[offset:].cast("H")
+
+    def create_parser(self, postlex=None, lexer: str = "contextual") -> Lark:
+        meta = self.meta
+
+        terminals = list()
+        for name, kind, value, flags, priority, width in meta['terminals']:
+            if kind == "str":
+                pattern = PatternStr(value, flags)
+            else:
+                pattern = PatternRE(value, flags)
+                if width is not None:
+                    pattern._width = width
+            terminals.append(TerminalDef(name, pattern, priority))
+        terminals_by_name = {terminal.name: terminal for terminal in terminals}
+
+        rules = [Rule(_deserialize_symbol(origin), [_deserialize_symbol(symbol) for symbol in expansion], order, alias,
+                      RuleOptions(keep_all_tokens, expand1, priority, template_source, empty_indices))
+                 for origin, expansion, order, alias, keep_all_tokens, expand1, priority, template_source, empty_indices
+                 in meta['rules']]
+
+        options = dict(meta['options'])
+        options['postlex'] = postlex
+
+        lark = Lark.__new__(Lark)
+        lark.options = LarkOptions(options)
+        lark.rules = rules
+        lark.source = '<mapped>'
+        lark.parser_class = LALR_ContextualLexer
+        lark._parse_tree_builder = ParseTreeBuilder(rules, Tree, lark.options.propagate_positions,
+                                                    lark.options.keep_all_tokens, False,
+                                                    lark.options.maybe_placeholders)
+        lark._callbacks = lark._parse_tree_builder.create_callback(None)
+
+        states = _MappedStates(self.row_offsets, self.actions, meta['symbols'], rules)
+        parse_table = ParseTable(states, meta['start_states'], meta['end_states'])
+        lalr_parser = LALR_Parser.__new__(LALR_Parser)
+        lalr_parser._parse_table = parse_table
+        lalr_parser.parser = _Parser(parse_table, lark._callbacks)
+
+        frontend = LALR_ContextualLexer.__new__(LALR_ContextualLexer)
+        frontend.lexer_conf = LexerConf(terminals, meta['ignore'], postlex, {}, meta['g_regex_flags'])
+        frontend.start = meta['start']
+        frontend.parser = lalr_parser
+
+        if lexer == "fast":
+            # The fast lexer applies the postlexer itself
+            frontend.postlex = None
+            frontend.lexer = FastLexer(terminals, meta['state_lexer_groups'], meta['lexer_groups'],
+                                       meta['newline_types'], meta['ignore'], meta['g_regex_flags'], postlex)
+        else:
+            frontend.postlex = postlex
+            frontend.lexer = MappedContextualLexer(terminals, _MappedLexers(
+                meta['state_lexer_groups'], meta['lexer_groups'], terminals_by_name, meta['newline_types'],
+                meta['ignore'], meta['g_regex_flags']), meta['newline_types'], meta['ignore'], meta['g_regex_flags'])
+        lark.parser = frontend
+
+        return lark
+
+
+_mapped_tables: Optional[MappedParseTables] = None
+_warned_about_lexer = False
+
+
+def _load_standalone_parser(postlex, lexer: str, reason: str) -> Lark:
+    global _warned_about_lexer
+
+    # Worker processes are forked after the compiler loaded its parser, so this is only shown once
+    if lexer == "fast" and not _warned_about_lexer:
+        _warned_about_lexer = True
+        log_warn(f"Using the contextual lexer instead of the fast lexer, {reason}")
+
+    return Lark_StandAlone(postlex=postlex)
+
+
+def load_parser(postlex=None, lexer: str = "contextual") -> Lark:
+    """
+    Creates a parser from the precompiled tables.
+    Falls back to the standalone parser (and its contextual lexer) if the tables are missing or were generated for a
+    different grammar, with a warning if the fast lexer was requested.
+    :param postlex:
+    :param lexer: "contextual" or "fast"
+    :return:
+    """
+    global _mapped_tables
+
+    # The lexer groups were generated without any tokens the postlexer always accepts
+    if postlex is not None and len(postlex.always_accept) > 0:
+        return _load_standalone_parser(postlex, lexer, "the postlexer always accepts some tokens")
+
+    if _mapped_tables is None:
+        try:
+            tables = MappedParseTables(TABLES_PATH)
+        except (OSError, ValueError) as e:
+            return _load_standalone_parser(postlex, lexer, f"the parse tables can't be loaded: {e}")
+
+        if tables.meta['grammar_version'] != get_grammar_version():
+            return _load_standalone_parser(postlex, lexer, "the parse tables are out of date")
+
+        _mapped_tables = tables
+
+    return _mapped_tables.create_parser(postlex, lexer)
+
+
+if __name__ == "__main__":
+    write_parse_tables(Path(sys.argv[1]) if len(sys.argv) > 1 else TABLES_PATH)
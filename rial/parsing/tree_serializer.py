@@ -0,0 +1,90 @@
+import marshal
+from typing import List, Dict, Any
+
+from rial.concept.parser import Tree, Token
+
+# Bump whenever the layout below changes, old cache entries are then rejected on load.
+SERIALIZER_VERSION = 1
+
+_TREE = 0
+_TOKEN = 1
+_NONE = 2
+
+
+def dump_tree(tree: Tree) -> bytes:
+    """
+    Serializes a parse tree into a flat, marshalled list of opcodes and a string table.
+    Nodes are written in pre-order without recursion so that deeply nested expressions don't hit the recursion limit.
+    :param tree:
+    :return:
+    """
+    strings: List[str] = list()
+    string_indices: Dict[str, int] = dict()
+    ops: List[Any] = list()
+
+    def intern(value: str) -> int:
+        index = string_indices.get(value)
+        if index is None:
+            index = string_indices[value] = len(strings)
+            strings.append(value)
+        return index
+
+    stack = [tree]
+    while len(stack) > 0:
+        node = stack.pop()
+        if isinstance(node, Tree):
+            ops.extend((_TREE, intern(node.data), len(node.children)))
+            stack.extend(reversed(node.children))
+        elif isinstance(node, Token):
+            ops.extend((_TOKEN, intern(node.type), intern(node.value), node.pos_in_stream, node.line, node.column,
+                        node.end_line, node.end_column, node.end_pos))
+        elif node is None:
+            ops.append(_NONE)
+        else:
+            raise TypeError(f"Cannot serialize {type(node)} in a parse tree")
+
+    return marshal.dumps((SERIALIZER_VERSION, strings, ops))
+
+
+def load_tree(data: bytes) -> Tree:
+    version, strings, ops = marshal.loads(data)
+
+    if version != SERIALIZER_VERSION:
+        raise ValueError(f"Unsupported parse tree serialization version {version}")
+
+    root = None
+
+    # Each entry is a children list that still expects the given number of nodes
+    stack: List[List] = list()
+    i = 0
+    length = len(ops)
+
+    while i < length:
+        op = ops[i]
+        if op == _TREE:
+            node = Tree(strings[ops[i + 1]], [])
+            remaining = ops[i + 2]
+            i += 3
+        elif op == _TOKEN:
+            node = Token(strings[ops[i + 1]], strings[ops[i + 2]], ops[i + 3], ops[i + 4], ops[i + 5], ops[i + 6],
+                         ops[i + 7], ops[i + 8])
+            remaining = 0
+            i += 9
+        else:
+            node = None
+            remaining = 0
+            i += 1
+
+        if len(stack) > 0:
+            frame = stack[-1]
+            frame[0].append(node)
+            frame[1] -= 1
+            if frame[1] == 0:
+                stack.pop()
+        else:
+            root = node
+
+        if remaining > 0:
+            stack.append([node.children, remaining])
+
+    return root
@@ -32,3 +32,6 @@ class IPlatform:
 
     @abstractmethod
     def get_link_options(self) -> LinkingOptions: raise NotImplementedError
+
+    @abstractmethod
+    def get_runtime_libraries(self) -> List[str]: raise NotImplementedError
@@ -1,4 +1,6 @@
+from ctypes.util import find_library
 from shutil import which
+from typing import List
 
 from rial.linking.linking_options import LinkingOptions
 from rial.platform_support.IPlatform import IPlatform
@@ -70,3 +72,7 @@ class LinuxPlatform(IPlatform):
         opts.linker_pre_args.append("-m64")
 
         return opts
+
+    def get_runtime_libraries(self) -> List[str]:
+        # The libraries the linker adds to every executable, for resolving external functions in the JIT
+        return [library for library in (find_library("c"),) if library is not None]
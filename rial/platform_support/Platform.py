@@ -39,6 +39,10 @@ class Platform:
     def get_link_options() -> LinkingOptions:
         return Platform.get_platform().get_link_options()
 
+    @staticmethod
+    def get_runtime_libraries() -> List[str]:
+        return Platform.get_platform().get_runtime_libraries()
+
     @staticmethod
     def get_platform() -> IPlatform:
         system = platform.system()
@@ -2,7 +2,7 @@ import linecache
 from contextlib import contextmanager
 from enum import Enum
 from timeit import default_timer as timer
-from typing import List
+from typing import List, Dict
 
 
 class ExecutionStep(Enum):
@@ -12,11 +12,22 @@ class ExecutionStep(Enum):
     READ_CACHE = "Reading a cache module or file into memory"
     WRITE_CACHE = "Writing a cache module or file to disk"
     PARSE_FILE = "Lexing and parsing file into an AST"
+    DISCOVER_MODULES = "Scanning sources for imports to find all reachable modules"
+    PARSE_MODULES = "Parsing all reachable modules in worker processes"
+    DESUGAR = "Desugaring the AST"
+    COLLECT_DECLARATIONS = "Collecting the top level declarations of the AST"
+    DECLARE_STRUCTS = "Declaring structs"
+    DECLARE_FUNCTIONS = "Declaring functions"
+    DECLARE_GLOBALS = "Declaring and initializing global variables"
     GEN_IR = "Generating LLVM IR"
+    LOAD_INTERFACE = "Declaring an unchanged module from its interface summary instead of compiling it"
+    BUILD_PRELUDE = "Merging the exports of the always imported modules"
     HASH_FILE = "Hashing the file contents to check against the cached output"
     COMPILE_MOD = "Compile the file into a module"
+    COMPILE_MODULES = "Optimizing and emitting all modules in worker processes"
     COMPILE_OBJ = "Compile module into object file"
     WRITE_OBJ = "Write out the object file"
+    JIT = "Adding all modules to the JIT and finalizing them in memory"
     LINK_EXE = "Link all object files together into an exe"
     WAIT_DEPENDENCIES = "Wait for all dependencies to be compiled"
     HOOKED_STAGE = "Step in execution that is hooked into the 'normal' execution via the stage manager."
@@ -43,6 +54,8 @@ class ExecutionEvent:
 
 execution_events: List[ExecutionEvent] = list()
 
+counters: Dict[str, int] = dict()
+
 profiling: bool = False
 
 
@@ -59,17 +72,44 @@ def run_with_profiling(file: str, step: ExecutionStep):
     yield
     if profiling:
         end = timer()
-        same_event = None
+        record_profiling_event(file, step, end - start)
+
+
+def record_profiling_event(file: str, step: ExecutionStep, time_taken_seconds: float):
+    """
+    Records a step that was timed somewhere else, e.g. in a worker process.
+    Events for the same file and step are merged.
+    """
+    if not profiling:
+        return
+
+    for execution_event in execution_events:
+        if execution_event.file == file and execution_event.step == step:
+            execution_event.time_taken_seconds += time_taken_seconds
+            return
+
+    execution_events.append(ExecutionEvent(file, time_taken_seconds, step))
+
+
+def increment_counter(name: str, amount: int = 1):
+    if profiling:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def get_hit_rates() -> Dict[str, float]:
+    """
+    Hit rate of every counter pair named <NAME>_HITS and <NAME>_MISSES.
+    """
+    hit_rates = dict()
 
-        for execution_event in execution_events:
-            if execution_event.file == file and execution_event.step == step:
-                same_event = execution_event
-                break
+    for name, hits in counters.items():
+        if not name.endswith("_HITS"):
+            continue
+        prefix = name[:-len("_HITS")]
+        total = hits + counters.get(f"{prefix}_MISSES", 0)
+        hit_rates[f"{prefix}_HIT_RATE"] = hits / total
 
-        if same_event is not None:
-            same_event.time_taken_seconds += (end - start)
-        else:
-            execution_events.append(ExecutionEvent(file, (end - start), step))
+    return hit_rates
 
 
 def display_top(snapshot, key_type='lineno', limit=10):
@@ -7,12 +7,17 @@ from rial.ir.RIALModule import RIALModule
 
 class BaseTransformer:
     combined_transformer: CombinedTransformer
-    module: RIALModule
 
-    def __init__(self):
-        super().__init__()
+    @property
+    def module(self) -> RIALModule:
+        # Transformers are shared between all modules of a build
         from rial.compilation_manager import CompilationManager
-        self.module = CompilationManager.current_module
+        return CompilationManager.current_module
+
+    @property
+    def fold_constants(self) -> bool:
+        from rial.compilation_manager import CompilationManager
+        return CompilationManager.config.raw_opts.fold_constants
 
     def var(self, tree: Tree):
         nodes = tree.children
@@ -21,9 +26,3 @@ class BaseTransformer:
         assert isinstance(nodes[0], List)
 
         return self.module.get_definition(nodes[0])
-
-    def transform_helper(self, tree):
-        if isinstance(tree, Tree):
-            return self.combined_transformer.visit(tree)
-
-        return tree
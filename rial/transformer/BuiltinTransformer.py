@@ -3,7 +3,8 @@ from typing import Optional
 from llvmlite import ir
 
 from rial.compilation_manager import CompilationManager
-from rial.concept.parser import Tree, Token, Discard
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree, Token
 from rial.ir.LLVMIRInstruction import LLVMIRInstruction
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALVariable import RIALVariable
@@ -15,7 +16,7 @@ from rial.util.only_allowed_in_unsafe import only_allowed_in_unsafe
 class BuiltinTransformer(BaseTransformer):
     def sizeof(self, tree: Tree):
         nodes = tree.children
-        variable: Optional[RIALVariable] = self.transform_helper(nodes[0])
+        variable: Optional[RIALVariable] = yield nodes[0]
 
         assert variable is None or isinstance(variable, RIALVariable) or isinstance(variable, ir.Type)
 
@@ -72,9 +73,9 @@ class BuiltinTransformer(BaseTransformer):
         nodes = tree.children
         self.module.currently_unsafe = True
         for node in nodes[1:]:
-            self.transform_helper(node)
+            yield node
 
-        raise Discard()
+        return DISCARD
 
     def llvm_ir(self, tree: Tree):
         # Check for unsafe
@@ -88,7 +89,7 @@ class BuiltinTransformer(BaseTransformer):
 
         for node in nodes[1:]:
             if isinstance(node, Tree):
-                ty = self.transform_helper(node)
+                ty = yield node
             elif isinstance(node, Token):
                 return_name = node.value.strip("\"")
 
@@ -101,7 +102,7 @@ class BuiltinTransformer(BaseTransformer):
                 ty_name = ty.name
             else:
                 ty_name = map_llvm_to_type(ty)
-            variable = self.module.builder.alloca(ty)
+            variable = self.module.builder.alloca_in_entry(ty)
             self.module.builder.store(LLVMIRInstruction(ty, f"%\"{return_name}\""), variable)
             variable = RIALVariable("llvm_ir", ty_name, ty, variable)
             if return_name in self.module.current_block.named_values:
@@ -109,4 +110,4 @@ class BuiltinTransformer(BaseTransformer):
             self.module.current_block.add_named_value(return_name, variable)
             return variable
 
-        raise Discard()
+        return DISCARD
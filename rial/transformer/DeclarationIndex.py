@@ -0,0 +1,49 @@
+from typing import List, Tuple
+
+from rial.concept.parser import Tree
+
+# The list that contains the node, the index of the node in that list and the node itself
+DeclarationEntry = Tuple[List, int, Tree]
+
+FUNCTION_DECLARATIONS = {"function_decl", "external_function_decl", "extension_function_decl", "attributed_func_decl"}
+
+
+class DeclarationIndex:
+    """
+    Top level declarations of a module bucketed by kind, in the order they appear in the source.
+    Only the top level (and the blocks that unsafe_top_level_block is desugared into) is walked,
+    declarations can't appear anywhere else.
+    """
+    structs: List[DeclarationEntry]
+    functions: List[DeclarationEntry]
+    globals: List[DeclarationEntry]
+
+    def __init__(self, ast: Tree):
+        self.structs = list()
+        self.functions = list()
+        self.globals = list()
+
+        self._collect(ast)
+
+    def _collect(self, tree: Tree):
+        children = tree.children
+        for i, node in enumerate(children):
+            if not isinstance(node, Tree):
+                continue
+            if node.data == "start":
+                # Desugared unsafe_top_level_block, its declarations keep their place in the source order
+                self._collect(node)
+            elif node.data == "struct_decl":
+                self.structs.append((children, i, node))
+            elif node.data in FUNCTION_DECLARATIONS:
+                self.functions.append((children, i, node))
+            elif node.data == "global_variable_decl":
+                self.globals.append((children, i, node))
+
+    @staticmethod
+    def replace(entry: DeclarationEntry, node):
+        """
+        Replaces the declaration in its parent with the result of a declaration phase.
+        """
+        children, i, _ = entry
+        children[i] = node
@@ -4,16 +4,19 @@ from llvmlite import ir
 
 from rial.compilation_manager import CompilationManager
 from rial.concept.Transformer import Transformer
-from rial.concept.parser import Tree, Token, Discard
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree, Token
 from rial.ir.LLVMUIntType import LLVMUIntType
 from rial.ir.RIALModule import RIALModule
 from rial.ir.RIALVariable import RIALVariable
+from rial.ir.StringPool import StringPool
 from rial.ir.modifier.AccessModifier import AccessModifier
 from rial.ir.modifier.DeclarationModifier import DeclarationModifier
 from rial.ir.modifier.VariableMutabilityModifier import VariableMutabilityModifier
+from rial.parsing.module_discovery import qualify_mod_name
 from rial.transformer.builtin_type_to_llvm_mapper import NULL, TRUE, FALSE, convert_number_to_constant, map_llvm_to_type
 from rial.util.log import log_warn_short
-from rial.util.util import good_hash
+from rial.util.util import decode_escapes
 
 
 class DesugarTransformer(Transformer):
@@ -111,13 +114,12 @@ class DesugarTransformer(Transformer):
 
         mod_name = ':'.join([node.value for node in nodes[3:]])
 
-        if mod_name.startswith("core") or mod_name.startswith("std") or mod_name.startswith("startup"):
-            mod_name = f"rial:{mod_name}"
+        mod_name = qualify_mod_name(mod_name)
 
         CompilationManager.request_module(mod_name)
-        self.module.dependencies[var_name] = mod_name
+        self.module.add_dependency(var_name, mod_name)
 
-        raise Discard()
+        return DISCARD
 
     def null(self, nodes):
         return RIALVariable("null", "Int8", NULL.type, NULL)
@@ -135,27 +137,13 @@ class DesugarTransformer(Transformer):
 
     def string(self, nodes):
         value = nodes[0].value.strip("\"")
-        name = ".const.string.%s" % good_hash(value)
 
-        existing = self.module.get_global_safe(name)
-        if existing is not None:
-            return self.module.global_variables[name]
-
-        # Parse escape codes to be correct
-        value = eval("'{}'".format(value))
-        value = f"{value}\00"
-        arr = bytearray(value.encode("utf-8"))
-        const_char_arr = ir.Constant(ir.ArrayType(LLVMUIntType(8), len(arr)), arr)
-        glob = self.module.declare_global(name, f"Char[{len(arr)}]", const_char_arr.type, "private", const_char_arr,
-                                          AccessModifier.PRIVATE, True)
-
-        return glob
+        return StringPool.declare_in(self.module, value)
 
     def char(self, nodes):
         value = nodes[0].value.strip("'")
         # Parse escape codes to be correct
-        value = eval("'{}'".format(value))
-        name = ".const.char.%s" % good_hash(value)
+        value = decode_escapes(value)
 
         if len(value) == 0:
             value = '\00'
@@ -163,7 +151,7 @@ class DesugarTransformer(Transformer):
         value = ord(value)
         const_char = ir.Constant(LLVMUIntType(8), value)
 
-        return RIALVariable(name, "Char", const_char.type, const_char)
+        return RIALVariable("char", "Char", const_char.type, const_char)
 
     def variable_mutability(self, nodes):
         mutability = nodes[0].value
@@ -1,19 +1,23 @@
 from typing import List
 
 from rial.concept.parser import Tree
+from rial.ir.OverloadResolver import OverloadResolver
 from rial.ir.RIALVariable import RIALVariable
 from rial.transformer.BaseTransformer import BaseTransformer
 
 
 class FunctionCallTransformer(BaseTransformer):
     def function_args(self, tree: Tree):
-        arguments = list(map(self.transform_helper, tree.children))
+        arguments = list()
+
+        for node in tree.children:
+            arguments.append((yield node))
 
         return arguments
 
     def function_call(self, tree: Tree):
         nodes = tree.children
-        arguments: List[RIALVariable] = self.transform_helper(nodes[1])
+        arguments: List[RIALVariable] = yield nodes[1]
 
         assert isinstance(nodes[0], List)
         func = self.module.get_definition(nodes[0])
@@ -28,6 +32,15 @@ class FunctionCallTransformer(BaseTransformer):
         else:
             implicit_parameter = None
 
+        # Calls through local variables depend on the scope, everything else only changes with new declarations
+        call_key = None
+        if not isinstance(func, RIALVariable):
+            call_key = OverloadResolver.get_call_key(self.module, nodes[0], arguments, implicit_parameter)
+            resolved = OverloadResolver.lookup(call_key)
+
+            if resolved is not None:
+                return self.module.builder.gen_function_call([resolved], arguments, implicit_parameter)
+
         # Check for canonical names
         duplicates.update(self.module.get_functions_by_canonical_name(nodes[0][-1]))
 
@@ -43,4 +56,9 @@ class FunctionCallTransformer(BaseTransformer):
         if len(duplicates) == 0:
             raise KeyError(nodes[0])
 
-        return self.module.builder.gen_function_call(list(duplicates), arguments, implicit_parameter)
+        resolved = OverloadResolver.resolve(list(duplicates), arguments, implicit_parameter)
+
+        if call_key is not None and resolved is not None:
+            OverloadResolver.store(call_key, resolved)
+
+        return self.module.builder.gen_function_call([resolved], arguments, implicit_parameter)
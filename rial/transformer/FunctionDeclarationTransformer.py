@@ -1,12 +1,14 @@
 from typing import List
 
-from llvmlite.ir import Type, FunctionType, FunctionAttributes, ArrayType, re
+from llvmlite.ir import Type, FunctionType, FunctionAttributes, ArrayType
 
 from rial.concept.TransformerInterpreter import TransformerInterpreter
-from rial.concept.parser import Tree, Discard
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree
 from rial.ir.RIALFunction import RIALFunction
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALType import get_type
 from rial.ir.RIALVariable import RIALVariable
 from rial.ir.metadata.FunctionDefinition import FunctionDefinition
 from rial.ir.metadata.metadata_token import MetadataToken
@@ -135,7 +137,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         if is_builtin_type(return_type):
             llvm_return_type = llvm_return_type
         # Pointer to first element for still normal arrays
-        elif re.match(r".+\[[0-9]+\]$", return_type) is not None:
+        elif get_type(return_type).is_sized_array:
             llvm_return_type = llvm_return_type.as_pointer()
         elif isinstance(llvm_return_type, RIALIdentifiedStructType):
             llvm_return_type = llvm_return_type.as_pointer()
@@ -145,7 +147,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         # External functions cannot be declared in a struct
         if self.module.current_struct is not None:
             log_fail(f"External function {name} cannot be declared inside a class!")
-            raise Discard()
+            return DISCARD
 
         args: List[RIALVariable] = self.visit(nodes[3])
 
@@ -180,7 +182,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
             arg.name = args[i].name
             args[i].value = arg
 
-        raise Discard()
+        return DISCARD
 
     def extension_function_decl(self, tree: Tree):
         nodes = tree.children
@@ -207,7 +209,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         if is_builtin_type(return_type):
             llvm_return_type = llvm_return_type
         # Pointer to first element for still normal arrays
-        elif re.match(r".+\[[0-9]+\]$", return_type) is not None:
+        elif get_type(return_type).is_sized_array:
             llvm_return_type = llvm_return_type.as_pointer()
         elif isinstance(llvm_return_type, RIALIdentifiedStructType):
             llvm_return_type = llvm_return_type.as_pointer()
@@ -217,7 +219,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         # Extension functions cannot be declared inside other classes.
         if self.module.current_struct is not None:
             log_fail(f"Extension function {name} cannot be declared inside another class!")
-            raise Discard()
+            return DISCARD
 
         args: List[RIALVariable] = list()
         this_type = self.module.get_definition(nodes[3])
@@ -252,7 +254,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
             if is_builtin_type(arg.rial_type):
                 llvm_args.append(arg.llvm_type)
             # Pointer to first element for still normal arrays
-            elif re.match(r".+\[[0-9]+\]$", arg.rial_type) is not None:
+            elif arg.rial_type.is_sized_array:
                 llvm_args.append(arg.llvm_type.as_pointer())
             elif isinstance(arg.llvm_type, RIALIdentifiedStructType):
                 llvm_args.append(arg.llvm_type.as_pointer())
@@ -277,7 +279,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         if len(nodes) <= body_start:
             with self.module.create_or_enter_function_body(func):
                 self.module.builder.ret_void()
-            raise Discard()
+            return DISCARD
 
         token = nodes[2]
         metadata_token = MetadataToken(token.type, token.value)
@@ -310,7 +312,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         if is_builtin_type(return_type):
             llvm_return_type = llvm_return_type
         # Pointer to first element for still normal arrays
-        elif re.match(r".+\[[0-9]+\]$", return_type) is not None:
+        elif get_type(return_type).is_sized_array:
             llvm_return_type = llvm_return_type.as_pointer()
         elif isinstance(llvm_return_type, RIALIdentifiedStructType):
             llvm_return_type = llvm_return_type.as_pointer()
@@ -382,7 +384,7 @@ class FunctionDeclarationTransformer(TransformerInterpreter):
         if not len(nodes) > 4:
             with self.module.create_or_enter_function_body(func):
                 self.module.builder.ret_void()
-            raise Discard()
+            return DISCARD
 
         token = nodes[2]
         metadata_token = MetadataToken(token.type, token.value)
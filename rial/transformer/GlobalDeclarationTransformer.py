@@ -5,7 +5,7 @@ from llvmlite import ir
 from rial.compilation_manager import CompilationManager
 from rial.concept.Transformer import Transformer
 from rial.concept.combined_transformer import CombinedTransformer
-from rial.concept.parser import Discard
+from rial.concept.discard import DISCARD
 from rial.ir.RIALFunction import RIALFunction
 from rial.ir.RIALModule import RIALModule
 from rial.ir.RIALVariable import RIALVariable
@@ -60,4 +60,4 @@ class GlobalDeclarationTransformer(Transformer):
                                                       access_modifier)
                     self.module.builder.store(value.get_loaded_if_variable(self.module), glob.value)
 
-        raise Discard()
+        return DISCARD
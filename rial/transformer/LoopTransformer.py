@@ -1,7 +1,7 @@
-import re
 from typing import Optional
 
-from rial.concept.parser import Tree, Discard, Token
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree, Token
 from rial.ir.RIALVariable import RIALVariable
 from rial.transformer.BaseTransformer import BaseTransformer
 from rial.transformer.builtin_type_to_llvm_mapper import is_builtin_type, Int32, map_llvm_to_type
@@ -14,7 +14,7 @@ class LoopTransformer(BaseTransformer):
 
         self.module.builder.branch(self.module.conditional_block)
 
-        raise Discard()
+        return DISCARD
 
     def break_rule(self, tree: Tree):
         if self.module.end_block is None:
@@ -22,13 +22,13 @@ class LoopTransformer(BaseTransformer):
 
         self.module.builder.branch(self.module.end_block)
 
-        raise Discard()
+        return DISCARD
 
     def loop_loop(self, tree: Tree):
         nodes = tree.children
-        name = self.module.current_block.name
-        body_block = self.module.builder.create_block(f"{name}.loop.body", parent=self.module.current_block)
-        end_block = self.module.builder.create_block(f"{name}.loop.end", sibling=self.module.current_block)
+        name = self.module.builder.create_block_name("loop")
+        body_block = self.module.builder.create_block(f"{name}.body", parent=self.module.current_block)
+        end_block = self.module.builder.create_block(f"{name}.end", sibling=self.module.current_block)
 
         old_conditional_block = self.module.conditional_block
         old_end_block = self.module.end_block
@@ -39,7 +39,7 @@ class LoopTransformer(BaseTransformer):
 
         # Build body
         for node in nodes:
-            self.transform_helper(node)
+            yield node
 
         # Jump back into body
         if not self.module.current_block.is_terminated:
@@ -52,10 +52,9 @@ class LoopTransformer(BaseTransformer):
 
     def for_loop(self, tree: Tree):
         nodes = tree.children
-        name = self.module.current_block.name
-        name = f"{name}.for.wrapper"
+        name = self.module.builder.create_block_name("for")
 
-        wrapper_block = self.module.builder.create_block(name, parent=self.module.current_block)
+        wrapper_block = self.module.builder.create_block(f"{name}.wrapper", parent=self.module.current_block)
         conditional_block = self.module.builder.create_block(f"{name}.condition", parent=wrapper_block)
         body_block = self.module.builder.create_block(f"{name}.body", sibling=wrapper_block)
         end_block = self.module.builder.create_block(f"{name}.end", sibling=self.module.current_block)
@@ -68,14 +67,14 @@ class LoopTransformer(BaseTransformer):
         self.module.end_block = end_block
 
         # Create variable in wrapper block
-        self.transform_helper(nodes[0])
+        yield nodes[0]
 
         self.module.builder.create_jump(conditional_block)
         self.module.builder.enter_block(conditional_block)
         self.module.conditional_block = conditional_block
 
         # Create condition
-        condition: RIALVariable = self.transform_helper(nodes[1])
+        condition: RIALVariable = yield nodes[1]
         assert isinstance(condition, RIALVariable)
         self.module.builder.create_conditional_jump(condition.get_loaded_if_variable(self.module), body_block,
                                                     end_block)
@@ -85,11 +84,11 @@ class LoopTransformer(BaseTransformer):
 
         # Build body
         for node in nodes[3:]:
-            self.transform_helper(node)
+            yield node
 
         # Build incrementor
         if not self.module.current_block.is_terminated:
-            self.transform_helper(nodes[2])
+            yield nodes[2]
 
         # Create jump back into condition
         if not self.module.current_block.is_terminated:
@@ -102,7 +101,7 @@ class LoopTransformer(BaseTransformer):
 
     def while_loop(self, tree: Tree):
         nodes = tree.children
-        name = f"{self.module.current_block.name}.while"
+        name = self.module.builder.create_block_name("while")
         conditional_block = self.module.builder.create_block(f"{name}.condition", parent=self.module.current_block)
         body_block = self.module.builder.create_block(f"{name}.body", parent=conditional_block)
         end_block = self.module.builder.create_block(f"{name}.end", sibling=self.module.current_block)
@@ -115,7 +114,7 @@ class LoopTransformer(BaseTransformer):
         self.module.end_block = end_block
 
         # Build condition
-        condition: RIALVariable = self.transform_helper(nodes[0])
+        condition: RIALVariable = yield nodes[0]
         assert isinstance(condition, RIALVariable)
         self.module.builder.create_conditional_jump(condition.get_loaded_if_variable(self.module), body_block,
                                                     end_block)
@@ -125,7 +124,7 @@ class LoopTransformer(BaseTransformer):
 
         # Build body
         for node in nodes[1:]:
-            self.transform_helper(node)
+            yield node
 
         # Jump back into condition
         if not self.module.current_block.is_terminated:
@@ -138,19 +137,22 @@ class LoopTransformer(BaseTransformer):
 
     def conditional_block(self, tree: Tree):
         nodes = tree.children
-        name = f"{self.module.current_block.name}.conditional"
+        name = self.module.builder.create_block_name("conditional")
         condition = nodes[0]
         likely_unlikely_modifier: Token = nodes[1]
         body = nodes[2]
         else_conditional: Optional[Tree] = len(nodes) > 3 and nodes[3] or None
         else_likely_unlikely_modifier = Token('STANDARD_WEIGHT', 50)
+        else_nodes = list()
 
         if else_conditional is not None:
             if else_conditional.data == "conditional_else_block":
                 else_likely_unlikely_modifier = else_conditional.children[0]
-                else_conditional.children.pop(0)
+                else_nodes = else_conditional.children[1].children
             else:
-                # Else-If
+                # Else-If, desugared into a conditional block of its own inside the ELSE block
+                else_nodes = [else_conditional]
+
                 # If the IF Condition is likely, then the else if is automatically unlikely
                 # If the IF Condition is unlikely, then the else if is automatically likely
                 # This is done because the last ELSE is the opposite of the first IF and thus the ELSE IFs are automatically gone through to get there.
@@ -181,7 +183,7 @@ class LoopTransformer(BaseTransformer):
         # Create condition
         self.module.builder.create_jump(conditional_block)
         self.module.builder.enter_block(conditional_block)
-        cond: RIALVariable = self.transform_helper(condition)
+        cond: RIALVariable = yield condition
         assert isinstance(cond, RIALVariable)
         self.module.builder.create_conditional_jump(cond.get_loaded_if_variable(self.module), body_block,
                                                     else_block is not None and else_block or end_block,
@@ -191,7 +193,7 @@ class LoopTransformer(BaseTransformer):
         # Create body
         self.module.builder.enter_block(body_block)
         for node in body.children:
-            self.transform_helper(node)
+            yield node
 
         # Jump out of body
         if not self.module.current_block.is_terminated:
@@ -200,8 +202,8 @@ class LoopTransformer(BaseTransformer):
         # Create else if necessary
         if len(nodes) > 3:
             self.module.builder.enter_block(else_block)
-            for node in else_conditional.children:
-                self.transform_helper(node)
+            for node in else_nodes:
+                yield node
             if not self.module.current_block.is_terminated:
                 self.module.builder.create_jump(end_block)
 
@@ -212,7 +214,7 @@ class LoopTransformer(BaseTransformer):
 
     def shorthand_if(self, tree: Tree):
         nodes = tree.children
-        name = f"{self.module.current_block.name}.shorthand_conditional"
+        name = self.module.builder.create_block_name("shorthand_conditional")
         conditional_block = self.module.builder.create_block(f"{name}.condition", parent=self.module.current_block)
         body_block = self.module.builder.create_block(f"{name}.body", parent=conditional_block)
         else_block = self.module.builder.create_block(f"{name}.else", parent=conditional_block)
@@ -223,20 +225,20 @@ class LoopTransformer(BaseTransformer):
         # Create condition
         self.module.builder.create_jump(conditional_block)
         self.module.builder.enter_block(conditional_block)
-        cond: RIALVariable = self.transform_helper(nodes[0])
+        cond: RIALVariable = yield nodes[0]
         assert isinstance(cond, RIALVariable)
         self.module.builder.create_conditional_jump(cond.get_loaded_if_variable(self.module), body_block, else_block)
 
         # Create body
         self.module.builder.enter_block(body_block)
-        true_value: RIALVariable = self.transform_helper(nodes[1])
+        true_value: RIALVariable = yield nodes[1]
         assert isinstance(true_value, RIALVariable)
         # Builtins can be passed but need to be loaded
         if is_builtin_type(true_value.rial_type):
             true_val = true_value.get_loaded_if_variable(self.module)
             ty = true_value.llvm_type
         # Pointer to first element for still normal arrays
-        elif re.match(r".+\[[0-9]+\]$", true_value.rial_type) is not None:
+        elif true_value.rial_type.is_sized_array:
             true_val = self.module.builder.gep(true_value.value, [Int32(0), Int32(0)])
             ty = true_val.type
         else:
@@ -249,13 +251,13 @@ class LoopTransformer(BaseTransformer):
 
         # Create else
         self.module.builder.enter_block(else_block)
-        false_value: RIALVariable = self.transform_helper(nodes[2])
+        false_value: RIALVariable = yield nodes[2]
         assert isinstance(false_value, RIALVariable)
         # Builtins can be passed but need to be loaded
         if is_builtin_type(false_value.rial_type):
             false_val = false_value.get_loaded_if_variable(self.module)
         # Pointer to first element for still normal arrays
-        elif re.match(r".+\[[0-9]+\]$", false_value.rial_type) is not None:
+        elif false_value.rial_type.is_sized_array:
             false_val = self.module.builder.gep(false_value.value, [Int32(0), Int32(0)])
         else:
             false_val = false_value.value
@@ -279,10 +281,9 @@ class LoopTransformer(BaseTransformer):
     def switch_block(self, tree: Tree):
         nodes = tree.children
         parent = self.module.current_block
-        variable: RIALVariable = self.transform_helper(nodes[0])
+        variable: RIALVariable = yield nodes[0]
         assert isinstance(variable, RIALVariable)
-        end_block = self.module.builder.create_block(f"{self.module.current_block.name}.end_switch",
-                                                     sibling=self.module.current_block)
+        end_block = self.module.builder.create_block("end_switch", sibling=self.module.current_block)
         old_end_block = self.module.end_block
         old_conditional_block = self.module.conditional_block
         self.module.end_block = end_block
@@ -291,7 +292,7 @@ class LoopTransformer(BaseTransformer):
         collected_empties = list()
 
         for node in nodes[1:]:
-            var, block = self.transform_helper(node)
+            var, block = yield node
 
             # Check if just case, collect for future use
             if block is None:
@@ -328,7 +329,7 @@ class LoopTransformer(BaseTransformer):
 
     def switch_case(self, tree: Tree):
         nodes = tree.children
-        var: RIALVariable = self.transform_helper(nodes[0])
+        var: RIALVariable = yield nodes[0]
         assert isinstance(var, RIALVariable)
 
         # We need to load here as we are still in the parent's block and not the conditional block
@@ -336,12 +337,11 @@ class LoopTransformer(BaseTransformer):
 
         if len(nodes) == 1:
             return var, None
-        block = self.module.builder.create_block(f"{self.module.current_block.name}.switch.case",
-                                                 self.module.current_block)
+        block = self.module.builder.create_block("switch.case", self.module.current_block)
         self.module.builder.enter_block(block)
 
         for node in nodes[1:]:
-            self.transform_helper(node)
+            yield node
 
         if not self.module.current_block.is_terminated:
             self.module.builder.ret_void()
@@ -352,11 +352,10 @@ class LoopTransformer(BaseTransformer):
 
     def default_case(self, tree: Tree):
         nodes = tree.children
-        block = self.module.builder.create_block(f"{self.module.current_block.name}.switch.default",
-                                                 self.module.current_block)
+        block = self.module.builder.create_block("switch.default", self.module.current_block)
         self.module.builder.enter_block(block)
         for node in nodes:
-            self.transform_helper(node)
+            yield node
 
         if not self.module.current_block.is_terminated:
             self.module.builder.ret_void()
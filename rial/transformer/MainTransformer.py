@@ -6,7 +6,9 @@ from rial.concept.type_casting import get_casting_function
 from rial.ir.RIALFunction import RIALFunction
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALVariable import RIALVariable
+from rial.ir.constant_folding import fold_cast
 from rial.ir.metadata.metadata_token import MetadataToken
+from rial.profiling import increment_counter
 from rial.transformer.BaseTransformer import BaseTransformer
 from rial.transformer.builtin_type_to_llvm_mapper import Int32, is_builtin_type, map_llvm_to_type, map_shortcut_to_type
 from rial.util.only_allowed_in_unsafe import only_allowed_in_unsafe
@@ -15,12 +17,12 @@ from rial.util.only_allowed_in_unsafe import only_allowed_in_unsafe
 class MainTransformer(BaseTransformer):
     def start(self, tree: Tree):
         for node in tree.children:
-            self.transform_helper(node)
+            yield node
 
     def array_assignment(self, tree: Tree):
         nodes = tree.children
-        entry: RIALVariable = self.transform_helper(nodes[0])
-        val: RIALVariable = self.transform_helper(nodes[2])
+        entry: RIALVariable = yield nodes[0]
+        val: RIALVariable = yield nodes[2]
 
         assert isinstance(entry, RIALVariable)
         assert isinstance(val, RIALVariable)
@@ -36,8 +38,8 @@ class MainTransformer(BaseTransformer):
 
     def array_access(self, tree: Tree):
         nodes = tree.children
-        variable: RIALVariable = self.transform_helper(nodes[0])
-        index: RIALVariable = self.transform_helper(nodes[1])
+        variable: RIALVariable = yield nodes[0]
+        index: RIALVariable = yield nodes[1]
 
         if isinstance(variable, ir.Type):
             ty: ir.Type = variable
@@ -49,7 +51,7 @@ class MainTransformer(BaseTransformer):
             if isinstance(number.value, ir.Constant):
                 number = number.value.constant
                 arr_type = ir.ArrayType(ty, number)
-                allocated = self.module.builder.alloca(arr_type)
+                allocated = self.module.builder.alloca_in_entry(arr_type)
                 name = f"{name}[{number}]"
             elif number.is_variable:
                 number = self.module.builder.load(number.value)
@@ -84,11 +86,11 @@ class MainTransformer(BaseTransformer):
 
     def variable_assignment(self, tree: Tree):
         nodes = tree.children
-        variable: RIALVariable = self.transform_helper(nodes[0])
+        variable: RIALVariable = yield nodes[0]
 
         assert isinstance(variable, RIALVariable)
 
-        value = self.transform_helper(nodes[2])
+        value = yield nodes[2]
 
         if isinstance(value, RIALFunction):
             if value.function_type != variable.llvm_type:
@@ -110,11 +112,11 @@ class MainTransformer(BaseTransformer):
     def global_variable_assignment(self, tree: Tree):
         nodes = tree.children[0].children
         with self.module.create_in_global_ctor():
-            variable: RIALVariable = self.transform_helper(nodes[0])
+            variable: RIALVariable = yield nodes[0]
 
             assert isinstance(variable, RIALVariable)
 
-            value = self.transform_helper(nodes[2])
+            value = yield nodes[2]
 
             if isinstance(value, RIALFunction):
                 if value.function_type != variable.llvm_type:
@@ -133,16 +135,16 @@ class MainTransformer(BaseTransformer):
     def variable_decl(self, tree: Tree):
         nodes = tree.children
         identifier = nodes[0].value
-        value = self.transform_helper(nodes[2])
+        value = yield nodes[2]
 
         if isinstance(value, RIALFunction):
-            variable = self.module.builder.alloca(value.function_type, name=identifier)
+            variable = self.module.builder.alloca_in_entry(value.function_type, name=identifier)
             self.module.builder.store(self.module.builder.load(value), variable)
             variable = RIALVariable(identifier, str(value.function_type).replace("i8*", "Char[]"), value.function_type,
                                     variable, identified_variable=True)
         elif isinstance(value, RIALVariable):
             if value.identified_variable or not value.is_variable:
-                variable = self.module.builder.alloca(value.llvm_type, name=identifier)
+                variable = self.module.builder.alloca_in_entry(value.llvm_type, name=identifier)
                 self.module.builder.store(value.get_loaded_if_variable(self.module), variable)
                 variable = RIALVariable(identifier, value.rial_type, value.llvm_type, variable)
             else:
@@ -157,13 +159,20 @@ class MainTransformer(BaseTransformer):
     def cast(self, tree: Tree):
         nodes = tree.children
         ty = self.module.get_definition(nodes[0])
-        value: RIALVariable = self.transform_helper(nodes[1])
+        value: RIALVariable = yield nodes[1]
 
         if isinstance(ty, ir.Type) and is_builtin_type(map_llvm_to_type(ty)):
             # Simple cast for primitive to primitive
             if is_builtin_type(value.rial_type):
                 cast_function = get_casting_function(value.llvm_type, ty)
 
+                if self.fold_constants and cast_function is not None:
+                    folded = fold_cast(cast_function, value.value, ty)
+
+                    if folded is not None:
+                        increment_counter("FOLDED_OPERATIONS")
+                        return RIALVariable("cast", map_llvm_to_type(ty), ty, folded)
+
                 if hasattr(self.module.builder, cast_function):
                     casted = getattr(self.module.builder, cast_function)(value.get_loaded_if_variable(self.module), ty)
                     return RIALVariable("cast", map_llvm_to_type(ty), ty, casted)
@@ -200,7 +209,7 @@ class MainTransformer(BaseTransformer):
 
         # Create functions
         for func_decl in function_decls:
-            self.transform_helper(func_decl)
+            yield func_decl
 
         self.module.current_struct = None
 
@@ -217,7 +226,7 @@ class MainTransformer(BaseTransformer):
 
         with self.module.create_or_enter_function_body(func):
             for node in nodes[body_start:]:
-                self.transform_helper(node)
+                yield node
 
     def return_rule(self, tree: Tree):
         nodes = tree.children
@@ -229,7 +238,7 @@ class MainTransformer(BaseTransformer):
             self.module.builder.ret_void()
             return
 
-        variable: RIALVariable = self.transform_helper(nodes[0])
+        variable: RIALVariable = yield nodes[0]
 
         assert isinstance(variable, RIALVariable)
 
@@ -1,21 +1,36 @@
-from rial.compilation_manager import CompilationManager
+from typing import Tuple
+
 from rial.concept.parser import Token
 
 
 class Postlexer:
-    def identifier(self, token: Token):
-        value: str = token.value
+    project_name: str
+    target_triple: str
+
+    def __init__(self, project_name: str, target_triple: str):
+        # Only plain values are kept so that worker processes can build their own postlexer without a
+        # fully initialized CompilationManager.
+        self.project_name = project_name
+        self.target_triple = target_triple
+
+    def resolve_identifier(self, value: str) -> Tuple[str, str]:
+        """
+        Resolves compiler directives and literal identifiers.
+        :param value: The raw value of an IDENTIFIER token
+        :return: The new token type and value
+        """
+        type_ = "IDENTIFIER"
 
         # TODO: Add some kind of external registration / handling of this instead of inlining it all into this function
         if value.startswith("#"):
             if value == "#programMainModule":
-                value = f"{CompilationManager.config.project_name}:main"
+                value = f"{self.project_name}:main"
             elif value == "#targetTriple":
-                value = CompilationManager.codegen.target_machine.triple
-                token.type = "STRING"
+                value = self.target_triple
+                type_ = "STRING"
             elif value == "#targetOS":
-                triple = CompilationManager.codegen.target_machine.triple
-                token.type = "STRING"
+                triple = self.target_triple
+                type_ = "STRING"
 
                 # TODO: Better detection
                 if '-linux-' in triple:
@@ -26,12 +41,15 @@ class Postlexer:
                     value = "darwin"
                 else:
                     value = triple
-        elif token.startswith("@"):
+        elif value.startswith("@"):
             value = value.replace("@", "").strip("\"")
 
-        token = token.update(value=value)
+        return type_, value
+
+    def identifier(self, token: Token):
+        type_, value = self.resolve_identifier(token.value)
 
-        return token
+        return token.update(type_=type_, value=value)
 
     def process(self, stream):
         # Process token stream
@@ -3,6 +3,8 @@ from llvmlite import ir
 from rial.concept.parser import Tree
 from rial.ir.LLVMUIntType import LLVMUIntType
 from rial.ir.RIALVariable import RIALVariable
+from rial.ir.constant_folding import fold_comparison, fold_math
+from rial.profiling import increment_counter
 from rial.transformer.BaseTransformer import BaseTransformer
 from rial.transformer.builtin_type_to_llvm_mapper import is_builtin_type
 
@@ -10,9 +12,9 @@ from rial.transformer.builtin_type_to_llvm_mapper import is_builtin_type
 class StandardOperationsTransformer(BaseTransformer):
     def equal(self, tree: Tree):
         nodes = tree.children
-        left: RIALVariable = self.transform_helper(nodes[0])
+        left: RIALVariable = yield nodes[0]
         comparison = nodes[1].value
-        right: RIALVariable = self.transform_helper(nodes[2])
+        right: RIALVariable = yield nodes[2]
 
         assert isinstance(left, RIALVariable)
         assert isinstance(right, RIALVariable)
@@ -30,6 +32,13 @@ class StandardOperationsTransformer(BaseTransformer):
         else:
             right_val = right.value
 
+        if self.fold_constants and is_builtin_type(left.rial_type):
+            folded = fold_comparison(comparison, left.llvm_type, left_val, right_val)
+
+            if folded is not None:
+                increment_counter("FOLDED_OPERATIONS")
+                return RIALVariable(comparison, "Int1", ir.IntType(1), folded)
+
         # Unsigned and pointers
         if isinstance(left.llvm_type, LLVMUIntType) or (not is_builtin_type(left.rial_type) and left.is_variable):
             result = self.module.builder.icmp_unsigned(comparison, left_val, right_val)
@@ -48,9 +57,9 @@ class StandardOperationsTransformer(BaseTransformer):
 
     def math(self, tree: Tree):
         nodes = tree.children
-        left: RIALVariable = self.transform_helper(nodes[0])
+        left: RIALVariable = yield nodes[0]
         op = nodes[1].type
-        right: RIALVariable = self.transform_helper(nodes[2])
+        right: RIALVariable = yield nodes[2]
 
         assert isinstance(left, RIALVariable)
         assert isinstance(right, RIALVariable)
@@ -62,6 +71,13 @@ class StandardOperationsTransformer(BaseTransformer):
         left_val = left.get_loaded_if_variable(self.module)
         right_val = right.get_loaded_if_variable(self.module)
 
+        if self.fold_constants:
+            folded = fold_math(op, left.llvm_type, left_val, right_val)
+
+            if folded is not None:
+                increment_counter("FOLDED_OPERATIONS")
+                return RIALVariable(f"tmp_{op}", left.rial_type, left.llvm_type, folded)
+
         if op == "PLUS":
             if isinstance(left.llvm_type, ir.IntType):
                 result = self.module.builder.add(left_val, right_val)
@@ -1,7 +1,9 @@
 from typing import List, Dict, Union
 
+from rial.compilation_manager import CompilationManager
 from rial.concept.TransformerInterpreter import TransformerInterpreter
-from rial.concept.parser import Tree, Token, Discard
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree, Token
 from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
 from rial.ir.RIALModule import RIALModule
 from rial.ir.RIALVariable import RIALVariable
@@ -57,7 +59,7 @@ class StructDeclarationTransformer(TransformerInterpreter):
 
         if name in self.module.context.identified_types:
             log_fail(f"Struct {name} has been previously declared!")
-            raise Discard()
+            return DISCARD
 
         struct_body: Dict[str, List[Union[RIALVariable, Tree]]] = self.visit(nodes[-1])
         bases: List[List[str]] = list()
@@ -105,6 +107,7 @@ class StructDeclarationTransformer(TransformerInterpreter):
         # struct_body['function_decls'].insert(0, base_constructor)
         struct = create_identified_struct_type(self.module, name, access_modifier, base_llvm_structs,
                                                struct_body['properties'])
+        CompilationManager.codegen.record_struct_layout(struct)
         self.module.current_struct = struct
 
         declared_functions = list()
@@ -1,4 +1,3 @@
-import re
 from functools import lru_cache
 from typing import Optional
 
@@ -6,6 +5,7 @@ from llvmlite import ir
 from llvmlite.ir import Type, Constant, IdentifiedStructType
 
 from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.RIALType import get_type
 
 NULL = ir.Constant(ir.IntType(8), 0).inttoptr(ir.PointerType(ir.IntType(8)))
 TRUE = ir.Constant(ir.IntType(1), 1)
@@ -49,47 +49,16 @@ def null(ty):
     return ir.Constant(ty, None)
 
 
-@lru_cache(len(TYPE_TO_LLVM) + 20)
 def is_builtin_type(ty: str):
-    return map_type_to_llvm(ty) is not None and ty != "CString"
+    return get_type(ty).llvm_type is not None
 
 
-@lru_cache(len(SHORTCUT_TO_TYPE) + 20)
 def map_shortcut_to_type(shortcut: str) -> str:
-    if shortcut.endswith("[]"):
-        return map_shortcut_to_type(shortcut.split('[')[0]) + "[]"
+    return get_type(shortcut)
 
-    return SHORTCUT_TO_TYPE[shortcut] if shortcut in SHORTCUT_TO_TYPE else shortcut
 
-
-@lru_cache(128)
 def map_type_to_llvm(rial_type: str) -> Optional[Type]:
-    rial_type = map_shortcut_to_type(rial_type)
-
-    if rial_type in TYPE_TO_LLVM:
-        return TYPE_TO_LLVM[rial_type]
-
-    if rial_type == "CString":
-        # Char pointer
-        return ir.IntType(8).as_pointer()
-
-    # Variable integer
-    match = re.match(r"^Int([0-9]+)$", rial_type)
-
-    if match is not None:
-        count = match.group(1)
-
-        return ir.IntType(int(count))
-
-    # Variable uinteger
-    match = re.match(r"^UInt([0-9]+)$", rial_type)
-
-    if match is not None:
-        count = match.group(1)
-
-        return LLVMUIntType(int(count))
-
-    return None
+    return get_type(rial_type).llvm_type
 
 
 @lru_cache(128, typed=True)
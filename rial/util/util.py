@@ -1,6 +1,8 @@
 import hashlib
 import random
+import re
 import string
+import unicodedata
 
 from llvmlite.ir import Context
 
@@ -34,6 +36,52 @@ def good_hash(w: str):
     return hashlib.md5(w.encode()).hexdigest()
 
 
+_ESCAPE_REGEX = re.compile(r"\\(\n|[\\'\"abfnrtv]|[0-7]{1,3}|x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]+\})")
+
+_SIMPLE_ESCAPES = {
+    '\n': '',
+    '\\': '\\',
+    "'": "'",
+    '"': '"',
+    'a': '\a',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'v': '\v',
+}
+
+
+def _decode_escape(match) -> str:
+    escape = match.group(1)
+    simple = _SIMPLE_ESCAPES.get(escape)
+
+    if simple is not None:
+        return simple
+
+    if escape[0] in 'xuU':
+        return chr(int(escape[1:], 16))
+
+    if escape[0] == 'N':
+        return unicodedata.lookup(escape[2:-1])
+
+    return chr(int(escape, 8))
+
+
+def decode_escapes(value: str) -> str:
+    """
+    Decodes the escape sequences of a string or char literal the same way Python string literals are decoded.
+    Unknown escape sequences are kept as they are.
+    :param value:
+    :return:
+    """
+    if '\\' not in value:
+        return value
+
+    return _ESCAPE_REGEX.sub(_decode_escape, value)
+
+
 def _get_identified_type_if_exists(self: Context, name: str):
     if name in self.identified_types:
         return self.identified_types[name]
@@ -0,0 +1,101 @@
+import unittest
+
+import pytest
+
+from rial.concept.combined_transformer import CombinedTransformer
+from rial.concept.parser import Tree
+from rial.parsing.parse_tables import load_parser
+from rial.transformer.Postlexer import Postlexer
+from tests.benchmarks.test_parallel_parse_benchmark import generate_module, PROJECT_NAME, TARGET_TRIPLE
+
+MODULE_COUNT = 20
+TRANSFORMER_COUNT = 5
+
+
+def count_nodes(self, tree: Tree):
+    count = 1
+    for child in tree.children:
+        if isinstance(child, Tree):
+            count += yield child
+    return count
+
+
+def subtrees(tree: Tree):
+    stack = [tree]
+    while len(stack) > 0:
+        node = stack.pop()
+        yield node
+        stack.extend(child for child in node.children if isinstance(child, Tree))
+
+
+def create_transformers(rules):
+    """
+    Spreads the rules over as many transformers as the compiler combines.
+    """
+    transformers = list()
+    for index in range(TRANSFORMER_COUNT):
+        methods = {rule: count_nodes for rule in rules[index::TRANSFORMER_COUNT]}
+        transformers.append(type(f"CountingTransformer{index}", (), methods)())
+    return transformers
+
+
+class LookupCombinedTransformer(CombinedTransformer):
+    """
+    Resolves every rule with getattr on the transformers, like the CombinedTransformer did before the rule table.
+    """
+    dispatch = dict()
+
+    def __init__(self, *transformers):
+        super().__init__(*transformers)
+        self.dispatch = dict()
+
+    def __getattr__(self, key):
+        for transformer in reversed(self.transformers):
+            try:
+                return getattr(transformer, key)
+            except AttributeError:
+                pass
+        raise AttributeError(key)
+
+
+class TestDispatchBenchmark(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestDispatchBenchmark).setUpClass()
+        parser = load_parser(Postlexer(PROJECT_NAME, TARGET_TRIPLE))
+        cls.trees = [parser.parse(generate_module(index)) for index in range(MODULE_COUNT)]
+        cls.rules = sorted({subtree.data for tree in cls.trees for subtree in subtrees(tree)})
+        cls.node_count = sum(1 for tree in cls.trees for _ in subtrees(tree))
+
+    def visit_all(self, transformer: CombinedTransformer):
+        return sum(transformer.visit(tree) for tree in self.trees)
+
+    def run_benchmark(self, transformer: CombinedTransformer):
+        count = self.benchmark(self.visit_all, transformer)
+        self.assertEqual(count, self.node_count)
+
+        # There are no stats with --benchmark-disable
+        if self.benchmark.stats is not None:
+            self.benchmark.extra_info['nodes_per_second'] = self.node_count / self.benchmark.stats.stats.mean
+
+    @pytest.mark.benchmark(group="combined-transformer-dispatch")
+    def test_dispatch_table(self):
+        self.run_benchmark(CombinedTransformer(*create_transformers(self.rules)))
+
+    @pytest.mark.benchmark(group="combined-transformer-dispatch")
+    def test_getattr_lookup(self):
+        self.run_benchmark(LookupCombinedTransformer(*create_transformers(self.rules)))
+
+    def test_last_transformer_wins(self):
+        first, second = create_transformers(self.rules)[:2]
+        combined = CombinedTransformer(first, second)
+        combined += type("Override", (), {self.rules[0]: lambda self, tree: "override"})()
+        self.assertEqual(combined.visit(Tree(self.rules[0], [])), "override")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+import pytest
+
+from rial.main import DEFAULT_OPTIONS, start
+
+EXAMPLE_PATH = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-2])), "..", "examples",
+                            "hello-world")
+
+
+class TestIncrementalBuildBenchmark(unittest.TestCase):
+    """
+    Rebuilds examples/hello-world after a full build, once without any changes and once with its main module changed.
+    """
+    workdir: str
+    main_path: str
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self) -> None:
+        self.workdir = os.path.join(tempfile.mkdtemp(), "hello-world")
+        shutil.copytree(os.path.join(EXAMPLE_PATH, "src"), os.path.join(self.workdir, "src"))
+        self.main_path = os.path.join(self.workdir, "src", "main.rial")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.workdir))
+
+    def build(self, *args):
+        testargs = ['prog', '--workdir', self.workdir, *args]
+        with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+            start()
+
+    def change_main_every_round(self):
+        round_number = 0
+
+        def setup():
+            nonlocal round_number
+            round_number += 1
+
+            with open(self.main_path, "a") as file:
+                file.write(f"// {round_number}\n")
+
+            return (), {}
+
+        return setup
+
+    @pytest.mark.benchmark(group="incremental-build", min_rounds=1)
+    def test_full_build(self):
+        self.benchmark.pedantic(self.build, args=('--disable-cache',), rounds=3)
+
+    @pytest.mark.benchmark(group="incremental-build", min_rounds=1)
+    def test_no_op_rebuild(self):
+        self.build()
+        self.benchmark.pedantic(self.build, rounds=3)
+
+    @pytest.mark.benchmark(group="incremental-build", min_rounds=1)
+    def test_one_file_changed_rebuild(self):
+        self.build()
+        self.benchmark.pedantic(self.build, setup=self.change_main_every_round(), rounds=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
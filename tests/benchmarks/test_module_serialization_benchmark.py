@@ -0,0 +1,48 @@
+import unittest
+
+import pytest
+from llvmlite import ir
+
+from rial.ir.RIALModule import RIALModule
+from tests.test_frozen_function_ir import declare, unfrozen_ir
+
+FUNCTION_COUNT = 200
+INSTRUCTIONS_PER_FUNCTION = 50
+
+
+def create_module() -> RIALModule:
+    module = RIALModule("serialization", ir.Context())
+    glob = ir.GlobalVariable(module, ir.IntType(32), "glob")
+
+    for i in range(FUNCTION_COUNT):
+        with module.create_or_enter_function_body(declare(module, f"func{i}")):
+            value = module.builder.load(glob)
+            for _ in range(INSTRUCTIONS_PER_FUNCTION):
+                value = module.builder.add(value, ir.Constant(ir.IntType(32), i))
+            module.builder.store(value, glob)
+
+    return module
+
+
+class TestModuleSerializationBenchmark(unittest.TestCase):
+    """
+    Turns a module into text, like compiling or caching it does.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def test_frozen(self):
+        module = create_module()
+        text = self.benchmark(str, module)
+        self.assertEqual(text, unfrozen_ir(module))
+
+    def test_formatted(self):
+        module = create_module()
+        text = self.benchmark(unfrozen_ir, module)
+        self.assertEqual(text, str(module))
+
+
+if __name__ == '__main__':
+    unittest.main()
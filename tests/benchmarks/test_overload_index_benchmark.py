@@ -0,0 +1,87 @@
+import unittest
+
+import pytest
+from llvmlite import ir
+
+from rial.compilation_manager import CompilationManager
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+
+MODULE_COUNT = 50
+OVERLOADS_PER_MODULE = 20
+FUNCTIONS_PER_MODULE = 200
+CALL_SITES = 300
+
+
+def create_modules():
+    """
+    A chain of modules that each import all modules after them, every module overloads the same function.
+    """
+    context = ir.Context()
+    modules = dict()
+    for i in range(MODULE_COUNT):
+        module = RIALModule(f"module{i}", context)
+        for j in range(FUNCTIONS_PER_MODULE):
+            canonical_name = j < OVERLOADS_PER_MODULE and "print" or f"func{j}"
+            RIALFunction(module, ir.FunctionType(ir.VoidType(), []), f"f{i}_{j}", canonical_name)
+        for k in range(i + 1, MODULE_COUNT):
+            module.add_dependency(f"module{k}", f"module{k}")
+        modules[module.name] = module
+    return modules
+
+
+def search_functions(module: RIALModule, canonical_name: str):
+    # What get_functions_by_canonical_name did before the index
+    funcs = [func for func in module.functions if func.canonical_name == canonical_name]
+    for mod_name in module.dependencies.values():
+        funcs.extend(search_functions(CompilationManager.modules[mod_name], canonical_name))
+    return funcs
+
+
+class TestOverloadIndexBenchmark(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self) -> None:
+        self.old_modules = getattr(CompilationManager, "modules", None)
+        CompilationManager.modules = create_modules()
+        self.module = CompilationManager.modules["module0"]
+
+    def tearDown(self) -> None:
+        CompilationManager.modules = self.old_modules
+
+    @pytest.mark.benchmark(group="overloads")
+    def test_overload_index(self):
+        def lookup():
+            for _ in range(CALL_SITES):
+                self.module.get_functions_by_canonical_name("print")
+
+        self.benchmark(lookup)
+        self.assertEqual(len(self.module.get_functions_by_canonical_name("print")),
+                         MODULE_COUNT * OVERLOADS_PER_MODULE)
+
+    @pytest.mark.benchmark(group="overloads")
+    def test_overload_search_shallow(self):
+        # The recursive search revisits shared dependencies, only a short chain finishes in reasonable time
+        self.module = CompilationManager.modules[f"module{MODULE_COUNT - 8}"]
+
+        def lookup():
+            for _ in range(CALL_SITES):
+                search_functions(self.module, "print")
+
+        self.benchmark.pedantic(lookup, rounds=1)
+
+    @pytest.mark.benchmark(group="overloads")
+    def test_overload_index_shallow(self):
+        self.module = CompilationManager.modules[f"module{MODULE_COUNT - 8}"]
+
+        def lookup():
+            for _ in range(CALL_SITES):
+                self.module.get_functions_by_canonical_name("print")
+
+        self.benchmark(lookup)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pytest
+from llvmlite import ir
+
+from rial.ir.OverloadResolver import OverloadResolver
+from rial.ir.RIALModule import RIALModule
+from rial.main import DEFAULT_OPTIONS, start
+from tests.test_overload_resolver import declare, argument
+
+CALL_COUNT = 2000
+OVERLOAD_COUNT = 50
+
+
+def generate_call_heavy_program(calls: int) -> str:
+    lines = ["public int step(int a) {", "    return a + 1;", "}",
+             "public int step(int a, int b) {", "    return a + b;", "}",
+             "public int step(int a, int b, int c) {", "    return a + b + c;", "}",
+             "public void main() {", "    var x = 0;"]
+    for i in range(calls):
+        lines.append(i % 2 == 0 and "    x = step(x);" or "    x = step(x, 2);")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def compile_program(dir_path: str):
+    # Unoptimized, so that the calls are still in the IR
+    testargs = ['prog', '--workdir', dir_path, '--disable-opt', '--print-ir', '--disable-cache']
+    with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+        start()
+
+    with open(os.path.join(dir_path, "output", "main.ll"), "r") as ir:
+        return ir.read()
+
+
+class TestOverloadResolverBenchmark(unittest.TestCase):
+    dir_path: str
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestOverloadResolverBenchmark).setUpClass()
+        cls.dir_path = tempfile.mkdtemp()
+        shutil.rmtree(cls.dir_path)
+        os.makedirs(os.path.join(cls.dir_path, "src"))
+        with open(os.path.join(cls.dir_path, "src", "main.rial"), "w") as file:
+            file.write(generate_call_heavy_program(CALL_COUNT))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    @pytest.mark.benchmark(group="overload-lookup")
+    def test_resolve(self):
+        module = RIALModule("main", ir.Context())
+        candidates = [declare(module, "step", ["Int32"] * i) for i in range(OVERLOAD_COUNT)]
+        arguments = [argument("Int32")] * (OVERLOAD_COUNT // 2)
+
+        def resolve():
+            for _ in range(CALL_COUNT):
+                OverloadResolver.resolve(candidates, arguments)
+
+        self.benchmark(resolve)
+
+    @pytest.mark.benchmark(group="overload-lookup")
+    def test_resolve_cached(self):
+        module = RIALModule("main", ir.Context())
+        candidates = [declare(module, "step", ["Int32"] * i) for i in range(OVERLOAD_COUNT)]
+        arguments = [argument("Int32")] * (OVERLOAD_COUNT // 2)
+        key = OverloadResolver.get_call_key(module, ["step"], arguments, None)
+        OverloadResolver.store(key, OverloadResolver.resolve(candidates, arguments))
+
+        def resolve():
+            for _ in range(CALL_COUNT):
+                OverloadResolver.lookup(OverloadResolver.get_call_key(module, ["step"], arguments, None))
+
+        self.benchmark(resolve)
+        self.assertIs(OverloadResolver.lookup(key), candidates[OVERLOAD_COUNT // 2])
+
+    @pytest.mark.benchmark(group="overload-resolution", min_rounds=1)
+    def test_compile_calls_cached(self):
+        content = self.benchmark.pedantic(compile_program, args=(self.dir_path,), rounds=1)
+        self.assertEqual(content.count("call fastcc i32 @mangled_step."), CALL_COUNT)
+
+    @pytest.mark.benchmark(group="overload-resolution", min_rounds=1)
+    def test_compile_calls_uncached(self):
+        with patch.object(OverloadResolver, "lookup", return_value=None):
+            content = self.benchmark.pedantic(compile_program, args=(self.dir_path,), rounds=1)
+        self.assertEqual(content.count("call fastcc i32 @mangled_step."), CALL_COUNT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+from rial.backend.parallel_backend import compile_modules, run_job
+from rial.codegen import CodeGen
+from tests.test_parallel_backend import create_jobs
+
+MODULE_COUNT = 32
+OPT_LEVEL = "3"
+
+
+class TestParallelBackendBenchmark(unittest.TestCase):
+    """
+    Optimizes and emits the objects of 32 modules in-process and with 1..N worker processes.
+    The single worker shows the overhead of the pool compared to compiling in-process.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.jobs = create_jobs(self.directory, MODULE_COUNT)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def compile_in_process(self):
+        codegen = CodeGen(OPT_LEVEL, False)
+        for job in self.jobs:
+            run_job(codegen, job)
+
+    def compile_with_workers(self, workers: int):
+        results = self.benchmark.pedantic(compile_modules, args=(self.jobs, workers, OPT_LEVEL, False), rounds=3)
+        self.assertEqual(len(results), MODULE_COUNT)
+        self.assertTrue(all(result.error is None for result in results.values()))
+
+    @pytest.mark.benchmark(group="backend-32-modules", min_rounds=1)
+    def test_in_process(self):
+        self.benchmark.pedantic(self.compile_in_process, rounds=3)
+
+    @pytest.mark.benchmark(group="backend-32-modules", min_rounds=1)
+    def test_1_worker(self):
+        self.compile_with_workers(1)
+
+    @pytest.mark.skipif(multiprocessing.cpu_count() < 2, reason="Needs 2 cores")
+    @pytest.mark.benchmark(group="backend-32-modules", min_rounds=1)
+    def test_2_workers(self):
+        self.compile_with_workers(2)
+
+    @pytest.mark.skipif(multiprocessing.cpu_count() < 4, reason="Needs 4 cores")
+    @pytest.mark.benchmark(group="backend-32-modules", min_rounds=1)
+    def test_4_workers(self):
+        self.compile_with_workers(4)
+
+    @pytest.mark.skipif(multiprocessing.cpu_count() <= 4, reason="Covered by the fixed worker counts")
+    @pytest.mark.benchmark(group="backend-32-modules", min_rounds=1)
+    def test_all_cores(self):
+        self.compile_with_workers(multiprocessing.cpu_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
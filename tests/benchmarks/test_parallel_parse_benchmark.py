@@ -0,0 +1,97 @@
+import multiprocessing
+import unittest
+
+import pytest
+
+from rial.concept.parser import Lark_StandAlone
+from rial.parsing.module_discovery import DiscoveredModule, scan_imports
+from rial.parsing.parallel_parser import parse_modules
+from rial.parsing.tree_serializer import load_tree
+from rial.transformer.Postlexer import Postlexer
+
+PROJECT_NAME = "bench"
+TARGET_TRIPLE = "x86_64-unknown-linux-gnu"
+MODULE_COUNT = 200
+FUNCTIONS_PER_MODULE = 5
+
+
+def generate_module(index: int) -> str:
+    lines = list()
+    if index > 0:
+        lines.append(f"const previous = use {PROJECT_NAME}:mod_{index - 1};")
+    lines.append("private external void printf(CString format, params CString args);")
+    lines.append("")
+    lines.append(f"public struct Point{index} {{")
+    lines.append("    public int x;")
+    lines.append("    public int y;")
+    lines.append("}")
+
+    for function in range(FUNCTIONS_PER_MODULE):
+        lines.append(f"public int calculate_{index}_{function}(int a, int b) {{")
+        lines.append("    var total = 0;")
+        lines.append("    for(var i = 0; i < a; i++) {")
+        lines.append("        if (((i + b) % 3) == 0) {")
+        lines.append(f"            total = total + i * {function} - b;")
+        lines.append("        } else {")
+        lines.append("            total = total - 1;")
+        lines.append("        }")
+        lines.append("    }")
+        lines.append("    unsafe {")
+        lines.append('        printf("%i\\n", total);')
+        lines.append("    }")
+        lines.append("    return total;")
+        lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_project():
+    modules = list()
+    for index in range(MODULE_COUNT):
+        contents = generate_module(index)
+        modules.append(DiscoveredModule(f"{PROJECT_NAME}:mod_{index}", f"/src/mod_{index}.rial", contents,
+                                        scan_imports(contents, PROJECT_NAME)))
+    return modules
+
+
+def parse_sequentially(modules):
+    parser = Lark_StandAlone(postlex=Postlexer(PROJECT_NAME, TARGET_TRIPLE))
+    return {module.path: parser.parse(module.contents) for module in modules}
+
+
+def parse_in_parallel(modules, workers: int = multiprocessing.cpu_count()):
+    results = parse_modules(modules, workers, PROJECT_NAME, TARGET_TRIPLE)
+    return {path: load_tree(data) for path, (data, _) in results.items()}
+
+
+class TestParallelParseBenchmark(unittest.TestCase):
+    modules = generate_project()
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def test_discovery_finds_imports(self):
+        self.assertEqual(self.modules[0].imports, [])
+        self.assertEqual(self.modules[1].imports, [f"{PROJECT_NAME}:mod_0"])
+
+    @pytest.mark.benchmark(group="parse-200-modules", min_rounds=1)
+    def test_parse_sequential(self):
+        trees = self.benchmark.pedantic(parse_sequentially, args=(self.modules,), rounds=3)
+        self.assertEqual(len(trees), MODULE_COUNT)
+
+    @pytest.mark.skipif(multiprocessing.cpu_count() < 2, reason="Needs more than one core to show a speedup")
+    @pytest.mark.benchmark(group="parse-200-modules", min_rounds=1)
+    def test_parse_parallel(self):
+        trees = self.benchmark.pedantic(parse_in_parallel, args=(self.modules,), rounds=3)
+        self.assertEqual(len(trees), MODULE_COUNT)
+
+    def test_parallel_trees_match_sequential(self):
+        modules = self.modules[:8]
+        trees = parse_in_parallel(modules, 2)
+        for path, tree in parse_sequentially(modules).items():
+            self.assertEqual(trees[path], tree)
+
+
+if __name__ == '__main__':
+    unittest.main()
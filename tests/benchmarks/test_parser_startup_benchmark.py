@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import pytest
+
+ROOT = os.path.abspath("/".join(f"{__file__}".split('/')[0:-3]))
+
+# Each round runs in a fresh interpreter, otherwise the regex cache of the first round hides most of the cost
+STANDALONE = "from rial.concept.parser import Lark_StandAlone; Lark_StandAlone().parse('public void main(){}')"
+MAPPED = "from rial.parsing.parse_tables import load_parser; load_parser().parse('public void main(){}')"
+
+
+def run_in_fresh_interpreter(code: str):
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, env=dict(os.environ, PYTHONPATH=ROOT))
+
+
+class TestParserStartupBenchmark(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @pytest.mark.benchmark(group="parser-startup", min_rounds=5)
+    def test_standalone_startup(self):
+        self.benchmark(run_in_fresh_interpreter, STANDALONE)
+
+    @pytest.mark.benchmark(group="parser-startup", min_rounds=5)
+    def test_mapped_startup(self):
+        self.benchmark(run_in_fresh_interpreter, MAPPED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import pytest
+from llvmlite import ir
+
+from rial.ir.PreludeTable import PreludeTable
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+
+FUNCTIONS_PER_MODULE = 50
+LOOKUPS = 1000
+
+
+def create_builtin_modules(count: int):
+    context = ir.Context()
+    modules = list()
+    for i in range(count):
+        module = RIALModule(f"rial:builtin:module{i}", context)
+        for j in range(FUNCTIONS_PER_MODULE):
+            RIALFunction(module, ir.FunctionType(ir.VoidType(), []), f"func{i}_{j}", f"func{i}_{j}")
+        modules.append(module)
+    return modules
+
+
+def search_modules(modules, name: str):
+    # What every lookup that reached the always imported modules did before the prelude table
+    for module in modules:
+        variable = module.get_definition([name])
+        if variable is not None:
+            return variable
+    return None
+
+
+class TestPreludeBenchmark(unittest.TestCase):
+    """
+    Looks up a name that no builtin module defines, the cost should not grow with the number of modules.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def _benchmark_prelude(self, count: int):
+        prelude = PreludeTable(create_builtin_modules(count))
+
+        def lookup():
+            for _ in range(LOOKUPS):
+                prelude.lookup("missing")
+
+        self.benchmark(lookup)
+        self.assertIsNone(prelude.lookup("missing"))
+
+    def _benchmark_search(self, count: int):
+        modules = create_builtin_modules(count)
+
+        def lookup():
+            for _ in range(LOOKUPS):
+                search_modules(modules, "missing")
+
+        self.benchmark.pedantic(lookup, rounds=3)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_prelude_1_module(self):
+        self._benchmark_prelude(1)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_prelude_8_modules(self):
+        self._benchmark_prelude(8)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_prelude_64_modules(self):
+        self._benchmark_prelude(64)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_search_1_module(self):
+        self._benchmark_search(1)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_search_8_modules(self):
+        self._benchmark_search(8)
+
+    @pytest.mark.benchmark(group="prelude-lookup")
+    def test_search_64_modules(self):
+        self._benchmark_search(64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import pytest
+from llvmlite import ir
+
+from rial.ir.IRBuilder import IRBuilder
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALVariable import RIALVariable
+
+NESTING_DEPTH = 5000
+LOOKUPS = 1000
+
+
+def build_nested_blocks(module: RIALModule):
+    """
+    Nests blocks the same way loops and conditionals do: a body as child and the code after it as sibling.
+    Every level declares its own variable and all lookups happen in the innermost block.
+    """
+    func = RIALFunction(module, ir.FunctionType(ir.VoidType(), []), "nested", "nested")
+    entry = func.append_basic_block("entry")
+    module.builder = IRBuilder(entry)
+    module.current_block = entry
+    module.current_block.add_named_value("outer", RIALVariable("outer", "Int32", ir.IntType(32), None))
+
+    for i in range(NESTING_DEPTH):
+        current = module.current_block
+        body = module.builder.create_block(f"body{i}", parent=current)
+        module.builder.create_block(f"end{i}", sibling=current)
+        module.builder.enter_block(body)
+        module.current_block.add_named_value(f"v{i}", RIALVariable(f"v{i}", "Int32", ir.IntType(32), None))
+
+
+class TestScopeTableBenchmark(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def test_build_nested_blocks(self):
+        module = RIALModule("scope_benchmark", ir.Context())
+        self.benchmark.pedantic(build_nested_blocks, args=(module,), rounds=1)
+        self.assertEqual(len(module.scope_table.frames), NESTING_DEPTH + 1)
+
+    @pytest.mark.benchmark(group="scope-lookup")
+    def test_scope_table_lookup(self):
+        module = RIALModule("scope_benchmark", ir.Context())
+        build_nested_blocks(module)
+
+        def lookup():
+            for _ in range(LOOKUPS):
+                module.scope_table.lookup("outer")
+
+        self.benchmark(lookup)
+        self.assertIsNotNone(module.scope_table.lookup("outer"))
+
+    @pytest.mark.benchmark(group="scope-lookup")
+    def test_block_chain_lookup(self):
+        module = RIALModule("scope_benchmark", ir.Context())
+        build_nested_blocks(module)
+        block = module.current_block
+
+        def lookup():
+            for _ in range(LOOKUPS):
+                block.get_named_value("outer")
+
+        self.benchmark.pedantic(lookup, rounds=3)
+        self.assertIs(block.get_named_value("outer"), module.scope_table.lookup("outer"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import Tuple
+
+import pytest
+
+EXAMPLES_PATH = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-2])), "..", "examples")
+REPOSITORY_PATH = os.path.abspath(os.path.join(EXAMPLES_PATH, ".."))
+
+
+def start_until_output(args, stdin: bytes = b"") -> Tuple[bytes, subprocess.Popen]:
+    """
+    Starts :args: and returns as soon as it wrote something to stdout, along with the still running process.
+    """
+    env = dict(os.environ, PYTHONPATH=REPOSITORY_PATH)
+    process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               env=env)
+    process.stdin.write(stdin)
+    process.stdin.close()
+
+    return process.stdout.read(1), process
+
+
+def finish(process: subprocess.Popen):
+    process.stdout.read()
+    process.stdout.close()
+    process.wait()
+
+
+class TestTimeToFirstOutputBenchmark(unittest.TestCase):
+    """
+    Time from invoking the compiler until the program prints something,
+    running main in-process compared to building, linking and starting the executable.
+    """
+    workdir: str
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self) -> None:
+        self.workdir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.workdir)
+
+    def copy_example(self, name: str) -> str:
+        path = os.path.join(self.workdir, name)
+        shutil.copytree(os.path.join(EXAMPLES_PATH, name, "src"), os.path.join(path, "src"))
+        return path
+
+    def compiler(self, path: str, *args):
+        return [sys.executable, "-m", "rial.main", "--workdir", path, *args]
+
+    def benchmark_first_output(self, target, *args) -> bytes:
+        """
+        Measures :target: until it returns the first output of the process it started.
+        The rest of the output is read before the next round and after the last one, outside of the measured time.
+        """
+        processes = list()
+
+        def until_output():
+            output, process = target(*args)
+            processes.append(process)
+            return output
+
+        def finish_processes():
+            while len(processes) > 0:
+                finish(processes.pop())
+
+        try:
+            return self.benchmark.pedantic(until_output, setup=finish_processes, rounds=3)
+        finally:
+            finish_processes()
+
+    def run_in_process(self, name: str, stdin: bytes = b""):
+        path = self.copy_example(name)
+        output = self.benchmark_first_output(start_until_output, self.compiler(path, "--run"), stdin)
+        self.assertNotEqual(output, b"")
+
+    def build_and_run(self, name: str, stdin: bytes = b""):
+        path = self.copy_example(name)
+
+        def build_and_start():
+            subprocess.run(self.compiler(path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           env=dict(os.environ, PYTHONPATH=REPOSITORY_PATH))
+            return start_until_output([os.path.join(path, "bin", name)], stdin)
+
+        output = self.benchmark_first_output(build_and_start)
+        self.assertNotEqual(output, b"")
+
+    @pytest.mark.benchmark(group="first-output-hello-world", min_rounds=1)
+    def test_hello_world_run(self):
+        self.run_in_process("hello-world")
+
+    @pytest.mark.benchmark(group="first-output-hello-world", min_rounds=1)
+    def test_hello_world_build(self):
+        self.build_and_run("hello-world")
+
+    @pytest.mark.benchmark(group="first-output-fibonacci", min_rounds=1)
+    def test_fibonacci_run(self):
+        self.run_in_process("fibonacci", b"15\n")
+
+    @pytest.mark.benchmark(group="first-output-fibonacci", min_rounds=1)
+    def test_fibonacci_build(self):
+        self.build_and_run("fibonacci", b"15\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
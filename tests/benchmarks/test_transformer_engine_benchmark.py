@@ -0,0 +1,110 @@
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from rial.concept.Transformer import Transformer
+from rial.concept.TransformerInterpreter import TransformerInterpreter
+from rial.main import DEFAULT_OPTIONS, start
+from rial.parsing.parse_tables import load_parser
+from rial.transformer.Postlexer import Postlexer
+
+PROJECT_NAME = "bench"
+TARGET_TRIPLE = "x86_64-unknown-linux-gnu"
+NESTING_DEPTH = 1000
+CHAIN_LENGTH = 5000
+
+
+def generate_nested_program(depth: int) -> str:
+    lines = ["public void main() {", "    var x = 0;"]
+    lines.extend(f"if (x < {i + 1}) {{" for i in range(depth))
+    lines.append("x = x + 1;")
+    lines.extend("} else { x = x - 1; }" for _ in range(depth))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_long_program(length: int) -> str:
+    lines = ["public void main() {", "    var x = 1;", f"    var y = {' + '.join(['x'] * length)};", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def compile_program(dir_path: str):
+    testargs = ['prog', '--workdir', dir_path, '--opt-level', '0', '--print-ir', '--disable-cache']
+    with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+        start()
+
+    with open(os.path.join(dir_path, "output", "main.ll"), "r") as ir:
+        return ir.read()
+
+
+class TestTransformerEngineBenchmark(unittest.TestCase):
+    dir_path: str
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestTransformerEngineBenchmark).setUpClass()
+        cls.dir_path = tempfile.mkdtemp()
+        parser = load_parser(Postlexer(PROJECT_NAME, TARGET_TRIPLE))
+        cls.nested = generate_nested_program(NESTING_DEPTH)
+        cls.long = generate_long_program(CHAIN_LENGTH)
+        cls.nested_tree = parser.parse(cls.nested)
+        cls.long_tree = parser.parse(cls.long)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def write_program(self, contents: str):
+        shutil.rmtree(self.dir_path)
+        os.makedirs(os.path.join(self.dir_path, "src"))
+        with open(os.path.join(self.dir_path, "src", "main.rial"), "w") as file:
+            file.write(contents)
+
+    @pytest.mark.benchmark(group="transformer-engine")
+    def test_interpreter_nested(self):
+        self.benchmark(TransformerInterpreter().visit, self.nested_tree)
+
+    @pytest.mark.benchmark(group="transformer-engine")
+    def test_interpreter_long(self):
+        self.benchmark(TransformerInterpreter().visit, self.long_tree)
+
+    @pytest.mark.benchmark(group="transformer-engine")
+    def test_transformer_nested(self):
+        result = self.benchmark(Transformer().transform, self.nested_tree)
+        self.assertIsNotNone(result)
+
+    @pytest.mark.benchmark(group="transformer-engine")
+    def test_transformer_long(self):
+        result = self.benchmark(Transformer().transform, self.long_tree)
+        self.assertIsNotNone(result)
+
+    @pytest.mark.benchmark(group="compile-generated", min_rounds=1)
+    def test_compile_nested(self):
+        self.write_program(self.nested)
+        content = self.benchmark.pedantic(compile_program, args=(self.dir_path,), rounds=1)
+        self.assertEqual(content.count("icmp"), NESTING_DEPTH)
+
+        # Newer LLVM versions truncate long names, nested labels mustn't grow with the depth
+        labels = re.findall(r"^([\w.]+):", content, re.MULTILINE)
+        self.assertEqual(len(labels), len(set(labels)))
+        self.assertLess(max(len(label) for label in labels), 64)
+
+    @pytest.mark.benchmark(group="compile-generated", min_rounds=1)
+    def test_compile_long(self):
+        self.write_program(self.long)
+        content = self.benchmark.pedantic(compile_program, args=(self.dir_path,), rounds=1)
+        self.assertEqual(content.count("add i32"), CHAIN_LENGTH - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
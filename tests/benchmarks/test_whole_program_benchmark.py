@@ -0,0 +1,65 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+import pytest
+
+from rial.main import DEFAULT_OPTIONS, start
+
+EXAMPLE_PATH = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-2])), "..", "examples",
+                            "fibonacci-benchmark")
+
+
+class TestWholeProgramBenchmark(unittest.TestCase):
+    """
+    Builds and runs examples/fibonacci-benchmark with every module optimized on its own
+    and with all modules linked and optimized as one.
+    """
+    workdir: str
+
+    @pytest.fixture(autouse=True)
+    def setupBenchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    def setUp(self) -> None:
+        self.workdir = os.path.join(tempfile.mkdtemp(), "fibonacci-benchmark")
+        shutil.copytree(os.path.join(EXAMPLE_PATH, "src"), os.path.join(self.workdir, "src"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.workdir))
+
+    def build(self, *args):
+        testargs = ['prog', '--workdir', self.workdir, '--disable-cache', '--release', *args]
+        with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+            start()
+
+    def run_executable(self):
+        return subprocess.run([os.path.join(self.workdir, "bin", "fibonacci-benchmark")],
+                              stdout=subprocess.PIPE).stdout
+
+    @pytest.mark.benchmark(group="fibonacci-benchmark-build", min_rounds=1)
+    def test_build_per_module(self):
+        self.benchmark.pedantic(self.build, rounds=3)
+
+    @pytest.mark.benchmark(group="fibonacci-benchmark-build", min_rounds=1)
+    def test_build_whole_program(self):
+        self.benchmark.pedantic(self.build, args=('--whole-program',), rounds=3)
+
+    @pytest.mark.benchmark(group="fibonacci-benchmark-run", min_rounds=1)
+    def test_run_per_module(self):
+        self.build()
+        self.assertEqual(self.benchmark.pedantic(self.run_executable, rounds=1), b"2971215073 \n")
+
+    @pytest.mark.benchmark(group="fibonacci-benchmark-run", min_rounds=1)
+    def test_run_whole_program(self):
+        self.build('--whole-program')
+        self.assertEqual(self.benchmark.pedantic(self.run_executable, rounds=1), b"2971215073 \n")
+
+
+if __name__ == '__main__':
+    unittest.main()
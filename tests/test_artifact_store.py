@@ -0,0 +1,147 @@
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from unittest.mock import patch
+
+from rial.ArtifactStore import ArtifactStore
+from rial.main import start
+from rial.profiling import set_profiling, counters
+
+
+class TestArtifactStore(unittest.TestCase):
+    cache_path: Path
+
+    def setUp(self) -> None:
+        self.cache_path = Path(tempfile.mkdtemp()).joinpath("cache")
+        ArtifactStore.init(self.cache_path, False, 1)
+
+    def tearDown(self) -> None:
+        ArtifactStore.close()
+        shutil.rmtree(self.cache_path.parent)
+
+    def test_put_and_get(self):
+        self.assertIsNone(ArtifactStore.get("key", ".o"))
+        ArtifactStore.put("key", ".o", b"object")
+        ArtifactStore.put("key", ".bc", b"bitcode")
+
+        self.assertEqual(ArtifactStore.get("key", ".o"), b"object")
+        self.assertEqual(ArtifactStore.get("key", ".bc"), b"bitcode")
+        self.assertIsNone(ArtifactStore.get(None, ".o"))
+
+        ArtifactStore.put("key", ".o", b"replaced")
+        self.assertEqual(ArtifactStore.get("key", ".o"), b"replaced")
+        self.assertEqual(ArtifactStore.stats(), {".bc": (1, 7), ".o": (1, 8)})
+
+    def test_restore_and_store(self):
+        dest = str(self.cache_path.parent.joinpath("output", "main.o"))
+        set_profiling(True)
+        try:
+            counters.clear()
+            self.assertFalse(ArtifactStore.restore("key", ".o", dest))
+
+            ArtifactStore.put("key", ".o", b"object")
+            self.assertTrue(ArtifactStore.restore("key", ".o", dest))
+
+            with open(dest, "rb") as file:
+                self.assertEqual(file.read(), b"object")
+
+            ArtifactStore.store("other", ".o", dest)
+            self.assertEqual(ArtifactStore.get("other", ".o"), b"object")
+
+            self.assertEqual(counters["ARTIFACT_CACHE_HITS"], 1)
+            self.assertEqual(counters["ARTIFACT_CACHE_MISSES"], 1)
+        finally:
+            set_profiling(False)
+            counters.clear()
+
+    def test_persistent(self):
+        ArtifactStore.put("key", ".o", b"object")
+        ArtifactStore.close()
+        ArtifactStore.init(self.cache_path, False, 1)
+
+        self.assertEqual(ArtifactStore.get("key", ".o"), b"object")
+
+    def test_disabled(self):
+        ArtifactStore.init(self.cache_path, True)
+        ArtifactStore.put("key", ".o", b"object")
+
+        self.assertIsNone(ArtifactStore.get("key", ".o"))
+        self.assertEqual(ArtifactStore.stats(), dict())
+
+    def test_concurrent_reader(self):
+        ArtifactStore.put("key", ".o", b"object")
+
+        reader = sqlite3.connect(str(ArtifactStore.store_path))
+        try:
+            self.assertEqual(reader.execute("SELECT data FROM artifacts WHERE key = 'key'").fetchone()[0], b"object")
+        finally:
+            reader.close()
+
+    def test_gc_evicts_least_recently_used(self):
+        for key in ("first", "second", "third"):
+            ArtifactStore.put(key, ".o", bytes(400 * 1024))
+            time.sleep(0.01)
+
+        # Reading marks an entry as used once the store is closed
+        ArtifactStore.get("first", ".o")
+        ArtifactStore.close()
+        ArtifactStore.init(self.cache_path, False, 1)
+
+        self.assertIsNotNone(ArtifactStore.get("first", ".o"))
+        self.assertIsNone(ArtifactStore.get("second", ".o"))
+        self.assertIsNotNone(ArtifactStore.get("third", ".o"))
+
+        self.assertEqual(ArtifactStore.gc(500 * 1024), (1, 400 * 1024))
+        self.assertEqual(ArtifactStore.stats(), {".o": (1, 400 * 1024)})
+
+    def test_clear(self):
+        ArtifactStore.put("key", ".o", b"object")
+        self.assertEqual(ArtifactStore.clear(), (1, 6))
+        self.assertEqual(ArtifactStore.stats(), dict())
+
+    def test_old_schema_is_dropped(self):
+        ArtifactStore.put("key", ".o", b"object")
+        ArtifactStore.close()
+
+        connection = sqlite3.connect(str(self.cache_path.joinpath("artifacts.db")))
+        connection.execute("PRAGMA user_version=0")
+        connection.close()
+
+        ArtifactStore.init(self.cache_path, False, 1)
+        self.assertIsNone(ArtifactStore.get("key", ".o"))
+
+    def run_cache_command(self, *args) -> str:
+        ArtifactStore.close()
+        output = io.StringIO()
+
+        with patch.object(sys, 'argv', ['prog', 'cache', *args, '--workdir', str(self.cache_path.parent)]), \
+                redirect_stdout(output):
+            start()
+
+        return output.getvalue()
+
+    def test_cache_command(self):
+        ArtifactStore.put("key", ".o", bytes(2048))
+        self.cache_path.joinpath("parse").mkdir()
+        self.cache_path.joinpath("parse", "tree.tree").write_bytes(bytes(1024))
+        self.cache_path.joinpath("index.json").write_text("{}")
+
+        self.assertEqual(self.run_cache_command("stats"), "1 entries, 2.0 KiB of 512.0 MiB\n"
+                                                          "    .o: 1 entries, 2.0 KiB\n"
+                                                          "1 parse trees, 1.0 KiB\n")
+        self.assertEqual(self.run_cache_command("gc", "--cache-max-size", "0"), "Evicted 1 entries, 2.0 KiB\n")
+        self.assertEqual(self.run_cache_command("clear"), "Removed 0 entries, 0.0 KiB\n")
+        self.assertEqual([path for path in os.listdir(str(self.cache_path)) if not path.startswith("artifacts.db")],
+                         [])
+
+
+if __name__ == '__main__':
+    unittest.main()
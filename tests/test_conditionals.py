@@ -0,0 +1,119 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from rial.linking.linker import Linker
+from rial.main import DEFAULT_OPTIONS, start
+
+
+class TestConditionals(unittest.TestCase):
+    dir_path: str
+
+    def setUp(self) -> None:
+        self.dir_path = os.path.join(tempfile.mkdtemp(), "TestConditionals")
+        os.makedirs(os.path.join(self.dir_path, "src"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.dir_path))
+
+    def run_main(self, body: str) -> bytes:
+        with open(os.path.join(self.dir_path, "src", "main.rial"), "w") as file:
+            file.write("unsafe {\n")
+            file.write("\texternal void printf(CString format, params CString arg);\n")
+            file.write("}\n")
+            file.write(body)
+
+        testargs = ['prog', '--workdir', self.dir_path, '--disable-cache', '--run']
+
+        # main writes to the C stdout, so the file descriptor has to be redirected
+        with tempfile.TemporaryFile() as output:
+            stdout = os.dup(1)
+            sys.stdout.flush()
+            os.dup2(output.fileno(), 1)
+            try:
+                with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']), \
+                        patch.object(Linker, "link_files"):
+                    start()
+            finally:
+                sys.stdout.flush()
+                os.dup2(stdout, 1)
+                os.close(stdout)
+
+            output.seek(0)
+            return output.read()
+
+    def test_else(self):
+        self.assertEqual(self.run_main("public void print_sign(int x) {\n"
+                                       "\tif (x < 0) {\n"
+                                       "\t\tunsafe {\n"
+                                       '\t\t\tprintf("negative\\n");\n'
+                                       "\t\t}\n"
+                                       "\t} else {\n"
+                                       "\t\tunsafe {\n"
+                                       '\t\t\tprintf("positive\\n");\n'
+                                       "\t\t}\n"
+                                       "\t}\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tprint_sign(0 - 1);\n"
+                                       "\tprint_sign(1);\n"
+                                       "}\n"), b"negative\npositive\n")
+
+    def test_elif(self):
+        self.assertEqual(self.run_main("public void print_sign(int x) {\n"
+                                       "\tvar sign = 0;\n"
+                                       "\tif (x < 0) {\n"
+                                       "\t\tsign = 0 - 1;\n"
+                                       "\t} elif (x == 0) {\n"
+                                       "\t\tsign = 0;\n"
+                                       "\t} elif (x < 10) {\n"
+                                       "\t\tsign = 1;\n"
+                                       "\t} else {\n"
+                                       "\t\tsign = 10;\n"
+                                       "\t}\n"
+                                       "\tunsafe {\n"
+                                       '\t\tprintf("%i\\n", sign);\n'
+                                       "\t}\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tprint_sign(0 - 5);\n"
+                                       "\tprint_sign(0);\n"
+                                       "\tprint_sign(5);\n"
+                                       "\tprint_sign(50);\n"
+                                       "}\n"), b"-1\n0\n1\n10\n")
+
+    def test_nested_else_with_return(self):
+        self.assertEqual(self.run_main("public void print_range(int x) {\n"
+                                       "\tif (x < 10) {\n"
+                                       "\t\tif (x < 5) {\n"
+                                       "\t\t\tunsafe {\n"
+                                       '\t\t\t\tprintf("small\\n");\n'
+                                       "\t\t\t}\n"
+                                       "\t\t\treturn;\n"
+                                       "\t\t} else {\n"
+                                       "\t\t\tunsafe {\n"
+                                       '\t\t\t\tprintf("medium\\n");\n'
+                                       "\t\t\t}\n"
+                                       "\t\t}\n"
+                                       "\t} else {\n"
+                                       "\t\tunsafe {\n"
+                                       '\t\t\tprintf("large\\n");\n'
+                                       "\t\t}\n"
+                                       "\t}\n"
+                                       "\tunsafe {\n"
+                                       '\t\tprintf("done\\n");\n'
+                                       "\t}\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tprint_range(1);\n"
+                                       "\tprint_range(7);\n"
+                                       "\tprint_range(20);\n"
+                                       "}\n"), b"small\nmedium\ndone\nlarge\ndone\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
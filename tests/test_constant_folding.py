@@ -0,0 +1,183 @@
+import math
+import os
+import shutil
+import sys
+import unittest
+
+from unittest.mock import patch
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.constant_folding import fold_cast, fold_comparison, fold_math
+from rial.main import DEFAULT_OPTIONS, start
+
+Int8 = ir.IntType(8)
+Int32 = ir.IntType(32)
+Int64 = ir.IntType(64)
+UInt8 = LLVMUIntType(8)
+UInt32 = LLVMUIntType(32)
+
+
+class TestConstantFolding(unittest.TestCase):
+    def fold(self, op, ty, left, right):
+        folded = fold_math(op, ty, ir.Constant(ty, left), ir.Constant(ty, right))
+        return folded.constant if folded is not None else None
+
+    def test_integer_math(self):
+        self.assertEqual(self.fold("PLUS", Int32, 5, 5), 10)
+        self.assertEqual(self.fold("MINUS", Int32, 5, 7), -2)
+        self.assertEqual(self.fold("MUL", Int32, -6, 7), -42)
+        self.assertEqual(fold_math("MINUS", Int32, ir.Constant(Int32, 5), ir.Constant(Int32, 5)).constant, 0)
+
+    def test_signed_wraparound(self):
+        self.assertEqual(self.fold("PLUS", Int32, 2 ** 31 - 1, 1), -2 ** 31)
+        self.assertEqual(self.fold("MINUS", Int32, -2 ** 31, 1), 2 ** 31 - 1)
+        self.assertEqual(self.fold("MUL", Int8, 16, 16), 0)
+        self.assertEqual(self.fold("MUL", Int8, 100, 3), 44)
+        self.assertEqual(self.fold("PLUS", Int64, 2 ** 63 - 1, 2 ** 63 - 1), -2)
+
+    def test_signed_division(self):
+        # Truncates towards zero, the remainder takes the sign of the dividend
+        self.assertEqual(self.fold("DIV", Int32, 7, -2), -3)
+        self.assertEqual(self.fold("DIV", Int32, -7, 2), -3)
+        self.assertEqual(self.fold("DIV", Int32, -7, -2), 3)
+        self.assertEqual(self.fold("REM", Int32, -7, 2), -1)
+        self.assertEqual(self.fold("REM", Int32, 7, -2), 1)
+
+    def test_undefined_division_is_not_folded(self):
+        self.assertIsNone(fold_math("DIV", Int32, ir.Constant(Int32, 5), ir.Constant(Int32, 0)))
+        self.assertIsNone(fold_math("REM", UInt32, ir.Constant(UInt32, 5), ir.Constant(UInt32, 0)))
+        self.assertIsNone(fold_math("DIV", Int32, ir.Constant(Int32, -2 ** 31), ir.Constant(Int32, -1)))
+        self.assertIsNone(fold_math("REM", Int8, ir.Constant(Int8, -128), ir.Constant(Int8, -1)))
+
+    def test_unsigned_math(self):
+        self.assertEqual(self.fold("MINUS", UInt32, 3, 5), 2 ** 32 - 2)
+        self.assertEqual(self.fold("PLUS", UInt8, 255, 1), 0)
+        # The bits of -1 read as unsigned
+        self.assertEqual(self.fold("DIV", UInt8, -1, 2), 127)
+        self.assertEqual(self.fold("REM", UInt32, 2 ** 32 - 1, 10), 5)
+        self.assertIsInstance(fold_math("PLUS", UInt8, ir.Constant(UInt8, 1), ir.Constant(UInt8, 1)).type,
+                              LLVMUIntType)
+
+    def test_float_math(self):
+        self.assertEqual(self.fold("MUL", ir.DoubleType(), 2.5, 4.0), 10.0)
+        self.assertEqual(self.fold("DIV", ir.DoubleType(), 1.0, 4.0), 0.25)
+        self.assertEqual(self.fold("REM", ir.DoubleType(), -7.5, 2.0), -1.5)
+        self.assertIsNone(fold_math("DIV", ir.DoubleType(), ir.DoubleType()(1.0), ir.DoubleType()(0.0)))
+
+        # Single precision rounds every operand and result
+        folded = fold_math("PLUS", ir.FloatType(), ir.FloatType()(0.1), ir.FloatType()(0.2))
+        self.assertEqual(folded.constant, 0.30000001192092896)
+        self.assertIsNone(fold_math("MUL", ir.FloatType(), ir.FloatType()(1e30), ir.FloatType()(1e30)))
+
+    def test_non_constants_are_not_folded(self):
+        module = ir.Module()
+        func = ir.Function(module, ir.FunctionType(ir.VoidType(), [Int32]), "func")
+
+        self.assertIsNone(fold_math("PLUS", Int32, func.args[0], ir.Constant(Int32, 1)))
+        self.assertIsNone(fold_comparison("==", Int32, ir.Constant(Int32, 1), func.args[0]))
+        self.assertIsNone(fold_cast("sext", func.args[0], Int64))
+
+    def test_comparisons(self):
+        def compare(comparison, ty, left, right):
+            return fold_comparison(comparison, ty, ir.Constant(ty, left), ir.Constant(ty, right)).constant
+
+        self.assertIs(compare("<", Int32, 5, 6), True)
+        self.assertIs(compare(">=", Int32, 5, 6), False)
+        self.assertIs(compare("==", Int32, -1, 2 ** 32 - 1), True)
+        self.assertIs(compare("<", Int8, -1, 1), True)
+        self.assertIs(compare("<", UInt8, -1, 1), False)
+        self.assertIs(compare("!=", ir.DoubleType(), 1.0, 2.0), True)
+        self.assertIs(compare("!=", ir.DoubleType(), math.nan, 2.0), False)
+        self.assertIs(compare("==", ir.DoubleType(), math.nan, math.nan), False)
+        self.assertEqual(fold_comparison("<", Int32, ir.Constant(Int32, 1), ir.Constant(Int32, 2)).type,
+                         ir.IntType(1))
+
+    def test_integer_casts(self):
+        self.assertEqual(fold_cast("sext", ir.Constant(Int8, -1), Int32).constant, -1)
+        self.assertEqual(fold_cast("zext", ir.Constant(UInt8, -1), UInt32).constant, 255)
+        self.assertEqual(fold_cast("zext", ir.Constant(UInt8, 200), Int32).constant, 200)
+        self.assertEqual(fold_cast("trunc", ir.Constant(Int32, 300), Int8).constant, 44)
+        self.assertEqual(fold_cast("trunc", ir.Constant(Int32, 200), Int8).constant, -56)
+        self.assertEqual(fold_cast("trunc", ir.Constant(Int32, -1), UInt8).constant, 255)
+
+    def test_float_casts(self):
+        self.assertEqual(fold_cast("sitofp", ir.Constant(Int32, -3), ir.DoubleType()).constant, -3.0)
+        self.assertEqual(fold_cast("uitofp", ir.Constant(UInt8, -1), ir.DoubleType()).constant, 255.0)
+        self.assertEqual(fold_cast("fptosi", ir.DoubleType()(-3.9), Int32).constant, -3)
+        self.assertEqual(fold_cast("fptoui", ir.DoubleType()(255.5), UInt8).constant, 255)
+        self.assertEqual(fold_cast("fptrunc", ir.DoubleType()(0.1), ir.FloatType()).constant, 0.10000000149011612)
+        self.assertEqual(fold_cast("fpext", ir.FloatType()(0.1), ir.DoubleType()).constant, 0.10000000149011612)
+
+        # Out of range conversions are undefined
+        self.assertIsNone(fold_cast("fptoui", ir.DoubleType()(-1.0), UInt8))
+        self.assertIsNone(fold_cast("fptosi", ir.DoubleType()(128.0), Int8))
+        self.assertIsNone(fold_cast("fptosi", ir.DoubleType()(math.inf), Int32))
+        self.assertIsNone(fold_cast("fptrunc", ir.DoubleType()(1e300), ir.FloatType()))
+
+
+class TestConstantFoldingOutput(unittest.TestCase):
+    dir_path: str
+    src_path: str
+    main_file: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestConstantFoldingOutput).setUpClass()
+        cls.dir_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-1])),
+                                    "TestConstantFoldingOutput")
+        cls.src_path = os.path.join(cls.dir_path, "src")
+        cls.main_file = os.path.join(cls.src_path, "main.rial")
+
+        if not os.path.exists(cls.dir_path):
+            os.mkdir(cls.dir_path)
+            os.mkdir(cls.src_path)
+
+        with open(cls.main_file, "w") as file:
+            file.write("public void main() {\n")
+            file.write("\tvar a = 5 + 5;\n")
+            file.write("\tvar b = 3u - 5u;\n")
+            file.write("\tvar c = (Int64) 7;\n")
+            file.write("\tvar d = 5 < 6;\n")
+            file.write("\tvar e = 7 / -2;\n")
+            file.write("}\n")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def compile(self, *args) -> str:
+        testargs = ['prog', '--workdir', self.dir_path, '--opt-level', '0', '--print-ir', '--disable-cache', *args]
+        # start() merges the arguments into the defaults, which would keep --fold-constants for the next test
+        with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+            start()
+
+        with open(os.path.join(os.path.join(self.dir_path, "output"), "main.ll"), "r") as ir_file:
+            return ir_file.read()
+
+    def test_unfolded_by_default(self):
+        content = self.compile()
+
+        self.assertIn('add i32 5, 5', content)
+        self.assertIn('sub i32 3, 5', content)
+        self.assertIn('sext i32 7 to i64', content)
+        self.assertIn('icmp slt i32 5, 6', content)
+        self.assertIn('sdiv i32 7, -2', content)
+
+    def test_folded(self):
+        content = self.compile('--fold-constants')
+
+        self.assertNotIn('add i32', content)
+        self.assertNotIn('sext', content)
+        self.assertNotIn('icmp', content)
+        self.assertIn('store i32 10, i32* %a', content)
+        # LLVM prints the wrapped around unsigned value as signed
+        self.assertIn('store i32 -2, i32* %b', content)
+        self.assertIn('store i64 7, i64* %c', content)
+        self.assertIn('store i1 true, i1* %d', content)
+        self.assertIn('store i32 -3, i32* %e', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
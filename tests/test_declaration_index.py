@@ -0,0 +1,42 @@
+import unittest
+
+from rial.concept.parser import Tree, Token
+from rial.transformer.DeclarationIndex import DeclarationIndex
+
+
+def declaration(data: str, name: str) -> Tree:
+    return Tree(data, [Token('IDENTIFIER', name), Tree('statement', [Tree('function_decl', [])])])
+
+
+class TestDeclarationIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.unsafe_block = Tree('start', [declaration('global_variable_decl', 'b'), declaration('function_decl', 'g')])
+        self.ast = Tree('start', [
+            declaration('struct_decl', 'S'),
+            declaration('global_variable_decl', 'a'),
+            declaration('function_decl', 'f'),
+            self.unsafe_block,
+            declaration('attributed_func_decl', 'h'),
+            declaration('external_function_decl', 'printf'),
+            declaration('global_variable_assignment', 'a'),
+        ])
+
+    def names(self, entries):
+        return [entry[2].children[0].value for entry in entries]
+
+    def test_buckets_in_source_order(self):
+        index = DeclarationIndex(self.ast)
+        self.assertEqual(self.names(index.structs), ['S'])
+        self.assertEqual(self.names(index.functions), ['f', 'g', 'h', 'printf'])
+        self.assertEqual(self.names(index.globals), ['a', 'b'])
+
+    def test_replace_in_parent(self):
+        index = DeclarationIndex(self.ast)
+        DeclarationIndex.replace(index.globals[1], None)
+        DeclarationIndex.replace(index.functions[0], Tree('function_decl', []))
+        self.assertIsNone(self.unsafe_block.children[0])
+        self.assertEqual(self.ast.children[2], Tree('function_decl', []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule, DEFINITION_GLOBAL, DEFINITION_GLOBAL_VARIABLE
+from rial.ir.modifier.AccessModifier import AccessModifier
+from rial.ir.type_expressions import parse_type_expression, ARRAY_TYPE, FUNCTION_TYPE
+
+
+class TestTypeExpressions(unittest.TestCase):
+    def test_builtin(self):
+        self.assertEqual(parse_type_expression("int"), ("Int32", ir.IntType(32), None, None))
+
+    def test_arrays(self):
+        self.assertEqual(parse_type_expression("Foo[12]"), ("Foo[12]", None, ARRAY_TYPE, ("Foo", 12)))
+        self.assertEqual(parse_type_expression("Foo[0]")[3], ("Foo", 0))
+        self.assertEqual(parse_type_expression("Foo[]")[3], ("Foo", None))
+
+    def test_function_type(self):
+        self.assertEqual(parse_type_expression("Int32(Int32)"), ("Int32(Int32)", None, FUNCTION_TYPE,
+                                                                 ("Int32", ("Int32",), False)))
+
+    def test_plain_identifier(self):
+        self.assertEqual(parse_type_expression("counter"), ("counter", None, None, None))
+
+    def test_memoized(self):
+        self.assertIs(parse_type_expression("Bar[3]"), parse_type_expression("Bar[3]"))
+
+
+class TestDefinitionIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = RIALModule("rial:builtin:index_test", ir.Context())
+
+    def test_functions_are_indexed(self):
+        func = RIALFunction(self.module, ir.FunctionType(ir.VoidType(), []), "func", "func")
+        self.assertEqual(self.module.definitions["func"], (DEFINITION_GLOBAL, func))
+        self.assertIs(self.module.get_definition(["func"]), func)
+
+    def test_global_variables_shadow_globals(self):
+        variable = self.module.declare_global("value", "Int32", ir.IntType(32), "private", None,
+                                              AccessModifier.PRIVATE)
+        self.assertEqual(self.module.definitions["value"], (DEFINITION_GLOBAL_VARIABLE, variable))
+        self.assertIs(self.module.get_definition(["value"]), variable)
+
+    def test_unknown_identifier(self):
+        self.assertIsNone(self.module.get_definition(["missing"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
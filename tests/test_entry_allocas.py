@@ -0,0 +1,52 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.IRBuilder import IRBuilder
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+
+
+class TestEntryAllocas(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = RIALModule("allocas", ir.Context())
+        self.func = RIALFunction(self.module, ir.FunctionType(ir.VoidType(), [ir.IntType(32)]), "func", "func")
+        self.entry = self.func.append_basic_block("entry")
+        self.builder = IRBuilder(self.entry)
+
+    def test_allocas_go_to_the_start_of_the_entry_block(self):
+        first = self.builder.alloca_in_entry(ir.IntType(32))
+        self.builder.add(self.func.args[0], self.func.args[0])
+        body = self.builder.append_basic_block("body")
+        self.builder.branch(body)
+        self.builder.position_at_end(body)
+        loaded = self.builder.load(first)
+        second = self.builder.alloca_in_entry(ir.IntType(64))
+        third = self.builder.alloca_in_entry(ir.ArrayType(ir.IntType(8), 4), ir.Constant(ir.IntType(32), 1))
+
+        self.assertEqual(self.entry.instructions[:3], [first, second, third])
+        self.assertEqual(body.instructions, [loaded])
+        self.assertEqual(self.func.entry_allocas, 3)
+
+        # Still inserting after the last instruction of the current block
+        stored = self.builder.store(ir.Constant(ir.IntType(64), 0), second)
+        self.assertIs(body.instructions[-1], stored)
+
+    def test_insertion_point_in_entry_block(self):
+        self.builder.add(self.func.args[0], self.func.args[0])
+        allocated = self.builder.alloca_in_entry(ir.IntType(32))
+        added = self.builder.add(self.func.args[0], self.func.args[0])
+
+        self.assertIs(self.entry.instructions[0], allocated)
+        self.assertIs(self.entry.instructions[-1], added)
+
+    def test_dynamic_size_stays_in_place(self):
+        self.builder.add(self.func.args[0], self.func.args[0])
+        allocated = self.builder.alloca_in_entry(ir.IntType(8), self.func.args[0])
+
+        self.assertIs(self.entry.instructions[-1], allocated)
+        self.assertEqual(self.func.entry_allocas, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import glob
+import os
+import random
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from rial.concept.parser import UnexpectedInput
+from rial.parsing import parse_tables
+from rial.parsing.parse_tables import load_parser
+from rial.transformer.Postlexer import Postlexer
+
+
+def lex_while_parsing(parser, contents: str):
+    """
+    Records the tokens the parser consumes. The contextual lexers depend on the parser state,
+    so the token stream only exists while parsing.
+    """
+    frontend = parser.parser
+    original_lex = frontend.lex
+    tokens = list()
+
+    def recording_lex(*args):
+        for token in original_lex(*args):
+            tokens.append((token.type, token.value, token.pos_in_stream, token.line, token.column, token.end_line,
+                           token.end_column, token.end_pos))
+            yield token
+
+    frontend.lex = recording_lex
+    error = None
+    try:
+        parser.parse(contents)
+    except UnexpectedInput as e:
+        error = (type(e), e.line, e.column, e.pos_in_stream, repr(getattr(e, 'token', None)))
+    finally:
+        del frontend.lex
+
+    return tokens, error
+
+
+class TestFastLexer(unittest.TestCase):
+    sources: list
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestFastLexer).setUpClass()
+        root = os.path.abspath("/".join(f"{__file__}".split('/')[0:-2]))
+        cls.sources = list()
+        for pattern in ("std/**/*.rial", "examples/**/*.rial", "fuzzing_in/**/*"):
+            for path in sorted(glob.glob(os.path.join(root, pattern), recursive=True)):
+                if os.path.isfile(path):
+                    with open(path, "r") as file:
+                        cls.sources.append(file.read())
+
+        # Directives, literal identifiers and attributes go through the postlexer and the unless callback
+        cls.sources.append('const main_module = use #programMainModule;\n'
+                           'const os = #targetOS;\nconst triple = #targetTriple;\n'
+                           '#[likely]\n#[likely\n]\npublic void @"literal name"() {\n}\n')
+        cls.sources.append("const c = 'a';\nconst s = \"escaped \\\" quote\";\n"
+                           "const n = 0x1F_u + -3.5e-2f - 0b1010 * 1uL / 2.;\n/* comment */ // comment\n")
+
+        cls.contextual = load_parser(Postlexer("TestFastLexer", "x86_64-unknown-linux-gnu"), "contextual")
+        cls.fast = load_parser(Postlexer("TestFastLexer", "x86_64-unknown-linux-gnu"), "fast")
+
+    def assertSameTokens(self, contents: str):
+        self.assertEqual(lex_while_parsing(self.contextual, contents), lex_while_parsing(self.fast, contents))
+
+    def test_sources(self):
+        for contents in self.sources:
+            self.assertSameTokens(contents)
+
+    def test_mutated_sources(self):
+        rng = random.Random(7)
+        for contents in self.sources:
+            for _ in range(50):
+                i = rng.randrange(len(contents))
+                j = rng.randrange(len(contents))
+                self.assertSameTokens(contents[:i] + contents[j:j + rng.randrange(1, 8)] + contents[i:])
+
+    def test_non_ascii(self):
+        self.assertSameTokens('public void main() {\n    const s = "ünïcödé";\n    ä = 1;\n}\n')
+
+    def test_warns_without_tables(self):
+        with patch.object(parse_tables, "TABLES_PATH", Path("/nonexistent/parser_tables.bin")), \
+                patch.object(parse_tables, "_mapped_tables", None), \
+                patch.object(parse_tables, "_warned_about_lexer", False), \
+                patch.object(parse_tables, "log_warn") as log_warn:
+            load_parser(Postlexer("TestFastLexer", "x86_64-unknown-linux-gnu"), "contextual")
+            self.assertFalse(log_warn.called)
+
+            load_parser(Postlexer("TestFastLexer", "x86_64-unknown-linux-gnu"), "fast")
+            load_parser(Postlexer("TestFastLexer", "x86_64-unknown-linux-gnu"), "fast")
+            self.assertEqual(log_warn.call_count, 1)
+            self.assertIn("parse tables can't be loaded", log_warn.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+from rial.ir.metadata.FunctionDefinition import FunctionDefinition
+
+
+def declare(module: RIALModule, name: str) -> RIALFunction:
+    func = module.declare_function(name, name, ir.FunctionType(ir.VoidType(), []), "external", "fastcc",
+                                   FunctionDefinition("void"))
+    return func
+
+
+def unfrozen_ir(module: RIALModule) -> str:
+    for func in module.functions:
+        if isinstance(func, RIALFunction):
+            func.frozen_body = None
+    return ir.Module.__repr__(module)
+
+
+class TestFrozenFunctionIR(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = RIALModule("frozen", ir.Context())
+        self.glob = ir.GlobalVariable(self.module, ir.IntType(32), "glob")
+
+    def build(self, func: RIALFunction):
+        with self.module.create_or_enter_function_body(func):
+            loaded = self.module.builder.load(self.glob)
+            self.module.builder.store(self.module.builder.add(loaded, loaded), self.glob)
+
+    def test_frozen_when_body_is_done(self):
+        func = declare(self.module, "func")
+        self.build(func)
+
+        self.assertIsNotNone(func.frozen_body)
+        self.assertIn("add i32", func.frozen_body)
+        self.assertIn("ret void", func.frozen_body)
+
+    def test_module_text_is_unchanged(self):
+        for i in range(3):
+            self.build(declare(self.module, f"func{i}"))
+        declare(self.module, "declared")
+
+        frozen = str(self.module)
+        self.assertEqual(frozen, unfrozen_ir(self.module))
+        self.assertEqual(frozen, str(self.module))
+
+    def test_thawed_by_new_instructions(self):
+        func = declare(self.module, "func")
+        self.build(func)
+        self.assertIsNotNone(func.frozen_body)
+
+        # Entering the body again appends to it and freezes it once it's done
+        with self.module.create_or_enter_function_body(func):
+            self.module.builder.store(ir.Constant(ir.IntType(32), 42), self.glob)
+            self.assertIsNone(func.frozen_body)
+
+        self.assertIn("store i32 42", func.frozen_body)
+        self.assertEqual(str(self.module), unfrozen_ir(self.module))
+
+    def test_nested_entry_freezes_once(self):
+        func = declare(self.module, "func")
+        other = declare(self.module, "other")
+
+        with self.module.create_or_enter_function_body(func):
+            self.build(other)
+            self.assertIsNotNone(other.frozen_body)
+
+            with self.module.create_or_enter_function_body(func):
+                pass
+
+            self.assertIsNone(func.frozen_body)
+
+        self.assertIsNotNone(func.frozen_body)
+        self.assertEqual(str(self.module), unfrozen_ir(self.module))
+
+    def test_new_block_thaws(self):
+        func = declare(self.module, "func")
+        self.build(func)
+        func.append_basic_block("late")
+
+        self.assertIsNone(func.frozen_body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from typing import List
+
+from unittest.mock import patch
+
+from rial.compilation_manager import CompilationManager
+from rial.linking.linker import Linker
+from rial.main import DEFAULT_OPTIONS, start
+from rial.profiling import set_profiling, counters, execution_events, ExecutionStep
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    workdir: str
+    compiled: List[str]
+
+    def setUp(self) -> None:
+        self.workdir = os.path.join(tempfile.mkdtemp(), "TestIncrementalBuild")
+        os.makedirs(os.path.join(self.workdir, "src"))
+
+        self.write_source("main.rial", "const math = use TestIncrementalBuild:math;\n"
+                                       "const other = use TestIncrementalBuild:other;\n"
+                                       "unsafe {\n"
+                                       "\texternal void printf(CString format, params CString arg);\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tunsafe {\n"
+                                       '\t\tprintf("%i %i\\n", math.twice(21), other.one());\n'
+                                       "\t}\n"
+                                       "}\n")
+        self.write_source("math.rial", "public int twice(int value) {\n"
+                                       "\treturn value * 2;\n"
+                                       "}\n")
+        self.write_source("other.rial", "public int one() {\n"
+                                        "\treturn 1;\n"
+                                        "}\n")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.workdir))
+
+    def write_source(self, name: str, contents: str):
+        with open(os.path.join(self.workdir, "src", name), "w") as file:
+            file.write(contents)
+
+    def build(self, *args):
+        """
+        Builds the project and returns the cache counters of the build and whether it was linked.
+        The modules that were optimized are kept in compiled.
+        """
+        testargs = ['prog', '--workdir', self.workdir, '--profile', *args]
+        try:
+            execution_events.clear()
+            with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']), \
+                    patch.object(Linker, "link_files", wraps=Linker.link_files) as link_files:
+                start()
+
+            self.compiled = sorted(event.file for event in execution_events if event.step == ExecutionStep.COMPILE_MOD)
+            return dict(counters), link_files.called
+        finally:
+            set_profiling(False)
+            counters.clear()
+            execution_events.clear()
+
+    def run_executable(self):
+        return subprocess.run([os.path.join(self.workdir, "bin", "TestIncrementalBuild")],
+                              stdout=subprocess.PIPE).stdout
+
+    def run_in_process(self, *args):
+        with tempfile.TemporaryFile() as output:
+            stdout = os.dup(1)
+            sys.stdout.flush()
+            os.dup2(output.fileno(), 1)
+            try:
+                counts, _ = self.build('--run', *args)
+            finally:
+                sys.stdout.flush()
+                os.dup2(stdout, 1)
+                os.close(stdout)
+
+            output.seek(0)
+            return counts, output.read()
+
+    def test_no_op_rebuild(self):
+        first, linked = self.build()
+        self.assertNotIn("ARTIFACT_CACHE_HITS", first)
+        self.assertTrue(linked)
+
+        second, linked = self.build()
+        self.assertEqual(second["ARTIFACT_CACHE_HITS"], first["ARTIFACT_CACHE_MISSES"])
+        self.assertNotIn("ARTIFACT_CACHE_MISSES", second)
+        self.assertEqual(self.compiled, [])
+        self.assertFalse(linked)
+        self.assertEqual(self.run_executable(), b"42 1\n")
+
+        # Everything is in the artifact store, modules aren't pickled
+        cache_path = os.path.join(self.workdir, "cache")
+        self.assertFalse(os.path.exists(os.path.join(cache_path, "index.json")))
+        self.assertEqual([path for path in os.listdir(cache_path) if path.endswith(".cache")], [])
+
+    def test_changed_body_only_rebuilds_the_module(self):
+        self.build()
+        self.write_source("math.rial", "public int twice(int value) {\n"
+                                       "\treturn value * 3;\n"
+                                       "}\n")
+
+        counts, linked = self.build()
+
+        # The interface of math didn't change, its dependents are declared from their summaries
+        self.assertEqual(self.compiled, ["/math.rial"])
+        self.assertEqual(counts["INTERFACE_CACHE_MISSES"], 1)
+        self.assertTrue(linked)
+        self.assertEqual(self.run_executable(), b"63 1\n")
+
+    def test_changed_interface_rebuilds_dependents(self):
+        self.build()
+        self.write_source("math.rial", "public int twice(int value) {\n"
+                                       "\treturn value * 2;\n"
+                                       "}\n"
+                                       "public int thrice(int value) {\n"
+                                       "\treturn value * 3;\n"
+                                       "}\n")
+
+        _, linked = self.build()
+
+        # The startup module calls main
+        self.assertEqual(self.compiled, ["/main.rial", "/math.rial", "/startup/start.rial"])
+        self.assertTrue(linked)
+        self.assertEqual(self.run_executable(), b"42 1\n")
+
+    def test_keys_are_computed_without_compiling(self):
+        get_module_key = CompilationManager._get_module_key
+        compiled_while_hashing = list()
+
+        def checked_get_module_key(path: str):
+            modules = list(CompilationManager.modules)
+            key = get_module_key(path)
+            if list(CompilationManager.modules) != modules:
+                compiled_while_hashing.append(path)
+            return key
+
+        for _ in range(2):
+            with patch.object(CompilationManager, "_get_module_key", side_effect=checked_get_module_key) as get_key:
+                self.build()
+            self.assertTrue(get_key.called)
+
+        self.assertEqual(compiled_while_hashing, [])
+        self.assertEqual(self.compiled, [])
+
+    def test_struct_from_interface(self):
+        self.write_source("shapes.rial", "public struct Rect {\n"
+                                         "\tpublic int width;\n"
+                                         "\tpublic int height;\n"
+                                         "}\n"
+                                         "public int area(Rect rect) {\n"
+                                         "\treturn rect.width * rect.height;\n"
+                                         "}\n")
+        self.write_source("main.rial", "const shapes = use TestIncrementalBuild:shapes;\n"
+                                       "unsafe {\n"
+                                       "\texternal void printf(CString format, params CString arg);\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tvar rect = Rect();\n"
+                                       "\trect.width = 2;\n"
+                                       "\trect.height = 3;\n"
+                                       "\tunsafe {\n"
+                                       '\t\tprintf("%i\\n", shapes.area(rect));\n'
+                                       "\t}\n"
+                                       "}\n")
+        self.build()
+        self.assertEqual(self.run_executable(), b"6\n")
+
+        # Compiled against the struct and function declared from the summary of shapes
+        self.write_source("main.rial", "const shapes = use TestIncrementalBuild:shapes;\n"
+                                       "unsafe {\n"
+                                       "\texternal void printf(CString format, params CString arg);\n"
+                                       "}\n"
+                                       "public void main() {\n"
+                                       "\tvar rect = Rect();\n"
+                                       "\trect.width = 4;\n"
+                                       "\trect.height = 3;\n"
+                                       "\tunsafe {\n"
+                                       '\t\tprintf("%i\\n", shapes.area(rect));\n'
+                                       "\t}\n"
+                                       "}\n")
+        _, linked = self.build()
+
+        # Neither does the interface of main, the startup module isn't compiled again either
+        self.assertEqual(self.compiled, ["/main.rial"])
+        self.assertTrue(linked)
+        self.assertEqual(self.run_executable(), b"12\n")
+
+    def test_outputs_are_kept(self):
+        self.build()
+        stray_file = os.path.join(self.workdir, "output", "stray.txt")
+
+        with open(stray_file, "w") as file:
+            file.write("stray")
+
+        os.remove(os.path.join(self.workdir, "output", "math.o"))
+        counts, linked = self.build()
+
+        # Restored from the cache, nothing is compiled again
+        self.assertNotIn("ARTIFACT_CACHE_MISSES", counts)
+        self.assertTrue(os.path.exists(os.path.join(self.workdir, "output", "math.o")))
+        self.assertTrue(os.path.exists(stray_file))
+        self.assertFalse(linked)
+
+    def test_options_change_the_key(self):
+        self.build()
+        counts, linked = self.build('--opt-level', '2')
+
+        self.assertNotIn("ARTIFACT_CACHE_HITS", counts)
+        self.assertTrue(linked)
+        self.assertEqual(self.run_executable(), b"42 1\n")
+
+    def test_disable_cache(self):
+        self.build('--disable-cache')
+        counts, linked = self.build('--disable-cache')
+
+        self.assertNotIn("ARTIFACT_CACHE_HITS", counts)
+        self.assertTrue(linked)
+
+    def test_run_reuses_optimized_modules(self):
+        first, output = self.run_in_process()
+        self.assertNotIn("ARTIFACT_CACHE_HITS", first)
+        self.assertEqual(output, b"42 1\n")
+
+        second, output = self.run_in_process()
+        self.assertEqual(second["ARTIFACT_CACHE_HITS"], first["ARTIFACT_CACHE_MISSES"])
+        self.assertNotIn("ARTIFACT_CACHE_MISSES", second)
+        self.assertEqual(output, b"42 1\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import sys
+import unittest
+
+from unittest.mock import patch
+
+from rial.compilation_manager import CompilationManager
+from rial.main import DEFAULT_OPTIONS, start
+from rial.profiling import ExecutionStep, execution_events, set_profiling
+
+
+class TestJitOnDemand(unittest.TestCase):
+    dir_path: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestJitOnDemand).setUpClass()
+        cls.dir_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-1])), "TestJitOnDemand")
+        src_path = os.path.join(cls.dir_path, "src")
+
+        if not os.path.exists(cls.dir_path):
+            os.mkdir(cls.dir_path)
+            os.mkdir(src_path)
+
+        with open(os.path.join(src_path, "main.rial"), "w") as file:
+            file.write("public void main() {\n")
+            file.write("\tvar a = 5;\n")
+            file.write("}\n")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def build(self):
+        testargs = ['prog', '--workdir', self.dir_path, '--disable-cache', '--profile']
+        execution_events.clear()
+        try:
+            with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+                start()
+        finally:
+            set_profiling(False)
+
+        self.assertTrue(os.path.exists(os.path.join(self.dir_path, "bin", "TestJitOnDemand")))
+
+        return [event.step for event in execution_events]
+
+    def test_executable_without_jit(self):
+        steps = self.build()
+
+        self.assertIsNone(CompilationManager.codegen.engine)
+        self.assertNotIn(ExecutionStep.JIT, steps)
+
+    def test_jit_when_needed(self):
+        with patch.object(CompilationManager, "_needs_jit", return_value=True):
+            steps = self.build()
+
+        self.assertIsNotNone(CompilationManager.codegen.engine)
+        self.assertIn(ExecutionStep.JIT, steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
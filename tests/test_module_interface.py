@@ -0,0 +1,121 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
+from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALVariable import RIALVariable
+from rial.ir.llvm_helper import create_identified_struct_type
+from rial.ir.metadata.FunctionDefinition import FunctionDefinition
+from rial.ir.modifier.AccessModifier import AccessModifier
+from rial.ir.module_interface import dump_interface, load_interface
+
+
+class TestModuleInterface(unittest.TestCase):
+    module: RIALModule
+
+    def setUp(self) -> None:
+        self.module = RIALModule("shapes", ir.Context())
+        self.module.add_dependency("math", "rial:core:math")
+
+        point = create_identified_struct_type(self.module, "Point", AccessModifier.PUBLIC, [], [
+            RIALVariable("x", "Int32", ir.IntType(32), None, AccessModifier.PUBLIC),
+            RIALVariable("y", "Int32", ir.IntType(32), None, AccessModifier.PUBLIC),
+        ])
+        create_identified_struct_type(self.module, "Circle", AccessModifier.PUBLIC, [point], [
+            RIALVariable("radius", "UInt64", LLVMUIntType(64), None, AccessModifier.PRIVATE),
+        ])
+
+        args = [RIALVariable("this", "Point", point, None),
+                RIALVariable("format", "CString", ir.IntType(8).as_pointer(), None),
+                RIALVariable("args...", "CString", ir.IntType(8).as_pointer(), None)]
+        func = self.module.declare_function("mangled_print.Point_CString", "print",
+                                            ir.FunctionType(ir.VoidType(), [point.as_pointer(),
+                                                                            ir.IntType(8).as_pointer()], True),
+                                            "external", "fastcc",
+                                            FunctionDefinition("Void", AccessModifier.PUBLIC, args, point, True))
+        func.attributes.add("cold")
+
+        for arg, rial_arg in zip(func.args, args):
+            arg.name = rial_arg.name
+            rial_arg.value = arg
+
+        self.module.declare_global("origin", "Point", point, "external", None, AccessModifier.PUBLIC)
+        self.module.declare_global("greeting", "Char[3]", ir.ArrayType(LLVMUIntType(8), 3), "external",
+                                   ir.Constant(ir.ArrayType(LLVMUIntType(8), 3), bytearray(b"hi\0")),
+                                   AccessModifier.PUBLIC, True)
+
+    def load(self) -> RIALModule:
+        module = RIALModule("shapes", ir.Context())
+        self.assertIsNotNone(load_interface(module, dump_interface(self.module)))
+        return module
+
+    def test_round_trip(self):
+        summary = dump_interface(self.module)
+        module = self.load()
+
+        self.assertEqual(dump_interface(module), summary)
+        self.assertEqual(module.dependencies, {"math": "rial:core:math"})
+
+    def test_structs(self):
+        module = self.load()
+        circle: RIALIdentifiedStructType = module.get_definition(["Circle"])
+
+        self.assertIsInstance(circle, RIALIdentifiedStructType)
+        self.assertEqual(circle.module_name, "shapes")
+        self.assertEqual(circle.get_declaration(), self.module.context.identified_types["Circle"].get_declaration())
+        self.assertEqual(circle.definition.base_structs, ["Point"])
+        self.assertEqual(list(circle.definition.properties), ["x", "y", "radius"])
+
+        index, radius = circle.definition.properties["radius"]
+        self.assertEqual(index, 2)
+        self.assertEqual(radius.rial_type, "UInt64")
+        self.assertIsInstance(radius.llvm_type, LLVMUIntType)
+        self.assertEqual(radius.access_modifier, AccessModifier.PRIVATE)
+
+    def test_functions(self):
+        module = self.load()
+        func = module.functions_by_canonical_name["print"][0]
+
+        self.assertEqual(str(func), str(self.module.get_global_safe("mangled_print.Point_CString")))
+        self.assertIs(func.definition.struct, module.get_definition(["Point"]))
+        self.assertTrue(func.definition.unsafe)
+        self.assertEqual([arg.name for arg in func.definition.rial_args], ["this", "format", "args..."])
+        self.assertIs(func.definition.rial_args[0].value, func.args[0])
+        self.assertIsNone(func.definition.rial_args[2].value)
+
+    def test_global_variables(self):
+        module = self.load()
+
+        self.assertEqual(str(module.get_global_safe("origin")), str(self.module.get_global_safe("origin")))
+        self.assertEqual(module.get_definition(["greeting"]).value.initializer.constant, bytearray(b"hi\0"))
+        self.assertTrue(module.get_definition(["greeting"]).value.global_constant)
+
+    def test_string_literals_are_left_out(self):
+        summary = dump_interface(self.module)
+        self.module.declare_global(".const.string.abc", "Char[3]", ir.ArrayType(LLVMUIntType(8), 3), "linkonce_odr",
+                                   ir.Constant(ir.ArrayType(LLVMUIntType(8), 3), bytearray(b"hi\0")),
+                                   AccessModifier.PRIVATE, True)
+
+        self.assertEqual(dump_interface(self.module), summary)
+
+    def test_undeclared_struct(self):
+        summary = dump_interface(self.module)
+        module = RIALModule("shapes", ir.Context())
+        module.context.identified_types["Point"] = RIALIdentifiedStructType(module.context, "Point")
+
+        # Point is declared by another module
+        self.assertIsNone(load_interface(module, summary))
+
+        context = ir.Context()
+        line = create_identified_struct_type(RIALModule("lines", context), "Line", AccessModifier.PUBLIC, [], [])
+        other = RIALModule("other", context)
+        other.declare_global("line", "Line", line, "external", None)
+
+        # Line isn't declared in the new context
+        self.assertIsNone(load_interface(RIALModule("other", ir.Context()), dump_interface(other)))
+
+
+if __name__ == '__main__':
+    unittest.main()
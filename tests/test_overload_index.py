@@ -0,0 +1,83 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+
+from llvmlite import ir
+
+from rial.compilation_manager import CompilationManager
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+
+
+def create_module(name: str, context: ir.Context, functions):
+    module = RIALModule(name, context)
+    for function, canonical_name in functions:
+        RIALFunction(module, ir.FunctionType(ir.VoidType(), []), function, canonical_name)
+    return module
+
+
+class TestOverloadIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.old_modules = getattr(CompilationManager, "modules", None)
+        context = ir.Context()
+        self.a = create_module("a", context, [("print_int", "print")])
+        self.b = create_module("b", context, [("print_float", "print")])
+        self.c = create_module("c", context, [("print_str", "print"), ("other", "other")])
+        CompilationManager.modules = {"a": self.a, "b": self.b, "c": self.c}
+        CompilationManager.modules_in_progress = set()
+
+    def tearDown(self) -> None:
+        CompilationManager.modules = self.old_modules
+        CompilationManager.modules_in_progress = set()
+
+    def names(self, module: RIALModule, canonical_name: str):
+        return [func.name for func in module.get_functions_by_canonical_name(canonical_name)]
+
+    def test_own_functions(self):
+        self.assertEqual(self.names(self.c, "print"), ["print_str"])
+        self.assertEqual(self.names(self.c, "missing"), [])
+
+    def test_transitive_dependencies(self):
+        self.a.add_dependency("b", "b")
+        self.b.add_dependency("c", "c")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_float", "print_str"])
+
+    def test_diamond_is_visited_once(self):
+        self.a.add_dependency("b", "b")
+        self.a.add_dependency("c", "c")
+        self.b.add_dependency("c", "c")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_float", "print_str"])
+
+    def test_cycles(self):
+        self.a.add_dependency("b", "b")
+        self.b.add_dependency("a", "a")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_float"])
+        self.assertEqual(self.names(self.b, "print"), ["print_float", "print_int"])
+
+    def test_dependencies_in_progress_are_not_cached(self):
+        self.a.add_dependency("d", "d")
+        CompilationManager.modules_in_progress.add("d")
+        self.assertEqual(self.names(self.a, "print"), ["print_int"])
+
+        CompilationManager.modules["d"] = create_module("d", ir.Context(), [("print_bool", "print")])
+        CompilationManager.modules_in_progress.discard("d")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_bool"])
+
+    def test_missing_dependencies_fail(self):
+        self.a.add_dependency("d", "d")
+        output = io.StringIO()
+
+        with redirect_stderr(output), self.assertRaises(KeyError):
+            self.names(self.a, "print")
+
+        self.assertIn("Module d is a dependency of a but has not been compiled", output.getvalue())
+
+    def test_functions_declared_later(self):
+        self.a.add_dependency("b", "b")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_float"])
+        RIALFunction(self.b, ir.FunctionType(ir.VoidType(), []), "print_double", "print")
+        self.assertEqual(self.names(self.a, "print"), ["print_int", "print_float", "print_double"])
+
+
+if __name__ == '__main__':
+    unittest.main()
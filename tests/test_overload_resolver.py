@@ -0,0 +1,200 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from llvmlite import ir
+
+from rial.linking.linker import Linker
+from rial.main import DEFAULT_OPTIONS, start
+from rial.ir.OverloadResolver import OverloadResolver
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALIdentifiedStructType import RIALIdentifiedStructType
+from rial.ir.RIALModule import RIALModule, DEFINITION_STRUCT
+from rial.ir.RIALVariable import RIALVariable
+from rial.ir.metadata.FunctionDefinition import FunctionDefinition
+from rial.profiling import set_profiling, counters
+
+LLVM_TYPES = {"Int32": ir.IntType(32), "UInt32": ir.IntType(32), "Float32": ir.FloatType()}
+
+
+def declare(module: RIALModule, canonical_name: str, arg_types):
+    name = module.get_unique_function_name(canonical_name, arg_types)
+    args = [RIALVariable(f"arg{i}", ty, LLVM_TYPES[ty], None) for i, ty in enumerate(arg_types)]
+    func = RIALFunction(module, ir.FunctionType(ir.VoidType(), [arg.llvm_type for arg in args]), name,
+                        canonical_name)
+    func.definition = FunctionDefinition("void", rial_args=args)
+    return func
+
+
+def argument(ty: str):
+    return RIALVariable("argument", ty, LLVM_TYPES[ty], None)
+
+
+class TestOverloadResolver(unittest.TestCase):
+    """
+    The results that resolution had before the resolver, for the cases where it didn't depend on the candidate order.
+    """
+
+    def setUp(self) -> None:
+        context = ir.Context()
+        self.module = RIALModule("main", context)
+        self.other = RIALModule("other", context)
+        self.random = declare(self.other, "random", [])
+        self.random_max = declare(self.other, "random", ["Int32"])
+        self.random_range = declare(self.other, "random", ["Int32", "Int32"])
+
+    def test_single_candidate_is_not_checked(self):
+        self.assertIs(OverloadResolver.resolve([self.random], [argument("Float32")]), self.random)
+        self.assertIsNone(OverloadResolver.resolve([None], []))
+
+    def test_no_candidates(self):
+        with self.assertRaises(KeyError):
+            OverloadResolver.resolve([], [])
+
+    def test_uncallable_candidates_are_dropped(self):
+        self.assertIs(OverloadResolver.resolve([None, self.random], []), self.random)
+        struct = RIALIdentifiedStructType(self.module.context, "Foo")
+        self.assertIs(OverloadResolver.resolve([None, struct], []), struct)
+
+    def test_overloads_by_arity(self):
+        candidates = [self.random, self.random_max, self.random_range]
+        self.assertIs(OverloadResolver.resolve(candidates, []), self.random)
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("Int32")]), self.random_max)
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("Int32"), argument("Int32")]), self.random_range)
+
+    def test_only_candidate_with_matching_arity(self):
+        candidates = [self.random, self.random_range]
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("UInt32"), argument("Int32")]),
+                      self.random_range)
+
+    def test_overloads_by_type(self):
+        random_float = declare(self.other, "random", ["Float32"])
+        candidates = [random_float, self.random_max]
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("Int32")]), self.random_max)
+        self.assertIs(OverloadResolver.resolve(list(reversed(candidates)), [argument("Float32")]), random_float)
+
+    def test_ambiguous(self):
+        random_float = declare(self.other, "random", ["Float32"])
+        with self.assertRaises(KeyError):
+            OverloadResolver.resolve([random_float, self.random_max], [argument("UInt32")])
+
+    def test_implicit_module(self):
+        local = declare(self.module, "random", ["Int32"])
+        candidates = [local, self.random_max]
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("Int32")], self.other), self.random_max)
+        self.assertIs(OverloadResolver.resolve(candidates, [argument("Int32")], self.module), local)
+
+    def test_redeclared_function(self):
+        # Calling a function of another module redeclares it in the calling module
+        redeclared = self.module.declare_function(self.random_max.name, "random", self.random_max.function_type,
+                                                  "external", "ccc", self.random_max.definition)
+        self.assertIs(OverloadResolver.resolve([redeclared, self.random_max, self.random], [argument("Int32")]),
+                      redeclared)
+
+    def test_cache_is_invalidated_by_declarations(self):
+        key = OverloadResolver.get_call_key(self.module, ["random"], [argument("Int32")], None)
+        OverloadResolver.store(key, self.random_max)
+        self.assertIs(OverloadResolver.lookup(key), self.random_max)
+        declare(self.module, "random", ["Float32"])
+        self.assertIsNone(OverloadResolver.lookup(key))
+
+    def test_cache_is_kept_for_other_declarations(self):
+        key = OverloadResolver.get_call_key(self.module, ["other", "random"], [argument("Int32")], self.other)
+        OverloadResolver.store(key, self.random_max)
+        declare(self.module, "seed", ["Int32"])
+        self.module.index_definition("Random", DEFINITION_STRUCT,
+                                     RIALIdentifiedStructType(self.module.context, "Random"))
+        self.assertIs(OverloadResolver.lookup(key), self.random_max)
+        declare(self.other, "random", ["Float32"])
+        self.assertIsNone(OverloadResolver.lookup(key))
+
+    def test_cache_is_kept_for_redeclarations(self):
+        key = OverloadResolver.get_call_key(self.module, ["other", "random"], [argument("Int32")], self.other)
+        OverloadResolver.store(key, self.random_max)
+        self.module.declare_function(self.random_max.name, "random", self.random_max.function_type,
+                                     "external", "ccc", self.random_max.definition)
+        self.assertIs(OverloadResolver.lookup(key), self.random_max)
+
+    def test_call_keys(self):
+        arguments = [argument("Int32")]
+        self.assertNotEqual(OverloadResolver.get_call_key(self.module, ["random"], arguments, None),
+                            OverloadResolver.get_call_key(self.module, ["random"], arguments, self.other))
+        self.assertNotEqual(OverloadResolver.get_call_key(self.module, ["random"], arguments, None),
+                            OverloadResolver.get_call_key(self.other, ["random"], arguments, None))
+
+
+class TestOverloadCache(unittest.TestCase):
+    workdir: str
+
+    def setUp(self) -> None:
+        self.workdir = os.path.join(tempfile.mkdtemp(), "TestOverloadCache")
+        os.makedirs(os.path.join(self.workdir, "src"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(os.path.dirname(self.workdir))
+
+    def build(self, main: str):
+        """
+        Builds main.rial with the math module and returns the profiling counters.
+        """
+        with open(os.path.join(self.workdir, "src", "main.rial"), "w") as file:
+            file.write("const math = use TestOverloadCache:math;\n"
+                       "unsafe {\n"
+                       "\texternal void printf(CString format, params CString arg);\n"
+                       "}\n")
+            file.write(main)
+        with open(os.path.join(self.workdir, "src", "math.rial"), "w") as file:
+            file.write("public int twice(int value) {\n"
+                       "\treturn value * 2;\n"
+                       "}\n"
+                       "public int half(int value) {\n"
+                       "\treturn value / 2;\n"
+                       "}\n"
+                       "public int one() {\n"
+                       "\treturn 1;\n"
+                       "}\n")
+
+        testargs = ['prog', '--workdir', self.workdir, '--disable-cache', '--profile']
+        try:
+            counters.clear()
+            with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']), \
+                    patch.object(Linker, "link_files"):
+                start()
+
+            return dict(counters)
+        finally:
+            set_profiling(False)
+            counters.clear()
+
+    def test_cross_module_calls_are_cached(self):
+        counts = self.build("public void main() {\n"
+                            "\tvar a = math.twice(1);\n"
+                            "\tvar b = math.twice(2);\n"
+                            "\tvar c = math.twice(3);\n"
+                            "\tvar d = math.twice(4);\n"
+                            "}\n")
+
+        # Redeclaring twice in main after the first call keeps its result
+        self.assertEqual(counts["OVERLOAD_HITS"], 3)
+
+    def test_repeated_calls_are_cached(self):
+        counts = self.build("public void main() {\n"
+                            "\tunsafe {\n"
+                            '\t\tprintf("%i\\n", math.twice(1));\n'
+                            '\t\tprintf("%i\\n", math.twice(2));\n'
+                            '\t\tprintf("%i\\n", math.one());\n'
+                            '\t\tprintf("%i\\n", math.twice(3));\n'
+                            '\t\tprintf("%i\\n", math.half(4));\n'
+                            '\t\tprintf("%i\\n", math.twice(5));\n'
+                            "\t}\n"
+                            "}\n")
+
+        # Declaring one and half in main (when they are first called) keeps the results for twice and printf
+        self.assertEqual(counts["OVERLOAD_HITS"], 8)
+
+if __name__ == '__main__':
+    unittest.main()
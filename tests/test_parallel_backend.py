@@ -0,0 +1,166 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from llvmlite import binding, ir
+
+from rial import compilation_manager
+from rial.backend import parallel_backend
+from rial.backend.parallel_backend import BackendJob, compile_modules, should_compile_in_parallel
+from rial.main import DEFAULT_OPTIONS, start
+
+
+def generate_llvm_ir(index: int, functions: int = 5) -> str:
+    module = ir.Module(name=f"module{index}")
+    module.triple = binding.get_default_triple()
+    int32 = ir.IntType(32)
+
+    for function in range(functions):
+        func = ir.Function(module, ir.FunctionType(int32, [int32]), f"func_{index}_{function}")
+        entry = func.append_basic_block("entry")
+        loop = func.append_basic_block("loop")
+        end = func.append_basic_block("end")
+        builder = ir.IRBuilder(entry)
+        builder.branch(loop)
+        builder.position_at_end(loop)
+        counter = builder.phi(int32)
+        total = builder.phi(int32)
+        counter.add_incoming(ir.Constant(int32, 0), entry)
+        total.add_incoming(ir.Constant(int32, index), entry)
+        next_total = builder.add(builder.mul(total, ir.Constant(int32, function + 3)), counter)
+        next_counter = builder.add(counter, ir.Constant(int32, 1))
+        counter.add_incoming(next_counter, loop)
+        total.add_incoming(next_total, loop)
+        builder.cbranch(builder.icmp_signed("<", next_counter, func.args[0]), loop, end)
+        builder.position_at_end(end)
+        builder.ret(next_total)
+
+    return str(module)
+
+
+def create_jobs(directory: str, count: int, use_object_files: bool = True):
+    return [BackendJob(f"main:module{index}", os.path.join(directory, f"module{index}.rial"), generate_llvm_ir(index),
+                       os.path.join(directory, f"module{index}.o"), True, use_object_files,
+                       os.path.join(directory, f"module{index}.ll")) for index in range(count)]
+
+
+class TestParallelBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_small_builds_stay_in_process(self):
+        jobs = create_jobs(self.directory, 4)
+        self.assertFalse(should_compile_in_parallel(jobs, 4))
+
+        with patch.object(parallel_backend, "MIN_PARALLEL_BYTES", 0):
+            self.assertTrue(should_compile_in_parallel(jobs, 4))
+            self.assertFalse(should_compile_in_parallel(jobs, 1))
+            self.assertFalse(should_compile_in_parallel(jobs[:3], 4))
+
+    def test_objects_are_written(self):
+        jobs = create_jobs(self.directory, 6)
+        results = compile_modules(jobs, 2, "1", False, True)
+
+        self.assertEqual(set(results), {job.path for job in jobs})
+        for job in jobs:
+            result = results[job.path]
+            self.assertIsNone(result.error)
+
+            with open(job.output_file, "rb") as file:
+                self.assertEqual(file.read(4), b"\x7fELF")
+            with open(job.ir_file, "r") as file:
+                self.assertIn(f"define i32 @func_{job.name[-1]}_0", file.read())
+
+            module = binding.parse_bitcode(result.bitcode)
+            self.assertIsNotNone(module.get_function(f"func_{job.name[-1]}_4"))
+
+    def test_bitcode_output(self):
+        jobs = create_jobs(self.directory, 2, False)
+        results = compile_modules(jobs, 2, "1", False)
+
+        for job in jobs:
+            self.assertIsNone(results[job.path].bitcode)
+            with open(job.output_file, "rb") as file:
+                self.assertEqual(file.read(2), b"BC")
+
+    def test_skipped_outputs(self):
+        job = create_jobs(self.directory, 1)[0]
+        job.write_output = False
+        job.ir_file = None
+        compile_modules([job], 2, "1", False)
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_errors_are_returned(self):
+        jobs = create_jobs(self.directory, 2)
+        jobs[1].llvm_ir = "define i32 @broken() {\nentry:\n  ret void\n}\n"
+        results = compile_modules(jobs, 2, "1", False)
+
+        self.assertIsNone(results[jobs[0].path].error)
+        self.assertIsNotNone(results[jobs[1].path].error)
+
+
+class TestParallelBackendBuild(unittest.TestCase):
+    dir_path: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestParallelBackendBuild).setUpClass()
+        cls.dir_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-1])),
+                                    "TestParallelBackendBuild")
+        src_path = os.path.join(cls.dir_path, "src")
+
+        if not os.path.exists(cls.dir_path):
+            os.mkdir(cls.dir_path)
+            os.mkdir(src_path)
+
+        with open(os.path.join(src_path, "main.rial"), "w") as file:
+            file.write("const printer = use rial:core:print;\n")
+            file.write("public void main() {\n")
+            file.write('\tprinter.println("Hello");\n')
+            file.write("}\n")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def build(self, *args):
+        testargs = ['prog', '--workdir', self.dir_path, '--print-ir', '--disable-cache', *args]
+        with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+            start()
+
+        outputs = dict()
+        output_path = os.path.join(self.dir_path, "output")
+        for root, _, files in os.walk(output_path):
+            for file in files:
+                if file.endswith(".ll"):
+                    with open(os.path.join(root, file), "r") as ir_file:
+                        outputs[os.path.relpath(os.path.join(root, file), output_path)] = ir_file.read()
+
+        self.assertTrue(os.path.exists(os.path.join(self.dir_path, "bin", "TestParallelBackendBuild")))
+
+        return outputs
+
+    def test_same_output_as_in_process(self):
+        in_process = self.build('--compile-units', '1')
+
+        with patch.object(parallel_backend, "MIN_PARALLEL_MODULES", 0), \
+                patch.object(parallel_backend, "MIN_PARALLEL_BYTES", 0), \
+                patch.object(compilation_manager, "compile_modules", wraps=compile_modules) as in_pool:
+            in_workers = self.build('--compile-units', '2')
+
+        in_pool.assert_called_once()
+
+        self.assertGreater(len(in_process), 1)
+        self.assertEqual(in_process, in_workers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest.mock import patch
+
+from rial.concept.parser import Lark_StandAlone, Tree, Token
+from rial.main import DEFAULT_OPTIONS, start
+from rial.parsing.parse_cache import ParseCache
+from rial.parsing.tree_serializer import dump_tree, load_tree
+from rial.profiling import set_profiling, counters
+from rial.transformer.Postlexer import Postlexer
+
+
+class TestParseCache(unittest.TestCase):
+    std_path: str
+    cache_dir: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestParseCache).setUpClass()
+        cls.std_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-2])), "std")
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.parser = Lark_StandAlone(postlex=Postlexer("TestParseCache", "x86_64-unknown-linux-gnu"))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.cache_dir)
+
+    def assertTreesIdentical(self, expected, actual):
+        stack = [(expected, actual)]
+        while len(stack) > 0:
+            left, right = stack.pop()
+            self.assertIs(type(left), type(right))
+            if isinstance(left, Tree):
+                self.assertEqual(left.data, right.data)
+                self.assertEqual(len(left.children), len(right.children))
+                stack.extend(zip(left.children, right.children))
+            elif isinstance(left, Token):
+                for slot in Token.__slots__:
+                    self.assertEqual(getattr(left, slot), getattr(right, slot))
+
+    def test_round_trip(self):
+        for path in glob.glob(os.path.join(self.std_path, "**", "*.rial"), recursive=True):
+            with open(path, "r") as file:
+                tree = self.parser.parse(file.read())
+            self.assertTreesIdentical(tree, load_tree(dump_tree(tree)))
+
+    def test_deep_tree(self):
+        tree = Tree("math", [Token("NUMBER", "1", 0, 1, 1)])
+        for i in range(5000):
+            tree = Tree("math", [tree, Token("PLUS", "+", i, 1, i), None])
+        self.assertTreesIdentical(tree, load_tree(dump_tree(tree)))
+
+    def test_hit_after_store(self):
+        set_profiling(True)
+        try:
+            counters.clear()
+            ParseCache.init(Path(self.cache_dir), False, "TestParseCache", "x86_64-unknown-linux-gnu")
+            contents = "public void main() {\n}\n"
+
+            self.assertIsNone(ParseCache.lookup(contents))
+            ParseCache.store(contents, dump_tree(self.parser.parse(contents)))
+            self.assertIsNotNone(ParseCache.lookup(contents))
+            self.assertIsNone(ParseCache.lookup(contents + "\n"))
+
+            self.assertEqual(counters["PARSE_CACHE_HITS"], 1)
+            self.assertEqual(counters["PARSE_CACHE_MISSES"], 2)
+        finally:
+            set_profiling(False)
+            counters.clear()
+
+    def test_corrupt_entries_are_parsed_again(self):
+        workdir = os.path.join(self.cache_dir, "TestParseCache")
+        os.makedirs(os.path.join(workdir, "src"))
+
+        with open(os.path.join(workdir, "src", "main.rial"), "w") as file:
+            file.write("public void main() {\n\tvar x = 1 + 2;\n}\n")
+
+        def build():
+            errors = io.StringIO()
+            with patch.object(sys, 'argv', ['prog', '--workdir', workdir]), patch.dict(DEFAULT_OPTIONS['config']), \
+                    redirect_stderr(errors):
+                start()
+            return errors.getvalue()
+
+        self.assertEqual(build(), "")
+        entries = glob.glob(os.path.join(workdir, "cache", "parse", "*.tree"))
+        self.assertGreater(len(entries), 0)
+
+        # Truncate half of the entries and overwrite the others with garbage
+        for i, entry in enumerate(entries):
+            with open(entry, "r+b") as file:
+                if i % 2 == 0:
+                    file.truncate(16)
+                else:
+                    file.write(b"garbage")
+
+        # Without the artifact store every module is parsed again
+        for path in glob.glob(os.path.join(workdir, "cache", "artifacts.db*")):
+            os.remove(path)
+        os.remove(os.path.join(workdir, "bin", "TestParseCache"))
+
+        self.assertEqual(build(), "")
+        self.assertTrue(os.path.exists(os.path.join(workdir, "bin", "TestParseCache")))
+
+        # The entries were overwritten
+        for entry in entries:
+            with open(entry, "rb") as file:
+                self.assertIsInstance(load_tree(file.read()), Tree)
+
+
+if __name__ == '__main__':
+    unittest.main()
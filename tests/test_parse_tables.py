@@ -0,0 +1,89 @@
+import glob
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from rial.concept.parser import Lark_StandAlone, Tree, Token
+from rial.parsing import parse_tables
+from rial.parsing.parse_tables import load_parser, MappedParseTables, TABLES_PATH, get_grammar_version, HEADER
+from rial.transformer.Postlexer import Postlexer
+
+
+class TestParseTables(unittest.TestCase):
+    sources: list
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestParseTables).setUpClass()
+        root = os.path.abspath("/".join(f"{__file__}".split('/')[0:-2]))
+        cls.sources = list()
+        for path in glob.glob(os.path.join(root, "std", "**", "*.rial"), recursive=True) + glob.glob(
+                os.path.join(root, "examples", "**", "*.rial"), recursive=True):
+            with open(path, "r") as file:
+                cls.sources.append(file.read())
+        cls.standalone = Lark_StandAlone(postlex=Postlexer("TestParseTables", "x86_64-unknown-linux-gnu"))
+        cls.mapped = load_parser(Postlexer("TestParseTables", "x86_64-unknown-linux-gnu"))
+
+    def assertSameResult(self, contents: str):
+        try:
+            expected = self.standalone.parse(contents)
+        except Exception as e:
+            with self.assertRaises(type(e)) as context:
+                self.mapped.parse(contents)
+            self.assertEqual(str(context.exception), str(e))
+            return
+
+        stack = [(expected, self.mapped.parse(contents))]
+        while len(stack) > 0:
+            left, right = stack.pop()
+            self.assertIs(type(left), type(right))
+            if isinstance(left, Tree):
+                self.assertEqual(left.data, right.data)
+                self.assertEqual(len(left.children), len(right.children))
+                stack.extend(zip(left.children, right.children))
+            elif isinstance(left, Token):
+                for slot in Token.__slots__:
+                    self.assertEqual(getattr(left, slot), getattr(right, slot))
+
+    def test_tables_are_up_to_date(self):
+        self.assertEqual(MappedParseTables(TABLES_PATH).meta['grammar_version'], get_grammar_version())
+
+    def test_sources(self):
+        for contents in self.sources:
+            self.assertSameResult(contents)
+
+    def test_mutated_sources(self):
+        rng = random.Random(42)
+        for contents in self.sources:
+            for _ in range(20):
+                i = rng.randrange(len(contents))
+                j = rng.randrange(len(contents))
+                self.assertSameResult(contents[:i] + contents[j:j + rng.randrange(1, 6)] + contents[i:])
+
+    def test_truncated_tables(self):
+        contents = TABLES_PATH.read_bytes()
+        _, meta_length, _ = HEADER.unpack_from(contents, 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath("parser_tables.bin")
+
+            for length in (0, HEADER.size - 1, HEADER.size + meta_length // 2, HEADER.size + meta_length + 4,
+                           len(contents) - 6, len(contents) - 1):
+                with self.subTest(length=length):
+                    path.write_bytes(contents[:length])
+
+                    with self.assertRaises(ValueError):
+                        MappedParseTables(path)
+
+                    with patch.object(parse_tables, "TABLES_PATH", path), \
+                            patch.object(parse_tables, "_mapped_tables", None), \
+                            patch.object(parse_tables, "Lark_StandAlone", wraps=Lark_StandAlone) as standalone:
+                        load_parser(Postlexer("TestParseTables", "x86_64-unknown-linux-gnu"))
+                        self.assertTrue(standalone.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
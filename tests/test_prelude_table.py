@@ -0,0 +1,53 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.PreludeTable import PreludeTable
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+
+
+def create_builtin_module(name: str, functions):
+    module = RIALModule(f"rial:builtin:{name}", ir.Context())
+    for function in functions:
+        RIALFunction(module, ir.FunctionType(ir.VoidType(), []), function, function)
+    return module
+
+
+class TestPreludeTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.first = create_builtin_module("first", ["shared", "only_first"])
+        self.second = create_builtin_module("second", ["shared", "only_second"])
+        self.prelude = PreludeTable([self.first, self.second])
+
+    def test_exports_of_all_modules(self):
+        self.assertIs(self.prelude.lookup("only_first"), self.first.get_global("only_first"))
+        self.assertIs(self.prelude.lookup("only_second"), self.second.get_global("only_second"))
+
+    def test_earlier_modules_shadow_later_ones(self):
+        self.assertIs(self.prelude.lookup("shared"), self.first.get_global("shared"))
+
+    def test_missing_names_are_remembered(self):
+        self.assertIsNone(self.prelude.lookup("missing"))
+        self.assertIn("missing", self.prelude.missing)
+        self.assertIsNone(self.prelude.lookup("missing"))
+
+    def test_invalidate(self):
+        self.assertIsNone(self.prelude.lookup("late"))
+        late = RIALFunction(self.second, ir.FunctionType(ir.VoidType(), []), "late", "late")
+        self.prelude.invalidate("late")
+        self.assertIs(self.prelude.lookup("late"), late)
+
+    def test_imports_are_exported(self):
+        self.second.dependencies["io"] = "rial:builtin:first"
+        from rial.compilation_manager import CompilationManager
+        modules = getattr(CompilationManager, "modules", None)
+        CompilationManager.modules = {"rial:builtin:first": self.first}
+        try:
+            self.assertIs(PreludeTable([self.first, self.second]).lookup("io"), self.first)
+        finally:
+            CompilationManager.modules = modules
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import pickle
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.LLVMUIntType import LLVMUIntType
+from rial.ir.RIALType import RIALType, get_type
+from rial.transformer.builtin_type_to_llvm_mapper import map_shortcut_to_type, map_type_to_llvm, is_builtin_type
+
+
+class TestRIALType(unittest.TestCase):
+    def test_interned(self):
+        self.assertIs(get_type("Foo"), get_type("Foo"))
+        self.assertIs(get_type(get_type("Foo")), get_type("Foo"))
+        self.assertIsInstance(get_type("Foo"), RIALType)
+
+    def test_shortcuts(self):
+        self.assertIs(get_type("int"), get_type("Int32"))
+        self.assertIs(get_type("int[]"), get_type("Int32[]"))
+        self.assertIs(get_type("CString"), get_type("Char[]"))
+        self.assertEqual(get_type("uint"), "UInt32")
+
+    def test_arrays(self):
+        ty = get_type("Char[12]")
+        self.assertTrue(ty.is_array)
+        self.assertTrue(ty.is_sized_array)
+        self.assertIs(ty.element_type, get_type("Char"))
+        self.assertEqual(ty.array_length, 12)
+
+        ty = get_type("Char[]")
+        self.assertTrue(ty.is_array)
+        self.assertFalse(ty.is_sized_array)
+        self.assertIs(ty.element_type, get_type("Char"))
+
+        self.assertEqual(get_type("Foo[0]").array_length, 0)
+        self.assertFalse(get_type("Foo").is_array)
+
+    def test_builtin_types(self):
+        self.assertEqual(get_type("Int32").llvm_type, ir.IntType(32))
+        self.assertEqual(get_type("Int7").llvm_type, ir.IntType(7))
+        self.assertIsInstance(get_type("UInt16").llvm_type, LLVMUIntType)
+        self.assertIsNone(get_type("Foo").llvm_type)
+        self.assertIsNone(get_type("CString").llvm_type)
+
+    def test_mapper(self):
+        self.assertEqual(map_shortcut_to_type("long"), "Int64")
+        self.assertEqual(map_type_to_llvm("double"), ir.DoubleType())
+        self.assertTrue(is_builtin_type("bool"))
+        self.assertFalse(is_builtin_type("CString"))
+
+    def test_pickle_is_interned(self):
+        self.assertIs(pickle.loads(pickle.dumps(get_type("Char[12]"))), get_type("Char[12]"))
+
+
+if __name__ == '__main__':
+    unittest.main()
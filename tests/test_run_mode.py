@@ -0,0 +1,81 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from rial.linking.linker import Linker
+from rial.main import DEFAULT_OPTIONS, start
+
+
+class TestRunMode(unittest.TestCase):
+    dir_path: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestRunMode).setUpClass()
+        cls.dir_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-1])), "TestRunMode")
+        src_path = os.path.join(cls.dir_path, "src")
+
+        if not os.path.exists(cls.dir_path):
+            os.mkdir(cls.dir_path)
+            os.mkdir(src_path)
+
+        with open(os.path.join(src_path, "main.rial"), "w") as file:
+            file.write("unsafe {\n")
+            file.write("\texternal void printf(CString format, params CString arg);\n")
+            file.write("}\n")
+            file.write("public void main() {\n")
+            file.write("\tvar sum = 0;\n")
+            file.write("\tfor(var i = 0; i < 10; i++) {\n")
+            file.write("\t\tsum = sum + i;\n")
+            file.write("\t}\n")
+            file.write("\tunsafe {\n")
+            file.write('\t\tprintf("Sum: %i\\n", sum);\n')
+            file.write('\t\tprintf("Hello World!\\n");\n')
+            file.write("\t}\n")
+            file.write("}\n")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def run_main(self, *args) -> str:
+        testargs = ['prog', '--workdir', self.dir_path, '--disable-cache', '--run', *args]
+
+        # main writes to the C stdout, so the file descriptor has to be redirected
+        with tempfile.TemporaryFile() as output:
+            stdout = os.dup(1)
+            sys.stdout.flush()
+            os.dup2(output.fileno(), 1)
+            try:
+                with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']), \
+                        patch.object(Linker, "link_files") as link_files:
+                    start()
+            finally:
+                sys.stdout.flush()
+                os.dup2(stdout, 1)
+                os.close(stdout)
+
+            link_files.assert_not_called()
+            output.seek(0)
+
+            return output.read().decode("utf-8")
+
+    def test_runs_main(self):
+        self.assertEqual(self.run_main(), "Sum: 45\nHello World!\n")
+
+    def test_runs_unoptimized(self):
+        self.assertEqual(self.run_main('--disable-opt'), "Sum: 45\nHello World!\n")
+
+    def test_no_outputs(self):
+        self.run_main()
+
+        self.assertFalse(os.path.exists(os.path.join(self.dir_path, "output")))
+        self.assertFalse(os.path.exists(os.path.join(self.dir_path, "bin")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.IRBuilder import IRBuilder
+from rial.ir.RIALFunction import RIALFunction
+from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALVariable import RIALVariable
+
+NAMES = ["a", "b", "c", "d"]
+
+
+def create_function(module: RIALModule, name: str) -> RIALFunction:
+    return RIALFunction(module, ir.FunctionType(ir.VoidType(), []), name, name)
+
+
+class TestScopeTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.module = RIALModule("scope_test", ir.Context())
+        self.func = create_function(self.module, "func")
+        self.entry = self.func.append_basic_block("entry")
+        self.module.builder = IRBuilder(self.entry)
+        self.module.current_block = self.entry
+
+    def declare(self, name: str):
+        variable = RIALVariable(name, "Int32", ir.IntType(32), None)
+        self.module.current_block.add_named_value(name, variable)
+        return variable
+
+    def lookup(self, name: str):
+        return self.module.scope_table.lookup(name)
+
+    def assert_matches_block_chain(self):
+        for name in NAMES:
+            self.assertIs(self.module.scope_table.lookup(name), self.module.current_block.get_named_value(name))
+
+    def test_inner_declaration_shadows_outer(self):
+        outer = self.declare("a")
+        body = self.module.builder.create_block("body", parent=self.entry)
+        end = self.module.builder.create_block("end", sibling=self.entry)
+
+        self.module.builder.enter_block(body)
+        self.assertIs(self.lookup("a"), outer)
+        inner = self.declare("a")
+        self.assertIs(self.lookup("a"), inner)
+
+        self.module.builder.enter_block(end)
+        self.assertIs(self.lookup("a"), outer)
+
+    def test_redeclaration_in_same_block_replaces(self):
+        self.declare("a")
+        second = self.declare("a")
+        self.assertIs(self.lookup("a"), second)
+
+    def test_declaration_in_block_outside_chain(self):
+        body = self.module.builder.create_block("body", parent=self.entry)
+        self.module.builder.enter_block(body)
+        self.entry.add_named_value("b", RIALVariable("b", "Int32", ir.IntType(32), None))
+        self.assert_matches_block_chain()
+
+    def test_switching_functions(self):
+        self.declare("a")
+        other_func = create_function(self.module, "other")
+        other_entry = other_func.append_basic_block("entry")
+
+        self.module.current_block = other_entry
+        self.assertIsNone(self.lookup("a"))
+
+        self.module.current_block = self.entry
+        self.assertIsNotNone(self.lookup("a"))
+
+    def test_random_transitions_match_block_chain(self):
+        rng = random.Random(1234)
+        blocks = [self.entry]
+
+        for i in range(3000):
+            action = rng.random()
+            if action < 0.3:
+                self.declare(rng.choice(NAMES))
+            elif action < 0.6:
+                if rng.random() < 0.5:
+                    block = self.module.builder.create_block(f"b{i}", parent=self.module.current_block)
+                else:
+                    block = self.module.builder.create_block(f"b{i}", sibling=rng.choice(blocks))
+                blocks.append(block)
+                self.module.builder.enter_block(block)
+            else:
+                self.module.current_block = rng.choice(blocks)
+
+            self.assert_matches_block_chain()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from llvmlite import ir
+
+from rial.ir.RIALModule import RIALModule
+from rial.ir.StringPool import StringPool
+from rial.profiling import set_profiling, counters
+from rial.util.util import decode_escapes
+
+
+class TestDecodeEscapes(unittest.TestCase):
+    def test_without_escapes(self):
+        value = "Hello World!"
+        self.assertIs(decode_escapes(value), value)
+
+    def test_escapes(self):
+        self.assertEqual(decode_escapes(r"%i\n"), "%i\n")
+        self.assertEqual(decode_escapes(r"\t\r\a\b\f\v\\"), "\t\r\a\b\f\v\\")
+        self.assertEqual(decode_escapes(r"\'\""), "'\"")
+        self.assertEqual(decode_escapes(r"\x41\101\0"), "AA\0")
+        self.assertEqual(decode_escapes(r"é\U0001F600\N{BULLET}"), "é\U0001F600\N{BULLET}")
+        self.assertEqual(decode_escapes(r"\\n"), "\\n")
+
+    def test_unknown_escapes_are_kept(self):
+        self.assertEqual(decode_escapes(r"\q\x4"), "\\q\\x4")
+
+    def test_quotes_inside_literal(self):
+        # Broke the eval based decoding
+        self.assertEqual(decode_escapes("it's"), "it's")
+        self.assertEqual(decode_escapes(r"it's\n"), "it's\n")
+
+    def test_same_as_python(self):
+        for value in (r"\x7f\177\1234", r"a\\\tb", r"\N{LATIN SMALL LETTER E WITH ACUTE}", r"€\8\9"):
+            self.assertEqual(decode_escapes(value), eval("'{}'".format(value)))
+
+
+class TestStringPool(unittest.TestCase):
+    def setUp(self) -> None:
+        StringPool.invalidate()
+        self.context = ir.Context()
+        self.first = RIALModule("first", self.context)
+        self.second = RIALModule("second", self.context)
+
+    def tearDown(self) -> None:
+        StringPool.invalidate()
+
+    def test_literal_is_decoded_once(self):
+        name, initializer = StringPool.get_literal(r"%i\n")
+        self.assertEqual(bytes(initializer.constant), b"%i\n\0")
+        self.assertIs(StringPool.get_literal(r"%i\n")[1], initializer)
+        self.assertEqual(len(StringPool.literals), 1)
+
+    def test_utf8(self):
+        _, initializer = StringPool.get_literal("é")
+        self.assertEqual(initializer.type.count, 3)
+        self.assertEqual(str(initializer.type), "[3 x i8]")
+
+    def test_shared_between_modules(self):
+        first = StringPool.declare_in(self.first, "Hello")
+        self.assertIs(StringPool.declare_in(self.first, "Hello"), first)
+
+        second = StringPool.declare_in(self.second, "Hello")
+        self.assertIsNot(second, first)
+        self.assertEqual(first.name, second.name)
+        self.assertEqual(first.rial_type, "Char[6]")
+
+        for glob in (first, second):
+            self.assertEqual(glob.value.linkage, "linkonce_odr")
+            self.assertTrue(glob.value.unnamed_addr)
+            self.assertTrue(glob.value.global_constant)
+
+        self.assertIn('linkonce_odr unnamed_addr constant [6 x i8] c"Hello\\00"', str(self.second))
+
+    def test_statistics(self):
+        set_profiling(True)
+        try:
+            counters.clear()
+            StringPool.declare_in(self.first, "Hello")
+            StringPool.declare_in(self.first, "World")
+            StringPool.declare_in(self.second, "Hello")
+            StringPool.declare_in(self.second, "Hello")
+
+            self.assertEqual(counters["STRING_POOL_SIZE"], 2)
+            self.assertEqual(counters["STRING_POOL_HITS"], 2)
+            self.assertEqual(counters["STRING_POOL_BYTES_SAVED"], 6)
+        finally:
+            set_profiling(False)
+            counters.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
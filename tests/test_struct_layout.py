@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+from llvmlite import ir
+
+from rial.codegen import CodeGen
+from rial.ir.RIALModule import RIALModule
+from rial.ir.RIALVariable import RIALVariable
+from rial.ir.llvm_helper import create_identified_struct_type
+from rial.ir.modifier.AccessModifier import AccessModifier
+
+
+def create_struct(module: RIALModule, name: str, properties, bases=None):
+    body = [RIALVariable(prop_name, rial_type, llvm_type, None) for prop_name, rial_type, llvm_type in properties]
+    return create_identified_struct_type(module, name, AccessModifier.PUBLIC, bases or list(), body)
+
+
+class TestStructLayout(unittest.TestCase):
+    codegen: CodeGen
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestStructLayout).setUpClass()
+        cls.codegen = CodeGen("0", True)
+
+    def setUp(self) -> None:
+        self.module = RIALModule("rial:builtin:layout_test", ir.Context())
+
+    def test_padding(self):
+        struct = create_struct(self.module, "Padded", [("a", "Byte", ir.IntType(8)), ("b", "Int64", ir.IntType(64)),
+                                                       ("c", "Int16", ir.IntType(16))])
+        self.codegen.record_struct_layout(struct)
+
+        self.assertEqual(struct.definition.size, 24)
+        self.assertEqual(struct.definition.alignment, 8)
+        self.assertEqual(struct.definition.offsets, {"a": 0, "b": 8, "c": 16})
+
+    def test_base_structs(self):
+        base = create_struct(self.module, "Base", [("a", "Int32", ir.IntType(32))])
+        self.codegen.record_struct_layout(base)
+        derived = create_struct(self.module, "Derived", [("b", "Int64", ir.IntType(64))], [base])
+        self.codegen.record_struct_layout(derived)
+
+        self.assertEqual(derived.definition.offsets, {"a": 0, "b": 8})
+        self.assertEqual(derived.definition.size, 16)
+
+    def test_nested_structs(self):
+        inner = create_struct(self.module, "Inner", [("a", "Int16", ir.IntType(16)), ("b", "Int8", ir.IntType(8))])
+        self.codegen.record_struct_layout(inner)
+        outer = create_struct(self.module, "Outer", [("c", "Int8", ir.IntType(8)), ("inner", "Inner", inner)])
+        self.codegen.record_struct_layout(outer)
+
+        self.assertEqual(outer.definition.offsets, {"c": 0, "inner": 2})
+        self.assertEqual(outer.definition.size, 6)
+
+    def test_pointers_to_structs(self):
+        node = self.module.context.get_identified_type("Node")
+        node.set_body(ir.IntType(32), node.as_pointer())
+        self.assertEqual(self.codegen.get_struct_layout(node), (16, 8, [0, 8]))
+
+    def test_unrelated_structs_are_left_out(self):
+        create_struct(self.module, "Unrelated", [("a", "Int32", ir.IntType(32))])
+        inner = create_struct(self.module, "Inner", [("a", "Int16", ir.IntType(16))])
+        outer = create_struct(self.module, "Outer", [("inner", "Inner", inner.as_pointer())])
+
+        with patch.object(self.codegen.binding, "parse_assembly", wraps=self.codegen.binding.parse_assembly) as parse:
+            self.codegen.record_struct_layout(outer)
+
+        assembly = parse.call_args[0][0]
+        self.assertIn('%"Inner" = type', assembly)
+        self.assertNotIn("Unrelated", assembly)
+
+    def test_get_size(self):
+        struct = create_struct(self.module, "Sized", [("a", "Int32", ir.IntType(32)), ("b", "Int8", ir.IntType(8))])
+        self.assertEqual(self.codegen.get_size(struct), 8)
+        self.codegen.record_struct_layout(struct)
+        struct.definition.size = 42
+        self.assertEqual(self.codegen.get_size(struct), 42)
+        self.assertEqual(self.codegen.get_size(ir.IntType(16)), 2)
+        self.assertIsNone(self.codegen.get_size(ir.VoidType()))
+
+
+if __name__ == '__main__':
+    unittest.main()
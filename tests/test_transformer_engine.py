@@ -0,0 +1,72 @@
+import sys
+import unittest
+
+from rial.concept.Transformer import Transformer
+from rial.concept.TransformerInterpreter import TransformerInterpreter
+from rial.concept.discard import DISCARD
+from rial.concept.parser import Tree, Token, Discard
+
+
+def nested_tree(depth: int) -> Tree:
+    tree = Tree('leaf', [Token('NUMBER', '1')])
+    for _ in range(depth):
+        tree = Tree('wrap', [tree])
+    return tree
+
+
+class Summer(TransformerInterpreter):
+    def add(self, tree: Tree):
+        left = yield tree.children[0]
+        right = yield tree.children[1]
+        return left + right
+
+    def number(self, tree: Tree):
+        return int(tree.children[0].value)
+
+    def dropped(self, tree: Tree):
+        return DISCARD
+
+    def raised(self, tree: Tree):
+        raise Discard()
+
+
+class Depth(Transformer):
+    def leaf(self, children):
+        return 0
+
+    def wrap(self, children):
+        return children[0] + 1
+
+    def dropped(self, children):
+        return DISCARD
+
+
+class TestTransformerEngine(unittest.TestCase):
+    def test_generator_methods_receive_results(self):
+        tree = Tree('add', [Tree('number', [Token('NUMBER', '2')]), Tree('add', [
+            Tree('number', [Token('NUMBER', '3')]), 4])])
+        self.assertEqual(Summer().visit(tree), 9)
+
+    def test_discard_returns_none(self):
+        self.assertIsNone(Summer().visit(Tree('dropped', [])))
+        self.assertIsNone(Summer().visit(Tree('raised', [])))
+
+    def test_default_visits_nested_rules_without_recursion(self):
+        tree = Summer().visit(nested_tree(sys.getrecursionlimit() * 2))
+        self.assertEqual(tree.data, 'wrap')
+
+    def test_default_keeps_discarded_children_as_none(self):
+        tree = Summer().visit(Tree('block', [Tree('dropped', []), Tree('number', [Token('NUMBER', '1')])]))
+        self.assertEqual(tree.children, [None, 1])
+
+    def test_transformer_without_recursion(self):
+        depth = sys.getrecursionlimit() * 2
+        self.assertEqual(Depth().transform(nested_tree(depth)), depth)
+
+    def test_transformer_drops_discarded_children(self):
+        tree = Depth(visit_tokens=False).transform(Tree('block', [Tree('dropped', []), Tree('leaf', [])]))
+        self.assertEqual(tree.children, [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
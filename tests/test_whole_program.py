@@ -0,0 +1,95 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from rial.linking.linker import Linker
+from rial.main import DEFAULT_OPTIONS, start
+
+
+class TestWholeProgram(unittest.TestCase):
+    dir_path: str
+    output_path: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super(cls, TestWholeProgram).setUpClass()
+        cls.dir_path = os.path.join(os.path.abspath("/".join(f"{__file__}".split('/')[0:-1])), "TestWholeProgram")
+        cls.output_path = os.path.join(cls.dir_path, "output")
+        src_path = os.path.join(cls.dir_path, "src")
+
+        if not os.path.exists(cls.dir_path):
+            os.mkdir(cls.dir_path)
+            os.mkdir(src_path)
+
+        with open(os.path.join(src_path, "main.rial"), "w") as file:
+            file.write("const math = use TestWholeProgram:math;\n")
+            file.write("unsafe {\n")
+            file.write("\texternal void printf(CString format, params CString arg);\n")
+            file.write("}\n")
+            file.write("public void main() {\n")
+            file.write("\tunsafe {\n")
+            file.write('\t\tprintf("%i\\n", math.twice(21));\n')
+            file.write("\t}\n")
+            file.write("}\n")
+
+        with open(os.path.join(src_path, "math.rial"), "w") as file:
+            file.write("public int twice(int value) {\n")
+            file.write("\treturn value * 2;\n")
+            file.write("}\n")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.dir_path)
+
+    def build(self, *args):
+        testargs = ['prog', '--workdir', self.dir_path, '--disable-cache', '--print-ir', '--opt-level', '1', '--whole-program',
+                    *args]
+        with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']), \
+                patch.object(Linker, "link_files", wraps=Linker.link_files) as link_files:
+            start()
+
+        return link_files
+
+    def test_single_object(self):
+        link_files = self.build()
+
+        object_file = os.path.join(self.output_path, "TestWholeProgram.o")
+        self.assertEqual(sorted(os.listdir(self.output_path)), ["TestWholeProgram.ll", "TestWholeProgram.o"])
+        self.assertEqual(link_files.call_args[0][0], [object_file])
+        self.assertTrue(os.path.exists(os.path.join(self.dir_path, "bin", "TestWholeProgram")))
+
+    def test_inlined_across_modules(self):
+        self.build()
+
+        with open(os.path.join(self.output_path, "TestWholeProgram.ll"), "r") as file:
+            content = file.read()
+
+        self.assertIn("define fastcc void @main()", content)
+        self.assertNotIn("twice", content)
+        self.assertIn("i32 42", content)
+
+    def test_run(self):
+        testargs = ['prog', '--workdir', self.dir_path, '--disable-cache', '--whole-program', '--run']
+
+        with tempfile.TemporaryFile() as output:
+            stdout = os.dup(1)
+            sys.stdout.flush()
+            os.dup2(output.fileno(), 1)
+            try:
+                with patch.object(sys, 'argv', testargs), patch.dict(DEFAULT_OPTIONS['config']):
+                    start()
+            finally:
+                sys.stdout.flush()
+                os.dup2(stdout, 1)
+                os.close(stdout)
+
+            output.seek(0)
+            self.assertEqual(output.read(), b"42\n")
+
+
+if __name__ == '__main__':
+    unittest.main()